@@ -5,10 +5,13 @@ Abstract base class for all ghost personalities. Ghosts are AI entities
 that provide specialized expertise and can collaborate with each other.
 """
 
+import functools
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Optional, Any
 
+from src.utils.ghost_metrics import GhostMetrics, default_metrics
+
 
 class BaseGhost(ABC):
     """Abstract base class for all GHST ghost personalities."""
@@ -26,9 +29,24 @@ class BaseGhost(ABC):
         self.specialization = specialization
         self.logger = logging.getLogger(f"Ghost.{ghost_id}")
         self.active = True
+        self.metrics: GhostMetrics = default_metrics
         
         self.logger.info(f"👻 Ghost initialized: {name} ({specialization})")
         
+    def __init_subclass__(cls, **kwargs):
+        """Instrument process_query of every ghost with latency metrics."""
+        super().__init_subclass__(**kwargs)
+        process_query = cls.__dict__.get('process_query')
+        if process_query is None or getattr(process_query, '__isabstractmethod__', False):
+            return
+
+        @functools.wraps(process_query)
+        def timed_process_query(self, query, context=None):
+            with self.metrics.timed(self.ghost_id, 'process_query'):
+                return process_query(self, query, context)
+
+        cls.process_query = timed_process_query
+
     @abstractmethod
     def process_query(self, query: str, context: Optional[Dict] = None) -> str:
         """Process a query with this ghost's expertise.
@@ -6,20 +6,70 @@ with specialized expert ghosts for domain-specific queries.
 """
 
 import logging
+from pathlib import Path
 from typing import Dict, Optional, Any
 from .base_ghost import BaseGhost
+from llm_engine.expert_fanout import ExpertFanOut
+from llm_engine.expert_router import ExpertRouter
+from llm_engine.routing_cache import RoutingCache
+
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+
+
+def _load_config(name: str) -> Dict[str, Any]:
+    """Load a YAML file from the core config directory ({} if unreadable)."""
+    try:
+        import yaml
+        with open(CONFIG_DIR / name, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Could not load {name}: {e}")
+        return {}
 
 
 class CoreGhost(BaseGhost):
     """General purpose ghost for the GHST system."""
     
-    def __init__(self):
-        """Initialize the core ghost."""
+    # Built-in routes; expertise branches add their own manifest keywords
+    DEFAULT_ROUTES = {
+        "3d print": "slicer_expert",
+        "web": "web_dev_expert",
+        "frontend": "frontend_expert",
+        "backend": "backend_expert",
+        "security": "security_expert"
+    }
+
+    def __init__(self, fanout: Optional[ExpertFanOut] = None,
+                 router: Optional[ExpertRouter] = None,
+                 ghost_config: Optional[Dict[str, Any]] = None,
+                 llm_config: Optional[Dict[str, Any]] = None):
+        """Initialize the core ghost.
+
+        Args:
+            fanout: Executor used to consult several experts at once
+                (defaults to one built from the configs on first use)
+            router: Expert router (defaults to one seeded with DEFAULT_ROUTES)
+            ghost_config: Parsed ghost_config.yaml (loaded if omitted)
+            llm_config: Parsed llm_config.yaml (loaded if omitted)
+        """
         super().__init__(
             ghost_id="core_ghost",
             name="Core Assistant",
             specialization="General AI Assistance"
         )
+        self.fanout = fanout
+        self.ghost_config = (_load_config("ghost_config.yaml")
+                             if ghost_config is None else ghost_config)
+        self.llm_config = (_load_config("llm_config.yaml")
+                           if llm_config is None else llm_config)
+
+        if router is None:
+            router = ExpertRouter()
+            for keyword, expert in self.DEFAULT_ROUTES.items():
+                router.add_expert(expert, [keyword])
+        self.router = router
+        self.routing_cache = RoutingCache(router)
         
     def process_query(self, query: str, context: Optional[Dict] = None) -> str:
         """Process a general query.
@@ -75,20 +125,39 @@ class CoreGhost(BaseGhost):
         Returns:
             Expert ghost ID or None
         """
-        # TODO: Implement intelligent routing based on query content
-        query_lower = query.lower()
+        return self.routing_cache.route(query, available_experts)
         
-        # Simple keyword-based routing
-        routing_map = {
-            "3d print": "slicer_expert",
-            "web": "web_dev_expert",
-            "frontend": "frontend_expert",
-            "backend": "backend_expert",
-            "security": "security_expert"
-        }
+    def watch_plugins(self, plugin_loader):
+        """Route to experts from expertise plugins as they load and unload.
+
+        Args:
+            plugin_loader: PluginLoader managing expertise branches
+        """
+        self.routing_cache.attach(plugin_loader)
+
+    def consult_experts(self, query: str, experts: Dict[str, BaseGhost],
+                        weights: Optional[Dict[str, float]] = None,
+                        context: Optional[Dict] = None) -> Dict[str, Any]:
+        """Consult several expert ghosts concurrently and aggregate answers.
+
+        Args:
+            query: User query
+            experts: Mapping of expert ghost ID to ghost instance
+            weights: Optional confidence weight per expert ID
+            context: Additional context
+
+        Returns:
+            Aggregated fan-out result (see ExpertFanOut.query)
+        """
+        if self.fanout is None:
+            self.fanout = ExpertFanOut.from_config(self.ghost_config,
+                                                   self.llm_config)
+        return self.fanout.query(query, experts, weights=weights,
+                                 context=context)
         
-        for keyword, expert in routing_map.items():
-            if keyword in query_lower and expert in available_experts:
-                return expert
-                
-        return None
+    def deactivate(self):
+        """Deactivate the ghost and release the fan-out worker threads."""
+        if self.fanout is not None:
+            self.fanout.shutdown()
+            self.fanout = None
+        super().deactivate()
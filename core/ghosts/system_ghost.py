@@ -66,8 +66,30 @@ class SystemGhost(BaseGhost):
             report.append("✅ System operational")
             report.append("⚙️  All core components initialized")
             
+        report.extend(self._get_latency_report())
         return "\n".join(report)
         
+    def _get_latency_report(self) -> list:
+        """Get per-ghost latency percentiles from the metrics registry.
+
+        Returns:
+            Report lines (empty if nothing has been recorded yet)
+        """
+        snapshot = self.metrics.snapshot()
+        if not snapshot:
+            return []
+
+        lines = ["", "⏱️  Ghost latency p50 / p95 / p99:"]
+        for ghost_id in sorted(snapshot):
+            for operation, stats in sorted(snapshot[ghost_id].items()):
+                lines.append(
+                    f"  {ghost_id}.{operation}: "
+                    f"{stats['p50'] * 1000:.2f} / {stats['p95'] * 1000:.2f} / "
+                    f"{stats['p99'] * 1000:.2f} ms "
+                    f"({stats['count']} calls, {stats['errors']} errors, "
+                    f"CPU {stats['cpu_time']:.3f}s)")
+        return lines
+
     def _get_plugin_status(self, context: Optional[Dict] = None) -> str:
         """Get plugin status report.
         
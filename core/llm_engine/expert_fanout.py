@@ -0,0 +1,251 @@
+"""
+Expert Fan-Out for GHST LLM System
+
+Queries several expert ghosts concurrently under a shared deadline and
+aggregates their answers by confidence weighting. Once the leading answer
+reaches the consensus threshold, or the experts still running could no
+longer outvote it, the stragglers are abandoned, so end-to-end latency
+tracks the slowest useful expert rather than the sum.
+
+When a round ends without consensus, further discussion rounds (up to
+``max_rounds``) ask the experts again with the previous answers in the
+context, as long as the deadline allows.
+"""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+
+class ExpertFanOut:
+    """Concurrent multi-expert query executor with consensus aggregation."""
+
+    def __init__(self, max_concurrent_experts: int = 3,
+                 consensus_threshold: float = 0.7,
+                 deadline: float = 10.0, max_rounds: int = 1):
+        """Initialize the fan-out executor.
+
+        Args:
+            max_concurrent_experts: Maximum experts queried per request
+            consensus_threshold: Share of the answering experts' weight an
+                answer needs before stragglers are cancelled
+            deadline: Default shared deadline in seconds for one request
+            max_rounds: Maximum discussion rounds per request
+        """
+        self.max_concurrent_experts = max(1, int(max_concurrent_experts))
+        self.consensus_threshold = consensus_threshold
+        self.deadline = deadline
+        self.max_rounds = max(1, int(max_rounds))
+        self.logger = logging.getLogger(__name__)
+
+        # Stragglers keep their worker until they return, so leave headroom
+        # for the next request instead of queueing it behind them.
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_experts * 2,
+            thread_name_prefix="ExpertFanOut")
+
+    @classmethod
+    def from_config(cls, ghost_config: Optional[Dict[str, Any]] = None,
+                    llm_config: Optional[Dict[str, Any]] = None,
+                    deadline: float = 10.0) -> "ExpertFanOut":
+        """Build a fan-out executor from the ghost and LLM YAML configs.
+
+        Args:
+            ghost_config: Parsed ``ghost_config.yaml``
+            llm_config: Parsed ``llm_config.yaml``
+            deadline: Shared deadline in seconds
+
+        Returns:
+            Configured ExpertFanOut
+        """
+        collaboration = ((ghost_config or {}).get('behavior', {})
+                         .get('collaboration', {}))
+        coordination = ((llm_config or {}).get('ghosts', {})
+                        .get('coordination', {}))
+        max_rounds = 1
+        if collaboration.get('enable_ghost_discussions', False):
+            max_rounds = collaboration.get('max_discussion_rounds', 1)
+        return cls(
+            max_concurrent_experts=coordination.get('max_concurrent_experts', 3),
+            consensus_threshold=collaboration.get('consensus_threshold', 0.7),
+            deadline=deadline,
+            max_rounds=max_rounds)
+
+    def query(self, query: str, experts: Dict[str, Any],
+              weights: Optional[Dict[str, float]] = None,
+              context: Optional[Dict] = None,
+              deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Query up to ``max_concurrent_experts`` experts concurrently.
+
+        Args:
+            query: User query
+            experts: Mapping of expert ghost ID to ghost instance
+            weights: Optional confidence weight per expert ID (e.g. routing
+                scores); experts without a weight count as 1.0
+            context: Additional context passed to every expert
+            deadline: Shared deadline in seconds (defaults to the
+                executor's deadline)
+
+        Returns:
+            Aggregated result with the winning response, its confidence,
+            whether consensus was reached, the rounds held and
+            per-expert details
+        """
+        weights = weights or {}
+        deadline = self.deadline if deadline is None else deadline
+        start = time.monotonic()
+        deadline_at = start + deadline
+
+        selected = self._select_experts(experts, weights)
+        errors: Dict[str, str] = {}
+        rounds = 0
+        while True:
+            rounds += 1
+            answering = [gid for gid in selected if gid not in errors]
+            outcome = self._run_round(query, experts, answering, weights,
+                                      context, deadline_at, errors)
+            if (outcome['consensus'] or rounds >= self.max_rounds
+                    or not outcome['responses']
+                    or time.monotonic() >= deadline_at):
+                break
+            # Discuss: show every expert the answers so far and ask again
+            context = dict(context or {})
+            context['discussion'] = {
+                gid: r['response'] for gid, r in outcome['responses'].items()
+            }
+
+        result = self._aggregate(outcome['responses'], outcome['support'],
+                                 outcome['total_weight'])
+        result.update({
+            'consensus': outcome['consensus'],
+            'rounds': rounds,
+            'errors': errors,
+            'cancelled': outcome['cancelled'],
+            'elapsed': time.monotonic() - start
+        })
+        return result
+
+    def _run_round(self, query: str, experts: Dict[str, Any],
+                   selected: List[str], weights: Dict[str, float],
+                   context: Optional[Dict], deadline_at: float,
+                   errors: Dict[str, str]) -> Dict[str, Any]:
+        """Ask the selected experts once and tally their answers.
+
+        Experts that fail are added to ``errors`` and no longer count
+        towards the total weight the consensus share is taken of.
+        """
+        total_weight = sum(weights.get(gid, 1.0) for gid in selected)
+        futures = {
+            self.executor.submit(self._ask, experts[gid], query, context): gid
+            for gid in selected
+        }
+        pending = set(futures)
+        responses: Dict[str, Dict[str, Any]] = {}
+        support: Dict[str, float] = {}
+        consensus = False
+
+        while pending and not consensus:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                gid = futures[future]
+                weight = weights.get(gid, 1.0)
+                try:
+                    answer, latency = future.result()
+                except Exception as e:
+                    self.logger.warning(f"Expert {gid} failed: {e}")
+                    errors[gid] = str(e)
+                    total_weight -= weight
+                    continue
+
+                key = self._normalize(answer)
+                support[key] = support.get(key, 0.0) + weight
+                responses[gid] = {
+                    'response': answer,
+                    'weight': weight,
+                    'latency': latency,
+                    'key': key
+                }
+
+            consensus = bool(support) and total_weight > 0 and (
+                max(support.values()) / total_weight >= self.consensus_threshold)
+            if not consensus and self._outcome_decided(
+                    support, sum(weights.get(futures[f], 1.0)
+                                 for f in pending)):
+                break
+
+        cancelled = [futures[f] for f in pending]
+        for future in pending:
+            future.cancel()
+        if cancelled:
+            self.logger.debug(f"Abandoned stragglers: {', '.join(cancelled)}")
+
+        return {
+            'responses': responses,
+            'support': support,
+            'total_weight': total_weight if total_weight > 0 else 1.0,
+            'consensus': consensus,
+            'cancelled': cancelled
+        }
+
+    def shutdown(self):
+        """Release worker threads without waiting for stragglers."""
+        self.executor.shutdown(wait=False)
+
+    def _select_experts(self, experts: Dict[str, Any],
+                        weights: Dict[str, float]) -> List[str]:
+        """Pick the highest-weighted active experts up to the limit."""
+        candidates = [
+            gid for gid, ghost in experts.items()
+            if not hasattr(ghost, 'is_active') or ghost.is_active()
+        ]
+        candidates.sort(key=lambda gid: weights.get(gid, 1.0), reverse=True)
+        return candidates[:self.max_concurrent_experts]
+
+    @staticmethod
+    def _outcome_decided(support: Dict[str, float],
+                         pending_weight: float) -> bool:
+        """Check whether pending experts can no longer change the winner."""
+        if not support:
+            return False
+        ranked = sorted(support.values(), reverse=True)
+        runner_up = ranked[1] if len(ranked) > 1 else 0.0
+        return ranked[0] - runner_up > pending_weight
+
+    @staticmethod
+    def _ask(ghost: Any, query: str, context: Optional[Dict]):
+        """Run one expert query and time it."""
+        started = time.monotonic()
+        answer = ghost.process_query(query, context)
+        return answer, time.monotonic() - started
+
+    @staticmethod
+    def _normalize(answer: str) -> str:
+        """Normalize an answer so equivalent responses vote together."""
+        return " ".join(str(answer).lower().split())
+
+    @staticmethod
+    def _aggregate(responses: Dict[str, Dict[str, Any]],
+                   support: Dict[str, float],
+                   total_weight: float) -> Dict[str, Any]:
+        """Pick the answer with the highest accumulated weight."""
+        if not responses:
+            return {'response': None, 'confidence': 0.0, 'responses': {}}
+
+        best_key = max(support, key=support.get)
+        best = max(
+            (r for r in responses.values() if r['key'] == best_key),
+            key=lambda r: r['weight'])
+
+        return {
+            'response': best['response'],
+            'confidence': support[best_key] / total_weight,
+            'responses': {
+                gid: {k: v for k, v in r.items() if k != 'key'}
+                for gid, r in responses.items()
+            }
+        }
@@ -0,0 +1,213 @@
+"""
+Expert Router for GHST LLM System
+
+Compiles every expert's domain keywords into a single keyword automaton and
+scores all experts in one pass over the query. Keywords shared by many
+experts are down-weighted (inverse document frequency), so distinctive
+keywords dominate routing even with thousands of loaded expert ghosts.
+
+Keywords are tracked per source (an expertise plugin, or direct
+registration), so unloading a plugin only withdraws the keywords that
+plugin contributed; experts that are still registered elsewhere keep
+routing.
+"""
+
+import logging
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.keyword_automaton import KeywordAutomaton
+
+
+class ExpertRouter:
+    """Indexed keyword router for expert ghosts."""
+
+    def __init__(self):
+        """Initialize an empty router."""
+        self.logger = logging.getLogger(__name__)
+        self.expert_keywords: Dict[str, Dict[str, float]] = {}
+        # expert ID -> source (plugin name, None if added directly) -> keywords
+        self._keyword_sources: Dict[str, Dict[Optional[str], Dict[str, float]]] = {}
+        self.plugin_experts: Dict[str, List[str]] = {}
+        self._index: Optional[Tuple[KeywordAutomaton, Dict[str, list]]] = None
+        self._order: Dict[str, int] = {}
+        self.generation = 0
+
+    def add_expert(self, expert_id: str, keywords: Iterable[str],
+                   weight: float = 1.0, source: Optional[str] = None):
+        """Register routing keywords for an expert.
+
+        Args:
+            expert_id: Expert ghost ID
+            keywords: Keywords that should route to this expert
+            weight: Base weight applied to each keyword
+            source: Plugin contributing the keywords (None if added directly)
+        """
+        entry = self._keyword_sources.setdefault(expert_id, {}).setdefault(source, {})
+        for keyword in keywords:
+            keyword = str(keyword).strip().lower()
+            if keyword:
+                entry[keyword] = weight
+        self._order.setdefault(expert_id, len(self._order))
+        self._merge_keywords(expert_id)
+        self._invalidate()
+
+    def _merge_keywords(self, expert_id: str):
+        """Recompute an expert's keywords from all of its sources.
+
+        A keyword registered by several sources keeps its highest weight.
+        Experts left without keywords are dropped.
+        """
+        merged: Dict[str, float] = {}
+        for keywords in self._keyword_sources.get(expert_id, {}).values():
+            for keyword, weight in keywords.items():
+                merged[keyword] = max(merged.get(keyword, weight), weight)
+        if merged:
+            self.expert_keywords[expert_id] = merged
+        else:
+            self.expert_keywords.pop(expert_id, None)
+            self._keyword_sources.pop(expert_id, None)
+            self._order.pop(expert_id, None)
+
+    def remove_expert(self, expert_id: str) -> bool:
+        """Remove an expert from the routing index.
+
+        Args:
+            expert_id: Expert ghost ID
+
+        Returns:
+            True if the expert was registered
+        """
+        if expert_id not in self.expert_keywords:
+            return False
+        del self.expert_keywords[expert_id]
+        self._keyword_sources.pop(expert_id, None)
+        self._order.pop(expert_id, None)
+        self._invalidate()
+        return True
+
+    def add_plugin(self, plugin_name: str, manifest: Dict[str, Any],
+                   experts: Optional[List[str]] = None):
+        """Index the experts of a loaded expertise branch.
+
+        The branch's ``domain.keywords`` (plus its primary and secondary
+        domain names) route to every expert listed in the manifest.
+        Re-adding a plugin replaces the keywords it registered before.
+
+        Args:
+            plugin_name: Name of the expertise plugin
+            manifest: Parsed ``manifest.yaml``
+            experts: Expert IDs to use when the manifest lists none
+        """
+        domain = (manifest or {}).get('domain', {}) or {}
+        keywords = list(domain.get('keywords', []) or [])
+        if domain.get('primary'):
+            keywords.append(domain['primary'])
+        keywords.extend(domain.get('secondary', []) or [])
+
+        expert_ids = [
+            e['id'] for e in (manifest or {}).get('experts', []) or []
+            if isinstance(e, dict) and e.get('id')
+        ] or list(experts or [])
+
+        self.remove_plugin(plugin_name)
+        for expert_id in expert_ids:
+            self.add_expert(expert_id, keywords, source=plugin_name)
+        self.plugin_experts[plugin_name] = expert_ids
+        self.logger.info(
+            f"Indexed {len(expert_ids)} experts from plugin: {plugin_name}")
+
+    def remove_plugin(self, plugin_name: str) -> bool:
+        """Withdraw the keywords an unloaded expertise branch registered.
+
+        Experts keep the keywords other plugins (or direct registration)
+        gave them; only experts left without any keywords are removed.
+
+        Args:
+            plugin_name: Name of the expertise plugin
+
+        Returns:
+            True if the plugin was indexed
+        """
+        expert_ids = self.plugin_experts.pop(plugin_name, None)
+        if expert_ids is None:
+            return False
+        for expert_id in expert_ids:
+            sources = self._keyword_sources.get(expert_id)
+            if sources is not None and sources.pop(plugin_name, None) is not None:
+                self._merge_keywords(expert_id)
+        self._invalidate()
+        return True
+
+    def _invalidate(self):
+        """Drop the compiled index and bump the routing generation."""
+        self._index = None
+        self.generation += 1
+
+    def compile(self) -> Tuple[KeywordAutomaton, Dict[str, list]]:
+        """Rebuild the keyword automaton with IDF-weighted keywords.
+
+        Returns:
+            The compiled (automaton, keyword weights) index
+        """
+        owners: Dict[str, List[str]] = {}
+        for expert_id, keywords in self.expert_keywords.items():
+            for keyword in keywords:
+                owners.setdefault(keyword, []).append(expert_id)
+
+        expert_count = len(self.expert_keywords)
+        automaton = KeywordAutomaton()
+        keyword_weights = {}
+        for keyword, expert_ids in owners.items():
+            idf = math.log(1.0 + expert_count / len(expert_ids))
+            keyword_weights[keyword] = [
+                (expert_id, self.expert_keywords[expert_id][keyword] * idf)
+                for expert_id in expert_ids
+            ]
+            automaton.add(keyword, keyword)
+        automaton.compile()
+        index = (automaton, keyword_weights)
+        self._index = index
+        return index
+
+    def score(self, query: str) -> Dict[str, float]:
+        """Score every expert against a query in one pass.
+
+        Each distinct keyword counts once per query.
+
+        Args:
+            query: User query
+
+        Returns:
+            Mapping of expert ID to score for experts with any match
+        """
+        automaton, keyword_weights = self._index or self.compile()
+
+        scores: Dict[str, float] = {}
+        for keyword in automaton.find_values(query):
+            for expert_id, weight in keyword_weights[keyword]:
+                scores[expert_id] = scores.get(expert_id, 0.0) + weight
+        return scores
+
+    def route(self, query: str,
+              available_experts: Optional[Iterable[str]] = None
+              ) -> Optional[str]:
+        """Return the best-scoring available expert for a query.
+
+        Ties go to the expert registered first.
+
+        Args:
+            query: User query
+            available_experts: Expert IDs allowed to answer (all if None)
+
+        Returns:
+            Expert ghost ID or None
+        """
+        scores = self.score(query)
+        if available_experts is not None:
+            allowed = set(available_experts)
+            scores = {k: v for k, v in scores.items() if k in allowed}
+        if not scores:
+            return None
+        return max(scores, key=lambda expert_id: (
+            scores[expert_id], -self._order.get(expert_id, 0)))
@@ -7,8 +7,9 @@ provides specialized domain knowledge and expert ghosts.
 
 import logging
 import importlib.util
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 
 
 class PluginLoader:
@@ -24,6 +25,8 @@ class PluginLoader:
         self.plugin_cache_path.mkdir(parents=True, exist_ok=True)
         self.logger = logging.getLogger(__name__)
         self.loaded_plugins = {}
+        self.load_times: Dict[str, float] = {}
+        self.listeners: List[Callable[[str, str, Optional[Dict]], None]] = []
         
         self.logger.info("🔌 Plugin Loader initialized")
         
@@ -66,6 +69,7 @@ class PluginLoader:
             self.logger.error(f"Plugin path not found: {plugin_path}")
             return False
             
+        started = time.perf_counter()
         try:
             # Load plugin manifest
             manifest = self._load_manifest(plugin_path)
@@ -84,8 +88,10 @@ class PluginLoader:
                 "knowledge": knowledge,
                 "path": plugin_path
             }
+            self.load_times[plugin_name] = time.perf_counter() - started
             
             self.logger.info(f"✅ Loaded plugin: {plugin_name}")
+            self._notify('loaded', plugin_name)
             return True
             
         except Exception as e:
@@ -102,11 +108,39 @@ class PluginLoader:
             True if unloaded successfully
         """
         if plugin_name in self.loaded_plugins:
-            del self.loaded_plugins[plugin_name]
+            plugin_info = self.loaded_plugins.pop(plugin_name)
+            self.load_times.pop(plugin_name, None)
             self.logger.info(f"Unloaded plugin: {plugin_name}")
+            self._notify('unloaded', plugin_name, plugin_info)
             return True
         return False
         
+    def add_listener(self, callback: Callable[[str, str, Optional[Dict]], None]):
+        """Register a callback for plugin load/unload events.
+
+        Args:
+            callback: Called as callback(event, plugin_name, plugin_info)
+                with event 'loaded' or 'unloaded'
+        """
+        self.listeners.append(callback)
+
+    def _notify(self, event: str, plugin_name: str,
+                plugin_info: Optional[Dict[str, Any]] = None):
+        """Notify listeners of a plugin event.
+
+        Args:
+            event: 'loaded' or 'unloaded'
+            plugin_name: Name of the plugin
+            plugin_info: Plugin info (defaults to the loaded entry)
+        """
+        if plugin_info is None:
+            plugin_info = self.loaded_plugins.get(plugin_name)
+        for callback in self.listeners:
+            try:
+                callback(event, plugin_name, plugin_info)
+            except Exception as e:
+                self.logger.error(f"Plugin listener failed for {plugin_name}: {e}")
+
     def get_plugin_info(self, plugin_name: str) -> Optional[Dict[str, Any]]:
         """Get information about a loaded plugin.
         
@@ -0,0 +1,130 @@
+"""
+Routing Cache for GHST LLM System
+
+Memoizes expert routing decisions keyed on a normalized query fingerprint
+and the currently loaded expert set, so repeated status checks and chat
+retries skip routing entirely. The cache is flushed whenever an expertise
+plugin is loaded or unloaded.
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, Optional
+
+from src.utils.ttl_cache import TTLCache
+
+from .expert_router import ExpertRouter
+
+
+class RoutingCache:
+    """Memoization layer in front of an ExpertRouter."""
+
+    _WHITESPACE = re.compile(r"\s+")
+    _EDGE_PUNCTUATION = ".,;:!?\"'()[]{} "
+
+    def __init__(self, router: ExpertRouter, max_entries: int = 2048,
+                 ttl: Optional[float] = None):
+        """Initialize the routing cache.
+
+        Args:
+            router: Router whose decisions are cached
+            max_entries: Maximum cached decisions (LRU eviction)
+            ttl: Optional lifetime of a decision in seconds
+        """
+        self.router = router
+        self.cache = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def fingerprint(cls, query: str) -> str:
+        """Normalize a query so near-identical queries share a key.
+
+        Case, repeated whitespace and leading/trailing punctuation are
+        ignored.
+
+        Args:
+            query: User query
+
+        Returns:
+            Normalized query text
+        """
+        text = cls._WHITESPACE.sub(" ", query.lower())
+        return text.strip(cls._EDGE_PUNCTUATION)
+
+    def route(self, query: str,
+              available_experts: Optional[Iterable[str]] = None
+              ) -> Optional[str]:
+        """Route a query, answering from the cache when possible.
+
+        Args:
+            query: User query
+            available_experts: Expert IDs allowed to answer (all if None)
+
+        Returns:
+            Expert ghost ID or None
+        """
+        fingerprint = self.fingerprint(query)
+        experts = (None if available_experts is None
+                   else frozenset(available_experts))
+        key = ('route', fingerprint, experts, self.router.generation)
+
+        missing = object()
+        expert_id = self.cache.get(key, missing)
+        if expert_id is missing:
+            expert_id = self.router.route(fingerprint, experts)
+            self.cache.set(key, expert_id)
+        return expert_id
+
+    def score(self, query: str) -> Dict[str, float]:
+        """Score all experts for a query, answering from the cache.
+
+        Args:
+            query: User query
+
+        Returns:
+            Mapping of expert ID to score (do not mutate)
+        """
+        fingerprint = self.fingerprint(query)
+        key = ('score', fingerprint, self.router.generation)
+        scores = self.cache.get(key)
+        if scores is None:
+            scores = self.router.score(fingerprint)
+            self.cache.set(key, scores)
+        return scores
+
+    def invalidate(self):
+        """Drop every cached routing decision."""
+        self.cache.clear()
+        self.logger.debug("Routing cache invalidated")
+
+    def attach(self, plugin_loader: Any):
+        """Keep the router and cache in sync with a PluginLoader.
+
+        Already loaded plugins are indexed immediately; later loads and
+        unloads update the router and flush the cache.
+
+        Args:
+            plugin_loader: PluginLoader managing expertise branches
+        """
+        for plugin_name in plugin_loader.list_loaded_plugins():
+            self._on_plugin_event('loaded', plugin_name,
+                                  plugin_loader.get_plugin_info(plugin_name))
+        plugin_loader.add_listener(self._on_plugin_event)
+
+    def _on_plugin_event(self, event: str, plugin_name: str,
+                         plugin_info: Optional[Dict[str, Any]]):
+        """Update routing when an expertise plugin is (un)loaded."""
+        if event == 'loaded' and plugin_info:
+            self.router.add_plugin(plugin_name, plugin_info.get('manifest', {}),
+                                   plugin_info.get('experts', []))
+        elif event == 'unloaded':
+            self.router.remove_plugin(plugin_name)
+        self.invalidate()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get routing cache hit-rate statistics.
+
+        Returns:
+            Cache statistics dictionary
+        """
+        return self.cache.get_stats()
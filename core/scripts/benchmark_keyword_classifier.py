@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Keyword Classifier Benchmark
+Compares the single-pass KeywordClassifier with the per-keyword
+``any(keyword in text.lower() ...)`` loops it replaced.
+
+Usage: python scripts/benchmark_keyword_classifier.py [--texts N] [--categories N]
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.keyword_classifier import KeywordClassifier  # noqa: E402
+
+# ErrorHandler.error_patterns, the largest in-tree rule set
+ERROR_PATTERNS = {
+    'mesh_errors': ['mesh', 'vertices', 'faces', 'manifold', 'geometry'],
+    'slicing_errors': ['slice', 'layer', 'gcode', 'path', 'toolpath'],
+    'io_errors': ['file', 'load', 'save', 'read', 'write', 'permission'],
+    'memory_errors': ['memory', 'allocation', 'out of memory', 'malloc'],
+    'ai_errors': ['ghst', 'ai', 'model', 'prediction', 'analysis'],
+    'config_errors': ['config', 'setting', 'parameter', 'yaml', 'validation']
+}
+
+
+def loop_first(patterns, text, default):
+    """The original if/elif keyword loop."""
+    text = text.lower()
+    for category, keywords in patterns.items():
+        if any(keyword in text for keyword in keywords):
+            return category
+    return default
+
+
+def loop_all(patterns, text):
+    """Every matching category with per-keyword loops."""
+    text = text.lower()
+    return [category for category, keywords in patterns.items()
+            if any(keyword in text for keyword in keywords)]
+
+
+def synthetic_patterns(count, rng):
+    """Generate extra categories of random keywords."""
+    patterns = dict(ERROR_PATTERNS)
+    for index in range(count - len(patterns)):
+        patterns[f'category_{index}'] = [
+            ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9)))
+            for _ in range(6)]
+    return patterns
+
+
+def make_texts(count, rng):
+    """Build error-message-like texts."""
+    words = [w for kws in ERROR_PATTERNS.values() for w in kws]
+    filler = ['unexpected', 'value', 'at', 'line', 'while', 'processing',
+              'object', 'returned', 'none', 'index', 'out', 'of', 'range']
+    return [' '.join(rng.choices(filler, k=12) + rng.choices(words, k=rng.randint(0, 2)))
+            for _ in range(count)]
+
+
+def bench(label, fn, texts):
+    """Time fn over all texts and print microseconds per call."""
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed / len(texts) * 1e6:8.2f} us/text")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--texts', type=int, default=20000)
+    parser.add_argument('--categories', type=int, nargs='+', default=[6, 50, 500])
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    texts = make_texts(args.texts, rng)
+
+    for count in args.categories:
+        patterns = synthetic_patterns(max(count, len(ERROR_PATTERNS)), rng)
+        classifier = KeywordClassifier(patterns, default='general')
+        keyword_total = sum(len(kws) for kws in patterns.values())
+
+        mismatches = sum(classifier.first(t) != loop_first(patterns, t, 'general')
+                         for t in texts)
+        mismatches += sum(classifier.classify(t) != loop_all(patterns, t)
+                          for t in texts)
+
+        print(f"{len(patterns)} categories / {keyword_total} keywords "
+              f"({len(texts)} texts, {mismatches} mismatches)")
+        bench("loop first()", lambda t: loop_first(patterns, t, 'general'), texts)
+        bench("classifier first()", classifier.first, texts)
+        bench("loop all categories", lambda t: loop_all(patterns, t), texts)
+        bench("classifier classify()", classifier.classify, texts)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Motion Planner Benchmark
+Times parsing, the vectorized statistics pass and the kinematic planner
+on sample G-code. The planner is checked against a per-move reference
+implementation in tests/test_motion_planner.py.
+
+Without file arguments, synthetic samples are generated: perimeters
+(square loops with retractions), infill (zig-zag lines) and curves
+(circles of short segments, which stress the junction limits).
+
+Usage: python scripts/benchmark_motion_planner.py [FILE.gcode ...] [--lines N]
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.plugins.gcode_parser import ParsedGcode  # noqa: E402
+from src.plugins.gcode_stats import compute_print_stats  # noqa: E402
+from src.plugins.motion_planner import MotionLimits  # noqa: E402
+
+
+def perimeters(count):
+    """Square loops per layer with a retract/prime between loops."""
+    lines = ['G90', 'M82', 'G92 E0']
+    e = 0.0
+    z = 0.0
+    while len(lines) < count:
+        z += 0.2
+        lines.append(f'G1 Z{z:.2f} F600')
+        for inset in range(0, 40, 2):
+            low, high = 50 + inset, 150 - inset
+            lines.append(f'G0 X{low} Y{low} F9000')
+            lines.append(f'G1 E{e:.4f} F2400')
+            for x, y in ((high, low), (high, high), (low, high), (low, low)):
+                e += (high - low) * 0.033
+                lines.append(f'G1 X{x} Y{y} E{e:.4f} F1800')
+            lines.append(f'G1 E{e - 0.8:.4f} F2400')
+    return lines[:count]
+
+
+def infill(count):
+    """Zig-zag infill lines across the bed."""
+    lines = ['G90', 'M83']
+    z = 0.0
+    while len(lines) < count:
+        z += 0.2
+        lines.append(f'G1 Z{z:.2f} F600')
+        for row in range(100):
+            y = 50 + row
+            x0, x1 = (50, 150) if row % 2 == 0 else (150, 50)
+            lines.append(f'G1 X{x0} Y{y} E0.033 F6000')
+            lines.append(f'G1 X{x1} Y{y} E3.3 F6000')
+    return lines[:count]
+
+
+def curves(count):
+    """Circles of 1-degree segments."""
+    lines = ['G90', 'M83']
+    z = 0.0
+    while len(lines) < count:
+        z += 0.2
+        lines.append(f'G1 Z{z:.2f} F600')
+        for step in range(361):
+            angle = math.radians(step)
+            lines.append(f'G1 X{100 + 40 * math.cos(angle):.3f} '
+                         f'Y{100 + 40 * math.sin(angle):.3f} E0.023 F3600')
+    return lines[:count]
+
+
+def run(name, data, limits):
+    """Benchmark one sample."""
+    start = time.perf_counter()
+    gcode = ParsedGcode.from_bytes(data)
+    parse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    nominal = compute_print_stats(gcode, include_layers=False)
+    stats_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    kinematic = compute_print_stats(gcode, include_layers=False, limits=limits)
+    planner_time = time.perf_counter() - start - stats_time
+
+    print(f"{name:<12} {len(gcode):>9} lines  parse {parse_time:6.2f}s  "
+          f"stats {stats_time:5.2f}s  planner {max(planner_time, 0.0):5.2f}s")
+    print(f"{'':<12} estimate: feedrate-only {nominal['print_time_s'] / 60:8.1f} min, "
+          f"kinematic {kinematic['print_time_s'] / 60:8.1f} min")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('files', nargs='*', help='G-code files to benchmark')
+    parser.add_argument('--lines', type=int, default=1_000_000,
+                        help='Lines per synthetic sample')
+    parser.add_argument('--acceleration', type=float, default=1500.0)
+    parser.add_argument('--junction-deviation', type=float, default=0.05)
+    parser.add_argument('--max-feedrate', type=float, default=300.0,
+                        help='Per-axis X/Y feedrate limit (mm/s)')
+    args = parser.parse_args()
+
+    limits = MotionLimits(max_acceleration=args.acceleration,
+                          junction_deviation=args.junction_deviation,
+                          max_feedrate_x=args.max_feedrate,
+                          max_feedrate_y=args.max_feedrate,
+                          max_feedrate_z=20.0)
+
+    if args.files:
+        for path in args.files:
+            run(Path(path).name, Path(path).read_bytes(), limits)
+        return
+
+    for name, generate in (('perimeters', perimeters), ('infill', infill), ('curves', curves)):
+        data = ('\n'.join(generate(args.lines)) + '\n').encode()
+        run(name, data, limits)
+
+
+if __name__ == '__main__':
+    main()
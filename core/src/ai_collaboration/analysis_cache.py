@@ -0,0 +1,112 @@
+"""
+Analysis Cache for GHST Agent System
+
+Remembers the ghost analysis and fix decision for each ``error_id`` so
+repeat occurrences of a known error are answered instantly instead of
+being re-analysed. Entries expire after a TTL, the cache is LRU-bounded,
+and an entry is discarded as soon as the source file the error came from
+changes (modification time or size), since the analysis may no longer
+apply to the new code.
+"""
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from ..utils.ttl_cache import TTLCache
+except ImportError:  # imported with src/ on sys.path
+    from utils.ttl_cache import TTLCache
+
+
+def file_signature(file_path: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Return a cheap change signature (mtime_ns, size) for a file.
+
+    Args:
+        file_path: Path to the source file (may be empty)
+
+    Returns:
+        Signature tuple, or None if there is no readable file
+    """
+    if not file_path:
+        return None
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class AnalysisCache:
+    """TTL + LRU cache of error analyses, invalidated by source changes."""
+
+    def __init__(self, max_entries: int = 512, ttl: Optional[float] = 3600):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum cached analyses (LRU eviction)
+            ttl: Seconds an analysis stays valid (None = until evicted)
+        """
+        self.cache = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.stale = 0
+
+    def get(self, error_id: str,
+            file_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Look up the cached analysis for an error.
+
+        Args:
+            error_id: Stable error fingerprint
+            file_path: Source file of the error, checked for changes
+
+        Returns:
+            Dict with 'analysis' and 'submit_fix', or None on a miss
+        """
+        entry = self.cache.get(error_id)
+        if entry is None:
+            return None
+        if entry['file_signature'] != file_signature(file_path or entry['file_path']):
+            self.cache.invalidate(error_id)
+            self.stale += 1
+            return None
+        return entry
+
+    def set(self, error_id: str, analysis: Dict[str, Any], submit_fix: bool,
+            file_path: Optional[str] = None):
+        """Cache the analysis and fix decision for an error.
+
+        Args:
+            error_id: Stable error fingerprint
+            analysis: Completed ghost analysis
+            submit_fix: Whether a fix was submitted for this error
+            file_path: Source file of the error
+        """
+        self.cache.set(error_id, {
+            'analysis': analysis,
+            'submit_fix': submit_fix,
+            'file_path': file_path,
+            'file_signature': file_signature(file_path)
+        })
+
+    def invalidate(self, error_id: str) -> bool:
+        """Drop the cached analysis for an error.
+
+        Args:
+            error_id: Stable error fingerprint
+
+        Returns:
+            True if an entry existed
+        """
+        return self.cache.invalidate(error_id)
+
+    def clear(self):
+        """Drop every cached analysis."""
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit-rate statistics, including source-change invalidations.
+
+        Returns:
+            Cache statistics dictionary
+        """
+        stats = self.cache.get_stats()
+        stats['stale'] = self.stale
+        return stats
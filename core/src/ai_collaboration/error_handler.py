@@ -12,9 +12,27 @@ import logging
 import queue
 import threading
 import traceback
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from .analysis_cache import AnalysisCache
+    from .error_journal import DEFAULT_JOURNAL_DIR, ErrorJournal
+    from .error_queue import ErrorQueue
+    from .error_stats import ErrorStatistics
+    from ..utils.async_logging import LOG_DIR, AsyncFileHandler
+    from ..utils.ghost_metrics import default_metrics
+    from ..utils.keyword_classifier import KeywordClassifier
+except ImportError:  # imported with src/ on sys.path
+    from ai_collaboration.analysis_cache import AnalysisCache
+    from ai_collaboration.error_journal import DEFAULT_JOURNAL_DIR, ErrorJournal
+    from ai_collaboration.error_queue import ErrorQueue
+    from ai_collaboration.error_stats import ErrorStatistics
+    from utils.async_logging import LOG_DIR, AsyncFileHandler
+    from utils.ghost_metrics import default_metrics
+    from utils.keyword_classifier import KeywordClassifier
 
 
 def normalize_user_input(raw_input: str) -> str:
@@ -34,7 +52,8 @@ def normalize_user_input(raw_input: str) -> str:
     # Example: Remove excessive whitespace
     raw_input = re.sub(r'\s+', ' ', raw_input)
     # Example: Lowercase keywords
-    for kw in ['def', 'class', 'import', 'from', 'return', 'if', 'else', 'elif', 'for', 'while', 'try', 'except', 'with', 'as', 'print']:
+    for kw in ['def', 'class', 'import', 'from', 'return', 'if', 'else', 'elif',
+               'for', 'while', 'try', 'except', 'with', 'as', 'print']:
         raw_input = re.sub(rf'\b{kw}\b', kw, raw_input, flags=re.IGNORECASE)
     # More advanced corrections can be added here
     return raw_input.strip()
@@ -43,13 +62,37 @@ def normalize_user_input(raw_input: str) -> str:
 class ErrorHandler:
     """Captures and processes errors for GHST Agent analysis and fixing."""
 
-    def __init__(self, ghst_manager=None, github_token: Optional[str] = None):
+    # Longest a failing thread may wait on a full queue ('block' policy)
+    MAX_CAPTURE_WAIT = 0.01
+
+    def __init__(self, ghst_manager=None, github_token: Optional[str] = None,
+                 max_queue_size: int = 1000, queue_policy: str = 'drop_oldest',
+                 analysis_cache_ttl: Optional[float] = 3600,
+                 num_workers: int = 2, history_size: int = 1000,
+                 journal_dir: Optional[Path] = DEFAULT_JOURNAL_DIR):
         self.ghst_manager = ghst_manager
         self.github_token = github_token
-        self.error_queue = queue.Queue()
-        self.error_history = []
-        self.processing_thread = None
+        # Bounded, severity-ordered; duplicates of a queued error coalesce
+        self.error_queue = ErrorQueue(maxsize=max_queue_size,
+                                      policy=queue_policy,
+                                      key_field='fingerprint')
+        # Most recent processed errors; counts live in error_stats
+        self.error_history: deque = deque(maxlen=history_size)
+        self.error_stats = ErrorStatistics()
+        # Persistent, queryable history across restarts (None disables);
+        # handlers journaling to the same directory share one writer
+        self.journal = ErrorJournal.shared(journal_dir) if journal_dir else None
+        # Known errors are answered from here until their source changes
+        self.analysis_cache = AnalysisCache(ttl=analysis_cache_ttl)
+        # error_id -> occurrences waiting on an analysis still in progress
+        self._pending_analyses: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending_lock = threading.Lock()
+        self.num_workers = max(1, int(num_workers))
+        self.processing_threads: List[threading.Thread] = []
         self.running = False
+        # Per-stage latency (capture, queue_wait, classify, analyze,
+        # fix_decision)
+        self.metrics = default_metrics
 
         # Error classification patterns
         self.error_patterns = {
@@ -60,6 +103,8 @@ class ErrorHandler:
             'ai_errors': ['ghst', 'ai', 'model', 'prediction', 'analysis'],
             'config_errors': ['config', 'setting', 'parameter', 'yaml', 'validation']
         }
+        # All patterns compiled once; categories keep their priority order
+        self.error_classifier = KeywordClassifier(self.error_patterns)
 
         # Setup logging
         self.setup_logging()
@@ -71,12 +116,15 @@ class ErrorHandler:
         """Setup error logging system."""
         self.logger = logging.getLogger('ErrorHandler')
 
-        # Create error log file handler
-        log_path = Path('logs')
-        log_path.mkdir(exist_ok=True)
+        # Create error log file handler (non-blocking: a background writer
+        # batches, rotates and gzips; overload drops records, not callers)
+        error_log_path = LOG_DIR / 'coding enginegpt_errors.log'
+        for handler in self.logger.handlers:
+            if isinstance(handler, AsyncFileHandler) and handler.path == error_log_path:
+                self.log_handler = handler
+                return
 
-        error_log_path = log_path / 'coding enginegpt_errors.log'
-        file_handler = logging.FileHandler(error_log_path)
+        file_handler = AsyncFileHandler(error_log_path)
         file_handler.setLevel(logging.ERROR)
 
         # Create formatter
@@ -89,57 +137,75 @@ class ErrorHandler:
         file_handler.setFormatter(formatter)
 
         self.logger.addHandler(file_handler)
+        self.log_handler = file_handler
 
     def start_processing(self):
-        """Start error processing thread."""
+        """Start the pool of error processing workers."""
         if self.running:
             return
 
         self.running = True
-        self.processing_thread = threading.Thread(
-            target=self._process_errors, daemon=True)
-        self.processing_thread.start()
+        self.error_queue.reopen()
+        self.processing_threads = [
+            threading.Thread(target=self._process_errors, daemon=True,
+                             name=f"error-worker-{index}")
+            for index in range(self.num_workers)
+        ]
+        for thread in self.processing_threads:
+            thread.start()
 
         if self.ghst_manager:
             self.ghst_manager.log_activity(
                 "🚨 Error handler started - GHST Agent analysis enabled")
 
-    def stop_processing(self):
-        """Stop error processing."""
+    def stop_processing(self, drain: bool = True, timeout: float = 5.0):
+        """Stop error processing.
+
+        Args:
+            drain: Finish errors already queued before stopping (otherwise
+                they are discarded)
+            timeout: Maximum seconds to wait for the workers
+        """
         self.running = False
-        if self.processing_thread:
-            self.processing_thread.join(timeout=5)
+        if not drain:
+            self.error_queue.clear()
+        # Wakes idle workers at once; busy ones exit when the queue drains
+        self.error_queue.close()
+        for thread in self.processing_threads:
+            thread.join(timeout=timeout)
+        self.processing_threads = []
+        if self.journal:
+            self.journal.close()
 
     def capture_exception(self, exception: Exception, context: str = "",
                           function_name: str = "", file_path: str = ""):
-        """Capture an exception for GHST Agent analysis."""
-        try:
-            error_data = {
-                'timestamp': datetime.now().isoformat(),
-                'exception_type': type(exception).__name__,
-                'exception_message': str(exception),
-                'traceback': traceback.format_exc(),
-                'context': context,
-                'function_name': function_name,
-                'file_path': file_path,
-                'error_id': self._generate_error_id(exception, context),
-                'severity': self._assess_severity(exception),
-                'category': self._classify_error(exception, context)
-            }
+        """Capture an exception for GHST Agent analysis.
 
-            # Add to queue for processing
-            self.error_queue.put(error_data)
-
-            # Log immediately
-            self.logger.error(
-                f"Captured {
-                    error_data['exception_type']}: {
-                    error_data['exception_message']}", extra={
-                    'ghst_analysis': 'Queued for analysis'})
-
-            if self.ghst_manager:
-                self.ghst_manager.log_activity(
-                    f"🚨 Error captured: {error_data['exception_type']} - GHST Agent analysis queued")
+        Runs on the failing thread, so only cheap work happens here: the
+        exception object and its raising frame are queued, and traceback
+        formatting, hashing, classification and logging are left to the
+        workers.
+        """
+        try:
+            with self.metrics.timed('error_handler', 'capture'):
+                exception_type = type(exception).__name__
+                exception_message = str(exception)
+                error_data = {
+                    'timestamp': datetime.now().isoformat(),
+                    'exception_type': exception_type,
+                    'exception_message': exception_message,
+                    'context': context,
+                    'function_name': function_name,
+                    'file_path': file_path,
+                    'origin': self._frame_summary(exception),
+                    'fingerprint': (exception_type, exception_message, context),
+                    # Needed now for queue priority (isinstance checks only)
+                    'severity': self._assess_severity(exception),
+                    '_exception': exception
+                }
+
+                # Add to queue for processing (never stalls the caller long)
+                self.error_queue.put(error_data, timeout=self.MAX_CAPTURE_WAIT)
 
         except Exception as e:
             # Fallback logging - don't let error handler crash
@@ -153,72 +219,169 @@ class ErrorHandler:
                              data: Dict[str,
                                         Any] = None):
         """Capture a custom error condition for GHST Agent analysis."""
-        error_data = {
-            'timestamp': datetime.now().isoformat(),
-            'error_code': error_code,
-            'message': message,
-            'context': context,
-            'severity': severity,
-            'category': self._classify_custom_error(error_code, message),
-            'error_id': self._generate_custom_error_id(error_code, message),
-            'custom_data': data or {}
-        }
+        with self.metrics.timed('error_handler', 'capture'):
+            error_data = {
+                'timestamp': datetime.now().isoformat(),
+                'error_code': error_code,
+                'message': message,
+                'context': context,
+                'severity': severity,
+                'fingerprint': (error_code, message),
+                'custom_data': data or {}
+            }
 
-        self.error_queue.put(error_data)
+            self.error_queue.put(error_data, timeout=self.MAX_CAPTURE_WAIT)
 
-        if self.ghst_manager:
-            self.ghst_manager.log_activity(
-                f"🔍 Custom error logged: {error_code} - {message[:50]}..."
-            )
+    @staticmethod
+    def _frame_summary(exception: BaseException) -> Optional[Dict[str, Any]]:
+        """Locate the raising frame without formatting the traceback."""
+        tb = exception.__traceback__
+        if tb is None:
+            return None
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+        code = tb.tb_frame.f_code
+        return {'file': code.co_filename, 'line': tb.tb_lineno,
+                'function': code.co_name}
+
+    def _finalize_error(self, error_data: Dict[str, Any]):
+        """Do the deferred capture work: traceback, error ID, category."""
+        exception = error_data.pop('_exception', None)
+        if exception is not None:
+            error_data['traceback'] = ''.join(traceback.format_exception(
+                type(exception), exception, exception.__traceback__))
+            error_data['error_id'] = self._generate_error_id(
+                exception, error_data['context'])
+            error_data['category'] = self._classify_error(
+                exception, error_data['context'])
+            origin = error_data.get('origin')
+            if not error_data.get('file_path') and origin:
+                error_data['file_path'] = origin['file']
+        elif 'error_code' in error_data and 'error_id' not in error_data:
+            error_data['error_id'] = self._generate_custom_error_id(
+                error_data['error_code'], error_data['message'])
+            error_data['category'] = self._classify_custom_error(
+                error_data['error_code'], error_data['message'])
 
     def _process_errors(self):
-        """Main error processing loop."""
-        while self.running:
+        """Worker loop: process errors until the queue is closed and drained."""
+        while True:
             try:
-                # Get error from queue with timeout
-                error_data = self.error_queue.get(timeout=1)
+                # Blocks until an error arrives or the queue is closed
+                error_data, waited = self.error_queue.get_timed()
+            except queue.Empty:
+                break
 
-                # Process with GHST Agent analysis
-                self._analyze_with_ghosts(error_data)
+            try:
+                self.metrics.record('error_handler', 'queue_wait', waited)
 
-                # Add to history
-                self.error_history.append(error_data)
+                with self.metrics.timed('error_handler', 'classify'):
+                    self._finalize_error(error_data)
+                self._log_capture(error_data)
 
-                # Keep history manageable
-                if len(self.error_history) > 100:
-                    self.error_history = self.error_history[-50:]
+                # Process with GHST Agent analysis
+                with self.metrics.timed('error_handler', 'analyze'):
+                    deferred = self._analyze_with_ghosts(error_data)
+
+                # Errors awaiting enrichment are recorded by the callback
+                if not deferred:
+                    self._record_error(error_data)
 
-            except queue.Empty:
-                continue
             except Exception as e:
                 print(f"Error processing failed: {e}")
 
-    def _analyze_with_ghosts(self, error_data: Dict[str, Any]):
-        """Analyze error with GHST Agent collective."""
+    def _log_capture(self, error_data: Dict[str, Any]):
+        """Log a captured error (deferred from the capturing thread)."""
+        occurrences = error_data.get('occurrences', 1)
+        repeats = f" (x{occurrences})" if occurrences > 1 else ""
+        if 'exception_type' in error_data:
+            exception_type = error_data['exception_type']
+            self.logger.error(
+                f"Captured {exception_type}: "
+                f"{error_data['exception_message']}{repeats}",
+                extra={'ghst_analysis': 'Queued for analysis'})
+            if self.ghst_manager:
+                self.ghst_manager.log_activity(
+                    f"🚨 Error captured: {exception_type}{repeats} - GHST Agent analysis queued")
+        elif self.ghst_manager:
+            self.ghst_manager.log_activity(
+                f"🔍 Custom error logged: {error_data['error_code']}{repeats} - "
+                f"{error_data['message'][:50]}...")
+
+    def _record_error(self, error_data: Dict[str, Any]):
+        """Add a fully processed error to history, counters and journal."""
+        self.error_history.append(error_data)
+        self.error_stats.record(error_data.get('category', 'unknown'),
+                                error_data.get('severity', 'unknown'),
+                                error_data.get('occurrences', 1))
+        if self.journal:
+            self.journal.append(error_data)
+
+    def get_processing_stats(self) -> Dict[str, Any]:
+        """Get worker, queue and per-stage latency statistics.
+
+        Returns:
+            Dictionary with queue counters and stage latency summaries
+        """
+        return {
+            'workers': len(self.processing_threads),
+            'queue': self.error_queue.get_stats(),
+            'stages': self.metrics.snapshot().get('error_handler', {})
+        }
+
+    def _analyze_with_ghosts(self, error_data: Dict[str, Any]) -> bool:
+        """Analyze error with GHST Agent collective.
+
+        Returns:
+            True if ``_on_ghost_analysis`` records the error (now or once
+            the background enrichment completes), False if the caller
+            should record it
+        """
         if not self.ghst_manager:
-            return
+            return False
 
+        error_id = error_data.get('error_id')
         try:
+            # Repeat occurrence of an already analysed error
+            cached = self.analysis_cache.get(
+                error_id, error_data.get('file_path'))
+            if cached:
+                error_data['ghst_analysis'] = cached['analysis']
+                error_data['analysis_cached'] = True
+                return False
+
             # Prepare analysis context
             analysis_context = self._prepare_analysis_context(error_data)
 
+            problem = error_data.get(
+                'exception_message', error_data.get('message', ''))
+
             # Get GHST Agent analysis
-            if hasattr(self.ghst_manager, 'analyze_with_ai'):
+            if hasattr(self.ghst_manager, 'analyze_with_ai_async'):
+                # Repeats arriving while the first occurrence is still
+                # being enriched wait for that analysis instead of
+                # starting their own
+                with self._pending_lock:
+                    waiting = self._pending_analyses.get(error_id) if error_id else None
+                    if waiting is not None:
+                        waiting.append(error_data)
+                        return True
+                    if error_id:
+                        self._pending_analyses[error_id] = [error_data]
+
+                # Local analysis runs here; the fix decision and recording
+                # wait for the background enrichment, not this thread
+                self.ghst_manager.analyze_with_ai(
+                    problem=problem, context=analysis_context,
+                    callback=lambda analysis: self._on_ghost_analysis(
+                        error_data, analysis))
+                return True
+
+            elif hasattr(self.ghst_manager, 'analyze_with_ai'):
                 analysis = self.ghst_manager.analyze_with_ai(
-                    problem=error_data.get(
-                        'exception_message', error_data.get(
-                            'message', '')), context=analysis_context)
-
-                error_data['ghst_analysis'] = analysis
-
-                # Log analysis results
-                error_id = error_data.get('error_id', 'unknown')
-                self.ghst_manager.log_activity(
-                    f"🧠 GHST Agent analysis complete for {error_id}")
-
-                # Check if fix should be submitted
-                if self._should_submit_fix(analysis):
-                    self._submit_ghost_fix(error_data, analysis)
+                    problem=problem, context=analysis_context)
+                self._on_ghost_analysis(error_data, analysis)
+                return True
 
             else:
                 # Fallback analysis
@@ -231,10 +394,52 @@ class ErrorHandler:
                         'severity',
                         'unknown'),
                     'disclaimer': '⚠️ Basic analysis only - GHST Agent AI unavailable'}
+                return False
 
         except Exception as e:
             self.ghst_manager.log_activity(
                 f"❌ GHST Agent analysis failed: {e}")
+            # Record repeats that were waiting on this analysis
+            with self._pending_lock:
+                waiting = self._pending_analyses.pop(error_id, None) if error_id else None
+            for waiter in waiting or []:
+                if waiter is not error_data:
+                    self._record_error(waiter)
+            return False
+
+    def _on_ghost_analysis(self, error_data: Dict[str, Any],
+                           analysis: Dict[str, Any]):
+        """Record a completed GHST Agent analysis and decide on a fix.
+
+        Repeats of the error that waited for this analysis are recorded
+        with it as well.
+        """
+        error_id = error_data.get('error_id')
+        with self._pending_lock:
+            waiting = self._pending_analyses.pop(error_id, None) if error_id else None
+        error_data['ghst_analysis'] = analysis
+
+        # Log analysis results
+        self.ghst_manager.log_activity(
+            f"🧠 GHST Agent analysis complete for {error_id or 'unknown'}")
+
+        # Check if fix should be submitted
+        with self.metrics.timed('error_handler', 'fix_decision'):
+            submit_fix = self._should_submit_fix(analysis)
+            if submit_fix:
+                self._submit_ghost_fix(error_data, analysis)
+
+        # Remember the outcome so repeats skip analysis (and resubmission)
+        if 'error' not in analysis and error_id:
+            self.analysis_cache.set(error_id, analysis,
+                                    submit_fix, error_data.get('file_path'))
+
+        self._record_error(error_data)
+        for waiter in waiting or []:
+            if waiter is not error_data:
+                waiter['ghst_analysis'] = analysis
+                waiter['analysis_cached'] = True
+                self._record_error(waiter)
 
     def _prepare_analysis_context(self, error_data: Dict[str, Any]) -> str:
         """Prepare context for GHST Agent analysis."""
@@ -318,12 +523,16 @@ class ErrorHandler:
         error_type = error_data.get(
             'exception_type', error_data.get(
                 'error_code', 'Unknown'))
+        problem = error_data.get(
+            'exception_message', error_data.get('message', 'No description'))
+        solutions = analysis.get('suggested_solutions')
+        solution = solutions[0] if solutions else 'AI analysis incomplete'
 
-        description = """
+        description = f"""
 #  # 🤖 AI-Generated Fix for {error_type}
 
 ##  # Problem Description
-{error_data.get('exception_message', error_data.get('message', 'No description'))}
+{problem}
 
 ##  # Context
 {error_data.get('context', 'No context provided')}
@@ -334,7 +543,7 @@ class ErrorHandler:
 - **Confidence**: {analysis.get('confidence', 0):.2%}
 
 ##  # Proposed Solution
-{analysis.get('suggested_solutions', ['No solution provided'])[0] if analysis.get('suggested_solutions') else 'AI analysis incomplete'}
+{solution}
 
 ##  # FOSS References
 {len(analysis.get('foss_references', []))} relevant FOSS projects found for reference.
@@ -506,54 +715,31 @@ class SafetyChecker:
 
     def _classify_error(self, exception: Exception, context: str) -> str:
         """Classify error by type."""
-        error_text = f"{type(exception).__name__} {str(exception)} {context}".lower()
-
-        for category, keywords in self.error_patterns.items():
-            if any(keyword in error_text for keyword in keywords):
-                return category
-
-        return 'general'
+        error_text = f"{type(exception).__name__} {str(exception)} {context}"
+        return self.error_classifier.first(error_text, 'general')
 
     def _classify_custom_error(self, error_code: str, message: str) -> str:
         """Classify custom error by content."""
-        error_text = f"{error_code} {message}".lower()
-
-        for category, keywords in self.error_patterns.items():
-            if any(keyword in error_text for keyword in keywords):
-                return category
-
-        return 'custom'
+        error_text = f"{error_code} {message}"
+        return self.error_classifier.first(error_text, 'custom')
 
     def get_error_statistics(self) -> Dict[str, Any]:
-        """Get error statistics for GHST Agent analysis."""
-        if not self.error_history:
-            return {'total_errors': 0}
-
-        total_errors = len(self.error_history)
-
-        # Count by category
-        categories = {}
-        severities = {}
+        """Get error statistics for GHST Agent analysis.
 
-        for error in self.error_history:
-            category = error.get('category', 'unknown')
-            severity = error.get('severity', 'unknown')
-
-            categories[category] = categories.get(category, 0) + 1
-            severities[severity] = severities.get(severity, 0) + 1
-
-        # Recent error rate
-        recent_errors = [
-            e for e in self.error_history if (
-                datetime.now() -
-                datetime.fromisoformat(
-                    e['timestamp'])).seconds < 3600]
+        Counts include coalesced duplicates; ``windows`` holds sliding
+        1m/1h/24h counts by category and severity.
+        """
+        stats = self.error_stats.snapshot()
+        if not stats['total']:
+            return {'total_errors': 0}
 
+        categories = stats['categories']
         return {
-            'total_errors': total_errors,
+            'total_errors': stats['total'],
             'categories': categories,
-            'severities': severities,
-            'recent_hourly_rate': len(recent_errors),
+            'severities': stats['severities'],
+            'recent_hourly_rate': stats['windows']['1h']['total'],
+            'windows': stats['windows'],
             'most_common_category': max(
                 categories.items(),
                 key=lambda x: x[1])[0] if categories else 'none',
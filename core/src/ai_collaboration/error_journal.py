@@ -0,0 +1,368 @@
+"""
+Error Journal for GHST Agent System
+
+Append-only, rotated JSON Lines journal of processed errors, so error
+history survives restarts and can be queried for post-mortems. Each
+segment gets a small summary index (time range, per-error_id and
+per-category counts) written when it is sealed. Queries use the indexes
+to skip or summarize whole segments and only read the lines of segments
+that straddle a time boundary.
+
+Writers in one process must share one ``ErrorJournal`` per directory
+(see ``ErrorJournal.shared``); separate instances on the same directory
+would each rotate and index the segments on their own.
+"""
+
+import copy
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from ..utils.async_logging import LOG_DIR
+except ImportError:  # imported with src/ on sys.path
+    from utils.async_logging import LOG_DIR
+
+SEGMENT_GLOB = 'errors-*.jsonl'
+DEFAULT_JOURNAL_DIR = LOG_DIR / 'error_journal'
+
+# Resolved journal directory -> the process-wide journal writing to it
+_shared_journals: Dict[Path, 'ErrorJournal'] = {}
+_shared_journals_lock = threading.Lock()
+
+
+def _new_index() -> Dict[str, Any]:
+    """Return an empty segment index."""
+    return {'records': 0, 'min_ts': None, 'max_ts': None,
+            'errors': {}, 'categories': {}}
+
+
+def _index_record(index: Dict[str, Any], record: Dict[str, Any]):
+    """Fold one journal record into a segment index."""
+    ts = record['ts']
+    count = record.get('occurrences', 1)
+    index['records'] += 1
+    index['min_ts'] = ts if index['min_ts'] is None else min(index['min_ts'], ts)
+    index['max_ts'] = ts if index['max_ts'] is None else max(index['max_ts'], ts)
+
+    category = record.get('category', 'unknown')
+    index['categories'][category] = index['categories'].get(category, 0) + count
+
+    error_id = record.get('error_id')
+    if error_id is None:
+        return
+    entry = index['errors'].get(error_id)
+    if entry is None:
+        index['errors'][error_id] = {
+            'count': count, 'first': ts, 'last': ts, 'category': category,
+            'severity': record.get('severity'),
+            'summary': record.get('exception_message', record.get('message', ''))[:200]
+        }
+    else:
+        entry['count'] += count
+        entry['first'] = min(entry['first'], ts)
+        entry['last'] = max(entry['last'], ts)
+
+
+class ErrorJournal:
+    """Rotated JSONL error journal with per-segment summary indexes."""
+
+    def __init__(self, directory: Path = DEFAULT_JOURNAL_DIR,
+                 max_segment_bytes: int = 16 * 1024 * 1024,
+                 max_segments: int = 64):
+        """Open (or create) a journal.
+
+        Args:
+            directory: Directory holding the journal segments
+            max_segment_bytes: Segment size that triggers rotation
+            max_segments: Oldest segments beyond this count are deleted
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max(1, max_segments)
+        self.logger = logging.getLogger('ErrorJournal')
+        self._lock = threading.Lock()
+
+        # Sealed segment path -> index; the active segment is indexed live
+        self.indexes: Dict[Path, Dict[str, Any]] = {}
+        segments = sorted(self.directory.glob(SEGMENT_GLOB))
+        for segment in segments[:-1]:
+            self.indexes[segment] = self._load_index(segment)
+
+        if segments:
+            self.active_path = segments[-1]
+            self.active_index = self._build_index(self.active_path)
+        else:
+            self.active_path = self._segment_path(1)
+            self.active_index = _new_index()
+        self._file = open(self.active_path, 'a', encoding='utf-8')
+
+    @classmethod
+    def shared(cls, directory: Path = DEFAULT_JOURNAL_DIR) -> 'ErrorJournal':
+        """Return the process-wide journal for a directory, opening it once.
+
+        Args:
+            directory: Directory holding the journal segments
+
+        Returns:
+            The journal every caller in this process shares for it
+        """
+        key = Path(directory).resolve()
+        with _shared_journals_lock:
+            journal = _shared_journals.get(key)
+            if journal is None:
+                journal = _shared_journals[key] = cls(key)
+            return journal
+
+    def _segment_path(self, number: int) -> Path:
+        """Path of the segment with the given sequence number."""
+        return self.directory / f"errors-{number:06d}.jsonl"
+
+    @staticmethod
+    def _index_path(segment: Path) -> Path:
+        """Path of a segment's sidecar index."""
+        return segment.with_suffix('.idx.json')
+
+    def _build_index(self, segment: Path) -> Dict[str, Any]:
+        """Index a segment by scanning its lines."""
+        index = _new_index()
+        for record in self._read_segment(segment):
+            _index_record(index, record)
+        return index
+
+    def _load_index(self, segment: Path) -> Dict[str, Any]:
+        """Load a sealed segment's index, rebuilding it if missing."""
+        index_path = self._index_path(segment)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            index = self._build_index(segment)
+            self._write_index(segment, index)
+            return index
+
+    def _write_index(self, segment: Path, index: Dict[str, Any]):
+        """Persist a segment index."""
+        try:
+            with open(self._index_path(segment), 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+        except OSError as e:
+            self.logger.error(f"Failed to write journal index for {segment.name}: {e}")
+
+    @staticmethod
+    def _read_segment(segment: Path,
+                      contains: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the records of a segment, skipping torn lines.
+
+        Args:
+            segment: Segment path
+            contains: Only decode lines containing this substring
+        """
+        try:
+            with open(segment, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if contains is not None and contains not in line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except OSError:
+            return
+
+    def append(self, error_data: Dict[str, Any], ts: Optional[float] = None):
+        """Append a processed error to the journal.
+
+        Private fields (leading underscore) are skipped and values that
+        are not JSON types are stored as strings.
+
+        Args:
+            error_data: Error record
+            ts: Journal timestamp (defaults to now)
+        """
+        record = {key: value for key, value in error_data.items()
+                  if not key.startswith('_')}
+        record['ts'] = time.time() if ts is None else ts
+        line = json.dumps(record, default=str) + '\n'
+
+        with self._lock:
+            if self._file.closed:
+                self._file = open(self.active_path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+            _index_record(self.active_index, record)
+            if self._file.tell() >= self.max_segment_bytes:
+                self._rotate()
+
+    def _rotate(self):
+        """Seal the active segment and start a new one (lock held)."""
+        self._file.close()
+        self._write_index(self.active_path, self.active_index)
+        self.indexes[self.active_path] = self.active_index
+
+        number = int(self.active_path.stem.split('-')[1]) + 1
+        self.active_path = self._segment_path(number)
+        self.active_index = _new_index()
+        self._file = open(self.active_path, 'a', encoding='utf-8')
+
+        while len(self.indexes) + 1 > self.max_segments:
+            oldest = min(self.indexes)
+            del self.indexes[oldest]
+            for path in (oldest, self._index_path(oldest)):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def _segments(self) -> List[tuple]:
+        """Snapshot of (path, index) for every segment, oldest first."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+            segments = sorted(self.indexes.items())
+            segments.append((self.active_path, copy.deepcopy(self.active_index)))
+        return segments
+
+    def replay(self, since: Optional[float] = None, until: Optional[float] = None,
+               error_id: Optional[str] = None,
+               category: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield journaled errors in time order, optionally filtered.
+
+        Segments outside the time range or without the requested
+        error_id/category are skipped using their indexes.
+
+        Args:
+            since: Earliest timestamp (epoch seconds, inclusive)
+            until: Latest timestamp (epoch seconds, exclusive)
+            error_id: Only this error
+            category: Only this category
+
+        Yields:
+            Journal records
+        """
+        for segment, index in self._segments():
+            if not index['records']:
+                continue
+            if since is not None and index['max_ts'] < since:
+                continue
+            if until is not None and index['min_ts'] >= until:
+                continue
+            if error_id is not None and error_id not in index['errors']:
+                continue
+            if category is not None and category not in index['categories']:
+                continue
+
+            for record in self._read_segment(segment, contains=error_id):
+                ts = record.get('ts', 0)
+                if since is not None and ts < since:
+                    continue
+                if until is not None and ts >= until:
+                    continue
+                if error_id is not None and record.get('error_id') != error_id:
+                    continue
+                if category is not None and record.get('category') != category:
+                    continue
+                yield record
+
+    def top_errors(self, since: Optional[float] = None,
+                   until: Optional[float] = None, limit: int = 10,
+                   category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most frequent errors (by occurrences) within a time window.
+
+        Args:
+            since: Window start (epoch seconds, None = beginning)
+            until: Window end (epoch seconds, None = now)
+            limit: Maximum errors returned
+            category: Only this category
+
+        Returns:
+            Error summaries sorted by descending count
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+
+        def merge(error_id, entry):
+            total = totals.get(error_id)
+            if total is None:
+                totals[error_id] = dict(entry)
+            else:
+                total['count'] += entry['count']
+                total['first'] = min(total['first'], entry['first'])
+                total['last'] = max(total['last'], entry['last'])
+
+        for segment, index in self._segments():
+            if not index['records']:
+                continue
+            if since is not None and index['max_ts'] < since:
+                continue
+            if until is not None and index['min_ts'] >= until:
+                continue
+            inside = ((since is None or index['min_ts'] >= since)
+                      and (until is None or index['max_ts'] < until))
+            if inside:
+                # Whole segment in the window: use its summary
+                for error_id, entry in index['errors'].items():
+                    if category is None or entry['category'] == category:
+                        merge(error_id, entry)
+                continue
+
+            partial = _new_index()
+            for record in self._read_segment(segment):
+                ts = record.get('ts', 0)
+                if ((since is None or ts >= since) and (until is None or ts < until)
+                        and (category is None or record.get('category') == category)):
+                    _index_record(partial, record)
+            for error_id, entry in partial['errors'].items():
+                merge(error_id, entry)
+
+        ranked = sorted(totals.items(), key=lambda item: item[1]['count'], reverse=True)
+        return [{'error_id': error_id, **entry} for error_id, entry in ranked[:limit]]
+
+    def first_occurrence(self, after: float,
+                         error_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """First journaled error at or after a time (e.g. a deploy).
+
+        Args:
+            after: Epoch seconds
+            error_id: Only this error (None = any error)
+
+        Returns:
+            The earliest matching record or None
+        """
+        for record in self.replay(since=after, error_id=error_id):
+            return record
+        return None
+
+    def new_errors_since(self, since: float) -> List[Dict[str, Any]]:
+        """Errors whose first-ever occurrence is at or after a time.
+
+        Useful after a deploy to list regressions the release introduced.
+
+        Args:
+            since: Epoch seconds
+
+        Returns:
+            Error summaries ordered by first occurrence
+        """
+        first_seen: Dict[str, Dict[str, Any]] = {}
+        for _, index in self._segments():
+            for error_id, entry in index['errors'].items():
+                known = first_seen.get(error_id)
+                if known is None:
+                    first_seen[error_id] = dict(entry)
+                else:
+                    known['count'] += entry['count']
+                    known['first'] = min(known['first'], entry['first'])
+                    known['last'] = max(known['last'], entry['last'])
+        fresh = [{'error_id': error_id, **entry}
+                 for error_id, entry in first_seen.items() if entry['first'] >= since]
+        return sorted(fresh, key=lambda entry: entry['first'])
+
+    def close(self):
+        """Flush and close the active segment."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
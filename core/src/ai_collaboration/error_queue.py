@@ -0,0 +1,253 @@
+"""
+Error Queue for GHST Agent System
+
+Bounded priority queue for captured errors. Items are served by severity
+(critical first, FIFO within a severity) and items sharing an ``error_id``
+are coalesced while they wait: the queued item gains an occurrence count
+and a first-seen/last-seen window instead of a duplicate entry. A crash
+loop raising the same exception thousands of times therefore costs one
+ghost analysis, not thousands.
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Lower number = served first
+SEVERITY_PRIORITY = {'critical': 0, 'error': 1, 'warning': 2, 'info': 3}
+DEFAULT_PRIORITY = SEVERITY_PRIORITY['error']
+
+
+class ErrorQueue:
+    """Bounded, severity-ordered, deduplicating queue of error records.
+
+    Overflow policies:
+        drop_oldest: evict the oldest item of the lowest queued severity
+            (a new item less severe than everything queued is dropped)
+        drop_new: drop the incoming item
+        block: wait for space (backpressure), up to the put timeout
+    """
+
+    POLICIES = ('drop_oldest', 'drop_new', 'block')
+
+    def __init__(self, maxsize: int = 1000, policy: str = 'drop_oldest',
+                 key_field: str = 'error_id'):
+        """Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of distinct queued errors
+            policy: Overflow policy ('drop_oldest', 'drop_new' or 'block')
+            key_field: Record field identifying duplicate errors
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self.key_field = key_field
+
+        self._priorities = sorted(set(SEVERITY_PRIORITY.values()))
+        # priority -> key -> (record, enqueued_at)
+        self._levels: Dict[int, "OrderedDict[Hashable, Tuple[Dict[str, Any], float]]"] = {
+            priority: OrderedDict() for priority in self._priorities
+        }
+        self._index: Dict[Hashable, int] = {}
+        self._closed = False
+        self._lock = threading.Lock()
+        self.not_empty = threading.Condition(self._lock)
+        self.not_full = threading.Condition(self._lock)
+
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    @staticmethod
+    def priority_of(record: Dict[str, Any]) -> int:
+        """Return the queue priority of a record from its severity."""
+        return SEVERITY_PRIORITY.get(record.get('severity'), DEFAULT_PRIORITY)
+
+    def put(self, record: Dict[str, Any], block: bool = True,
+            timeout: Optional[float] = None) -> bool:
+        """Queue an error record, coalescing it with a queued duplicate.
+
+        Args:
+            record: Error record (must carry the key field to coalesce)
+            block: Whether the 'block' policy may wait for space
+            timeout: Maximum seconds to wait under the 'block' policy
+
+        Returns:
+            True if the record was queued or coalesced, False if dropped
+        """
+        key = record.get(self.key_field)
+        priority = self.priority_of(record)
+
+        with self._lock:
+            if key is not None and key in self._index:
+                self._coalesce(key, record, priority)
+                return True
+
+            if len(self._index) >= self.maxsize and not self._make_room(
+                    priority, block, timeout):
+                self.dropped += 1
+                return False
+
+            if key is None:
+                key = ('anonymous', self.enqueued)
+            record.setdefault('occurrences', 1)
+            record.setdefault('first_seen', record.get('timestamp'))
+            record.setdefault('last_seen', record.get('timestamp'))
+            self._levels[priority][key] = (record, time.monotonic())
+            self._index[key] = priority
+            self.enqueued += 1
+            self.not_empty.notify()
+            return True
+
+    def _coalesce(self, key: Hashable, record: Dict[str, Any], priority: int):
+        """Fold a duplicate into the queued record (lock held)."""
+        current = self._index[key]
+        queued, enqueued_at = self._levels[current][key]
+        queued['occurrences'] = queued.get('occurrences', 1) + record.get('occurrences', 1)
+        queued['last_seen'] = record.get('last_seen', record.get('timestamp'))
+        if priority < current:
+            # Escalate: a worse occurrence moves the error up the queue
+            del self._levels[current][key]
+            queued['severity'] = record.get('severity')
+            self._levels[priority][key] = (queued, enqueued_at)
+            self._index[key] = priority
+        self.coalesced += 1
+
+    def _make_room(self, priority: int, block: bool,
+                   timeout: Optional[float]) -> bool:
+        """Apply the overflow policy (lock held).
+
+        Returns:
+            True if there is now room for an item of this priority
+        """
+        if self.policy == 'drop_new':
+            return False
+
+        if self.policy == 'block':
+            if not block:
+                return False
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while len(self._index) >= self.maxsize:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.not_full.wait(remaining)
+            return True
+
+        # drop_oldest: evict from the least severe non-empty level
+        for level in reversed(self._priorities):
+            if level < priority:
+                return False
+            if self._levels[level]:
+                evicted_key, _ = self._levels[level].popitem(last=False)
+                del self._index[evicted_key]
+                self.dropped += 1
+                return True
+        return False
+
+    def get(self, block: bool = True,
+            timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Remove and return the most severe, oldest queued record.
+
+        Args:
+            block: Wait for a record if the queue is empty
+            timeout: Maximum seconds to wait (None waits until a record
+                arrives or the queue is closed)
+
+        Returns:
+            Error record
+
+        Raises:
+            queue.Empty: If no record became available, or the queue was
+                closed and is drained
+        """
+        return self.get_timed(block, timeout)[0]
+
+    def get_timed(self, block: bool = True, timeout: Optional[float] = None
+                  ) -> Tuple[Dict[str, Any], float]:
+        """Like ``get`` but also return how long the record waited.
+
+        Returns:
+            (record, seconds spent queued)
+        """
+        with self.not_empty:
+            if block:
+                if not self.not_empty.wait_for(
+                        lambda: self._index or self._closed, timeout):
+                    raise queue.Empty
+            if not self._index:
+                raise queue.Empty
+
+            for level in self._priorities:
+                if self._levels[level]:
+                    key, (record, enqueued_at) = self._levels[level].popitem(last=False)
+                    del self._index[key]
+                    self.not_full.notify()
+                    return record, time.monotonic() - enqueued_at
+            raise queue.Empty
+
+    def close(self):
+        """Wake every waiting consumer; ``get`` fails once drained.
+
+        Records can still be queued after closing (they wait for
+        ``reopen``).
+        """
+        with self._lock:
+            self._closed = True
+            self.not_empty.notify_all()
+
+    def reopen(self):
+        """Allow consumers to block on the queue again."""
+        with self._lock:
+            self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """Whether the queue has been closed."""
+        return self._closed
+
+    def clear(self) -> int:
+        """Discard every queued record.
+
+        Returns:
+            Number of records discarded
+        """
+        with self._lock:
+            discarded = len(self._index)
+            for level in self._levels.values():
+                level.clear()
+            self._index.clear()
+            self.not_full.notify_all()
+            return discarded
+
+    def qsize(self) -> int:
+        """Number of distinct errors waiting."""
+        return len(self._index)
+
+    def empty(self) -> bool:
+        """Whether no errors are waiting."""
+        return not self._index
+
+    def __len__(self) -> int:
+        """Number of distinct errors waiting."""
+        return len(self._index)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and coalescing/drop counters.
+
+        Returns:
+            Statistics dictionary
+        """
+        with self._lock:
+            return {
+                'depth': len(self._index),
+                'max_size': self.maxsize,
+                'policy': self.policy,
+                'enqueued': self.enqueued,
+                'coalesced': self.coalesced,
+                'dropped': self.dropped
+            }
@@ -0,0 +1,113 @@
+"""
+Error Statistics for GHST Agent System
+
+Running error counts per category and severity, all-time and over sliding
+1 minute / 1 hour / 24 hour windows. Counts are updated as errors are
+processed, so statistics never rescan the error history.
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional
+
+try:
+    from ..utils.rolling_counter import RollingCounter
+except ImportError:  # imported with src/ on sys.path
+    from utils.rolling_counter import RollingCounter
+
+# Window name -> (length in seconds, bucket count)
+WINDOWS = {
+    '1m': (60, 60),
+    '1h': (3600, 60),
+    '24h': (86400, 96)
+}
+
+
+class ErrorStatistics:
+    """All-time and windowed error counters by category and severity."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.total = 0
+        self.categories: Counter = Counter()
+        self.severities: Counter = Counter()
+        self._windows: Dict[str, Dict[str, Dict[str, RollingCounter]]] = {
+            'total': {}, 'categories': {}, 'severities': {}}
+        self._lock = threading.Lock()
+
+    def _counters(self, group: str, key: str) -> Dict[str, RollingCounter]:
+        """Return the window counters for a key, creating them (lock held)."""
+        counters = self._windows[group].get(key)
+        if counters is None:
+            counters = self._windows[group][key] = {
+                name: RollingCounter(length, buckets)
+                for name, (length, buckets) in WINDOWS.items()}
+        return counters
+
+    def record(self, category: str, severity: str, count: int = 1,
+               now: Optional[float] = None):
+        """Count processed errors.
+
+        Args:
+            category: Error category
+            severity: Error severity
+            count: Occurrences represented (coalesced duplicates)
+            now: Event time (defaults to the current time)
+        """
+        with self._lock:
+            self.total += count
+            self.categories[category] += count
+            self.severities[severity] += count
+            counters = (list(self._counters('total', 'all').values())
+                        + list(self._counters('categories', category).values())
+                        + list(self._counters('severities', severity).values()))
+        for counter in counters:
+            counter.add(count, now)
+
+    def window(self, name: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """Get counts for one sliding window.
+
+        Args:
+            name: Window name ('1m', '1h' or '24h')
+            now: End of the window (defaults to the current time)
+
+        Returns:
+            Dictionary with total, categories and severities
+        """
+        with self._lock:
+            groups = {group: dict(keys) for group, keys in self._windows.items()}
+
+        def counts(group):
+            result = {}
+            for key, counters in groups[group].items():
+                count = counters[name].total(now)
+                if count:
+                    result[key] = count
+            return result
+
+        total = groups['total'].get('all')
+        return {
+            'total': total[name].total(now) if total else 0,
+            'categories': counts('categories'),
+            'severities': counts('severities')
+        }
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Get all-time counts and every window.
+
+        Args:
+            now: End of the windows (defaults to the current time)
+
+        Returns:
+            Statistics dictionary
+        """
+        with self._lock:
+            categories = dict(self.categories)
+            severities = dict(self.severities)
+            total = self.total
+        return {
+            'total': total,
+            'categories': categories,
+            'severities': severities,
+            'windows': {name: self.window(name, now) for name in WINDOWS}
+        }
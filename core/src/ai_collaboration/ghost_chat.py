@@ -21,10 +21,27 @@ import time
 from datetime import datetime
 from typing import Dict, List
 
+try:
+    from ..utils.keyword_classifier import KeywordClassifier
+except ImportError:  # imported with src/ on sys.path
+    from utils.keyword_classifier import KeywordClassifier
+
 
 class GhostChatInterface:
     """Conversational interface for interacting with the GHST Agent collective."""
 
+    # Message routes in priority order (idea capture is checked first)
+    MESSAGE_ROUTES = KeywordClassifier([
+        ('_handle_idea_capture', ['idea:', 'feature:', 'what i', 'could we', 'suggestion:']),
+        ('_handle_visual_query', ['theme', 'color', 'appearance', 'visual']),
+        ('_handle_slicing_query', ['slice', 'print', 'gcode', 'settings']),
+        ('_handle_error_query', ['error', 'problem', 'issue', 'bug']),
+        ('_handle_optimization_query', ['optimize', 'improve', 'better', 'faster']),
+        ('_handle_materials_query', ['material', 'filament', 'temperature']),
+        ('_handle_randomization_query', ['random', 'surprise', 'choose']),
+        ('_handle_task_management_query', ['tasks', 'ideas', 'background', 'todo'])
+    ], default='_handle_general_query')
+
     def __init__(self, ghst_manager):
         self.ghst_manager = ghst_manager
         self.chat_history = []
@@ -42,8 +59,6 @@ class GhostChatInterface:
 
     def process_user_message(self, message: str) -> str:
         """Process user message and route to appropriate GHST Agent specialist."""
-        message_lower = message.lower()
-
         # Store message in history
         self.chat_history.append({
             'timestamp': datetime.now().isoformat(),
@@ -51,32 +66,10 @@ class GhostChatInterface:
             'response': None
         })
 
-        # Check for idea capture keywords first
-        if any(
-            word in message_lower for word in [
-                'idea:',
-                'feature:',
-                'what i',
-                'could we',
-                'suggestion:']):
-            response = self._handle_idea_capture(message)
         # Route message to appropriate GHST Agent based on keywords
-        elif any(word in message_lower for word in ['theme', 'color', 'appearance', 'visual']):
-            response = self._handle_visual_query(message)
-        elif any(word in message_lower for word in ['slice', 'print', 'gcode', 'settings']):
-            response = self._handle_slicing_query(message)
-        elif any(word in message_lower for word in ['error', 'problem', 'issue', 'bug']):
-            response = self._handle_error_query(message)
-        elif any(word in message_lower for word in ['optimize', 'improve', 'better', 'faster']):
-            response = self._handle_optimization_query(message)
-        elif any(word in message_lower for word in ['material', 'filament', 'temperature']):
-            response = self._handle_materials_query(message)
-        elif any(word in message_lower for word in ['random', 'surprise', 'choose']):
-            response = self._handle_randomization_query(message)
-        elif any(word in message_lower for word in ['tasks', 'ideas', 'background', 'todo']):
-            response = self._handle_task_management_query(message)
-        else:
-            response = self._handle_general_query(message)
+        handler = getattr(self, self.MESSAGE_ROUTES.first(message),
+                          self._handle_general_query)
+        response = handler(message)
 
         # Update chat history with response
         self.chat_history[-1]['response'] = response
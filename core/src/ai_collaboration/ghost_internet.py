@@ -0,0 +1,406 @@
+"""
+Ghost Internet - FOSS Lookup Client
+
+Shared client the Ghost collective uses to search FOSS code on GitHub:
+- One pooled ``requests.Session`` (keep-alive) for all lookups
+- Token-bucket rate limiting so error bursts cannot flood the API
+- Persistent TTL response cache, reloaded on restart (writes are
+  batched: at most one save per ``cache_save_interval``)
+- Single-flight coalescing: concurrent identical queries share one request
+
+⚠️ Search results are unverified third-party code - review before use
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from ..utils.async_logging import LOG_DIR
+    from ..utils.ttl_cache import TTLCache
+except ImportError:  # imported with src/ on sys.path
+    from utils.async_logging import LOG_DIR
+    from utils.ttl_cache import TTLCache
+
+DEFAULT_CACHE_PATH = LOG_DIR / 'foss_lookup_cache.json'
+
+
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """Initialize the bucket (starts full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to max(1, rate))
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Add the tokens earned since the last update."""
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens without waiting.
+
+        Args:
+            tokens: Tokens needed
+
+        Returns:
+            True if the tokens were taken
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0,
+                timeout: Optional[float] = None) -> bool:
+        """Take tokens, waiting for the bucket to refill if needed.
+
+        Args:
+            tokens: Tokens needed
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the tokens were taken before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate if self.rate > 0 else 1.0
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class PersistentTTLCache(TTLCache):
+    """TTLCache that can be saved to and reloaded from a JSON file.
+
+    Keys must be strings and values JSON-serializable. Expiry times are
+    stored as wall-clock timestamps so entries survive a restart.
+
+    ``set`` does not write the file itself: the first change after a
+    save schedules one save ``save_interval`` seconds later, so a burst
+    of new entries costs a single rewrite. Call ``close`` (or ``flush``)
+    to write pending changes right away.
+    """
+
+    def __init__(self, path: Optional[Path], max_entries: int = 1024,
+                 ttl: Optional[float] = None, save_interval: float = 30.0):
+        """Initialize the cache and load any saved entries.
+
+        Args:
+            path: JSON file backing the cache (None keeps it in memory)
+            max_entries: Maximum number of entries before LRU eviction
+            ttl: Entry lifetime in seconds (None = never expires)
+            save_interval: Seconds to collect changes before saving
+                (0 saves on every change)
+        """
+        super().__init__(max_entries=max_entries, ttl=ttl)
+        self.path = Path(path) if path else None
+        self.save_interval = save_interval
+        self.saves = 0
+        self.logger = logging.getLogger(__name__)
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+        self.load()
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value and schedule a save."""
+        super().set(key, value, ttl)
+        if not self.path:
+            return
+        if self.save_interval <= 0:
+            self.save()
+            return
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_interval, self._timed_save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _timed_save(self):
+        with self._save_lock:
+            self._save_timer = None
+        self.flush()
+
+    def flush(self):
+        """Save now if there are unsaved changes."""
+        if self._dirty:
+            self.save()
+
+    def close(self):
+        """Cancel the scheduled save and write pending changes."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+        self.flush()
+
+    def load(self) -> int:
+        """Load unexpired entries from disk.
+
+        Returns:
+            Number of entries loaded
+        """
+        if not self.path or not self.path.exists():
+            return 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable lookup cache {self.path}: {e}")
+            return 0
+
+        wall_now, mono_now = time.time(), time.monotonic()
+        loaded = 0
+        with self._lock:
+            for key, expires_at, value in saved.get('entries', []):
+                if expires_at is not None:
+                    if expires_at <= wall_now:
+                        continue
+                    expires_at = mono_now + (expires_at - wall_now)
+                self._entries[key] = (expires_at, value)
+                loaded += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return loaded
+
+    def save(self):
+        """Write unexpired entries to disk atomically."""
+        if not self.path:
+            return
+        self._dirty = False
+        wall_now, mono_now = time.time(), time.monotonic()
+        with self._lock:
+            entries = [
+                [key, None if expires_at is None else wall_now + (expires_at - mono_now), value]
+                for key, (expires_at, value) in self._entries.items()
+                if expires_at is None or expires_at > mono_now
+            ]
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': entries}, f)
+            os.replace(tmp_path, self.path)
+            self.saves += 1
+        except (OSError, TypeError) as e:
+            self.logger.error(f"Failed to save lookup cache {self.path}: {e}")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution."""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._calls: Dict[Hashable, 'SingleFlight._Call'] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` unless a call with the same key is already running.
+
+        Callers that join an in-flight call receive its result (or its
+        exception).
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument callable doing the work
+
+        Returns:
+            Result of ``fn``
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+class FOSSLookupClient:
+    """Pooled, cached and rate-limited client for GitHub code search."""
+
+    def __init__(self, base_url: str = "https://api.github.com",
+                 token: Optional[str] = None,
+                 rate_limit: float = 0.5, burst: int = 5,
+                 cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+                 cache_ttl: float = 6 * 3600, max_entries: int = 512,
+                 cache_save_interval: float = 30.0,
+                 timeout: float = 10.0, pool_size: int = 4,
+                 session: Optional[requests.Session] = None):
+        """Initialize the lookup client.
+
+        Args:
+            base_url: API root (point at a local server for testing)
+            token: Optional GitHub token sent as a bearer token
+            rate_limit: Sustained requests per second
+            burst: Requests allowed back-to-back before throttling
+            cache_path: JSON file for the response cache (None = memory only)
+            cache_ttl: Seconds a cached response stays valid
+            max_entries: Maximum cached responses
+            cache_save_interval: Seconds to collect new responses before
+                rewriting the cache file
+            timeout: Per-request timeout in seconds
+            pool_size: Keep-alive connections kept per host (only for
+                the client's own session)
+            session: Pre-configured session to use instead of a new one;
+                it is used as is and left open by ``close``
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.logger = logging.getLogger('FOSSLookupClient')
+
+        # Sent with every request rather than set on a caller's session
+        self.headers = {'Accept': 'application/vnd.github+json'}
+        if token:
+            self.headers['Authorization'] = f"Bearer {token}"
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+
+        self.rate_limiter = TokenBucket(rate_limit, burst)
+        self.cache = PersistentTTLCache(cache_path, max_entries=max_entries,
+                                        ttl=cache_ttl,
+                                        save_interval=cache_save_interval)
+        self.single_flight = SingleFlight()
+        self.requests_made = 0
+        self.rate_limited = 0
+
+    @staticmethod
+    def _cache_key(path: str, params: Dict[str, Any]) -> str:
+        """Build a stable cache key for a request."""
+        return path + '?' + json.dumps(params, sort_keys=True)
+
+    def get_json(self, path: str, params: Dict[str, Any],
+                 wait: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """GET a JSON document through the cache, limiter and pool.
+
+        Only successful responses are cached.
+
+        Args:
+            path: API path (e.g. '/search/code')
+            params: Query parameters
+            wait: Maximum seconds to wait for a rate-limit token
+                (defaults to the request timeout)
+
+        Returns:
+            Decoded JSON or None if the request failed or was throttled
+        """
+        key = self._cache_key(path, params)
+        missing = object()
+        cached = self.cache.get(key, missing)
+        if cached is not missing:
+            return cached
+
+        def fetch():
+            if not self.rate_limiter.acquire(timeout=self.timeout if wait is None else wait):
+                self.rate_limited += 1
+                self.logger.warning(f"FOSS lookup throttled: {path}")
+                return None
+            self.requests_made += 1
+            response = self.session.get(self.base_url + path, params=params,
+                                        headers=self.headers, timeout=self.timeout)
+            if response.status_code != 200:
+                self.logger.warning(
+                    f"FOSS lookup failed ({response.status_code}): {path}")
+                return None
+            data = response.json()
+            self.cache.set(key, data)
+            return data
+
+        return self.single_flight.do(key, fetch)
+
+    def search_code(self, query: str, per_page: int = 5) -> List[Dict[str, Any]]:
+        """Search GitHub code for FOSS solutions.
+
+        Args:
+            query: Free-text problem description
+            per_page: Maximum results
+
+        Returns:
+            List of search result items
+        """
+        params = {
+            'q': f"{query} language:python OR language:cpp",
+            'sort': 'indexed',
+            'per_page': per_page
+        }
+        data = self.get_json('/search/code', params)
+        return (data or {}).get('items', [])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request, throttling, coalescing and cache statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        stats = self.cache.get_stats()
+        stats.update({
+            'requests_made': self.requests_made,
+            'rate_limited': self.rate_limited,
+            'coalesced': self.single_flight.coalesced
+        })
+        return stats
+
+    def close(self):
+        """Persist the cache and close the client's own connections."""
+        self.cache.close()
+        if self._owns_session:
+            self.session.close()
@@ -33,11 +33,24 @@ import logging
 import requests
 import json
 import time
+import sys
 import threading
-from typing import Dict, List, Optional, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from .ghost_internet import FOSSLookupClient
+    from ..utils.ghost_metrics import default_metrics
+    from ..utils.keyword_classifier import KeywordClassifier
+    from ..utils.metrics_exporter import MetricsExporter
+except ImportError:  # imported with src/ on sys.path
+    from ai_collaboration.ghost_internet import FOSSLookupClient
+    from utils.ghost_metrics import default_metrics
+    from utils.keyword_classifier import KeywordClassifier
+    from utils.metrics_exporter import MetricsExporter
+
 # Mock imports - replace with actual AI/LLM libraries
 # from mistral import MistralClient  # FOSS LLM
 # from openai import OpenAI  # Alternative
@@ -45,7 +58,21 @@ from pathlib import Path
 class GhostManager:
     """Manages the Ghost collective and their activities."""
     
-    def __init__(self, github_token: Optional[str] = None, repo: str = "allanwrench28/FANTOM"):
+    # Keyword rules in priority order, each compiled into a single pass
+    PROBLEM_TYPES = KeywordClassifier([
+        ('geometry', ['mesh', 'geometry']),
+        ('slicing', ['slice', 'layer']),
+        ('support_generation', ['support']),
+        ('infill', ['infill'])
+    ], default='general')
+    SEVERITY_LEVELS = KeywordClassifier([
+        ('critical', ['crash', 'error', 'exception', 'fail']),
+        ('warning', ['slow', 'inefficient', 'suboptimal'])
+    ], default='info')
+
+    def __init__(self, github_token: Optional[str] = None, repo: str = "allanwrench28/FANTOM",
+                 foss_client: Optional[FOSSLookupClient] = None,
+                 enrichment_workers: int = 4):
         """Initialize Ghost Manager with FULL ADMIN ACCESS."""
         self.github_token = github_token or "GHOST_ADMIN_ACCESS"
         self.repo = repo
@@ -57,6 +84,11 @@ class GhostManager:
         self.running = False
         self.pending_commits = []  # Commit approval queue
         self.ghost_recruitment_active = True  # Auto-recruit new Ghosts
+        self.metrics_exporter = None  # Optional OpenMetrics endpoint
+        self.foss_client = foss_client or FOSSLookupClient()  # Pooled, cached FOSS search
+        # Slow analysis stages (network, LLM) run here, never on the caller
+        self.enrichment_executor = ThreadPoolExecutor(
+            max_workers=enrichment_workers, thread_name_prefix='ghost-enrich')
         
         # Initialize logging
         logging.basicConfig(
@@ -273,77 +305,129 @@ caused by this code. Please review carefully before merging.
             return []
             
         try:
-            # Search GitHub for relevant FOSS code
-            search_url = "https://api.github.com/search/code"
-            params = {
-                'q': f"{query} language:python OR language:cpp",
-                'sort': 'indexed',
-                'per_page': 5
-            }
-            
-            response = requests.get(search_url, params=params, timeout=10)
-            if response.status_code == 200:
-                results = response.json().get('items', [])
-                self.log_activity(f"🔍 Found {len(results)} FOSS solutions for: {query[:30]}...")
-                return results
-            else:
-                self.log_activity(f"⚠️ GitHub search failed: {response.status_code}")
-                return []
+            # Search GitHub for relevant FOSS code (cached, rate limited,
+            # identical in-flight queries coalesced)
+            results = self.foss_client.search_code(query)
+            self.log_activity(f"🔍 Found {len(results)} FOSS solutions for: {query[:30]}...")
+            return results
                 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             self.log_activity(f"❌ Internet query failed: {e}")
             return []
             
-    def analyze_with_ai(self, problem: str, context: str = "") -> Dict[str, Any]:
-        """Analyze problem using AI/LLM with internet research."""
+    def analyze_with_ai(self, problem: str, context: str = "",
+                        callback: Optional[Callable[[Dict[str, Any]], None]] = None
+                        ) -> Dict[str, Any]:
+        """Analyze problem using AI/LLM with internet research.
+
+        With a ``callback``, only the cheap local stage (classification,
+        severity, candidate solutions) runs on the caller's thread: FOSS
+        research and other slow enrichment run in the background, the
+        returned analysis has ``enrichment`` set to 'pending' and
+        ``callback`` receives the enriched analysis when it is ready.
+        Without a callback the analysis is enriched before returning.
+
+        Args:
+            problem: Problem description
+            context: Additional context for the analysis
+            callback: Called once with the final analysis (on a worker
+                thread; on the caller's thread if local analysis failed)
+
+        Returns:
+            Local analysis when a callback is given, else the enriched one
+        """
+        analysis = self._local_analysis(problem, context)
+        if 'error' in analysis:
+            if callback:
+                callback(analysis)
+            return analysis
+        if callback is None:
+            return self._enrich_analysis(dict(analysis), problem, context)
+
+        future = self._submit_enrichment(dict(analysis), problem, context)
+
+        def deliver(done: Future):
+            try:
+                enriched = done.result()
+            except Exception:  # cancelled at shutdown
+                enriched = dict(analysis, enrichment='skipped')
+            try:
+                callback(enriched)
+            except Exception as e:
+                self.log_activity(f"❌ AI analysis callback failed: {e}")
+        future.add_done_callback(deliver)
+        return analysis
+
+    def analyze_with_ai_async(self, problem: str, context: str = "") -> Future:
+        """Analyze problem and return a future for the enriched analysis.
+
+        Args:
+            problem: Problem description
+            context: Additional context for the analysis
+
+        Returns:
+            Future resolving to the fully enriched analysis
+        """
+        analysis = self._local_analysis(problem, context)
+        if 'error' in analysis:
+            future: Future = Future()
+            future.set_result(analysis)
+            return future
+        return self._submit_enrichment(analysis, problem, context)
+
+    def _local_analysis(self, problem: str, context: str) -> Dict[str, Any]:
+        """Stage 1: cheap, local-only analysis."""
         try:
             # This would integrate with actual AI services
             # For now, simulate intelligent analysis
-            
-            analysis = {
-                'problem_type': self._classify_problem(problem),
-                'severity': self._assess_severity(problem),
-                'suggested_solutions': self._generate_solutions(problem, context),
-                'foss_references': self.query_foss_resources(problem),
-                'confidence': 0.85,
-                'disclaimer': "⚠️ AI-generated analysis - verify before implementation"
-            }
-            
-            self.log_activity(f"🧠 AI analysis complete for: {problem[:30]}...")
-            return analysis
-            
+            with default_metrics.timed('ghost_manager', 'analyze_local'):
+                return {
+                    'problem_type': self._classify_problem(problem),
+                    'severity': self._assess_severity(problem),
+                    'suggested_solutions': self._generate_solutions(problem, context),
+                    'foss_references': [],
+                    'confidence': 0.85,
+                    'enrichment': 'pending',
+                    'disclaimer': "⚠️ AI-generated analysis - verify before implementation"
+                }
+
         except Exception as e:
             self.log_activity(f"❌ AI analysis failed: {e}")
             return {'error': str(e)}
             
+    def _submit_enrichment(self, analysis: Dict[str, Any], problem: str,
+                           context: str) -> Future:
+        """Stage 2: schedule slow enrichment of a local analysis."""
+        try:
+            return self.enrichment_executor.submit(
+                self._enrich_analysis, analysis, problem, context)
+        except RuntimeError:  # executor shut down
+            analysis['enrichment'] = 'skipped'
+            future: Future = Future()
+            future.set_result(analysis)
+            return future
+
+    def _enrich_analysis(self, analysis: Dict[str, Any], problem: str,
+                         context: str) -> Dict[str, Any]:
+        """Add FOSS research to an analysis (runs on a worker thread)."""
+        try:
+            with default_metrics.timed('ghost_manager', 'analyze_enrich'):
+                # LLM-backed analysis would also run in this stage
+                analysis['foss_references'] = self.query_foss_resources(problem)
+            analysis['enrichment'] = 'complete'
+            self.log_activity(f"🧠 AI analysis complete for: {problem[:30]}...")
+        except Exception as e:
+            analysis['enrichment'] = 'failed'
+            self.log_activity(f"❌ AI analysis enrichment failed: {e}")
+        return analysis
+
     def _classify_problem(self, problem: str) -> str:
         """Classify the type of problem."""
-        problem_lower = problem.lower()
-        
-        if 'mesh' in problem_lower or 'geometry' in problem_lower:
-            return 'geometry'
-        elif 'slice' in problem_lower or 'layer' in problem_lower:
-            return 'slicing'
-        elif 'support' in problem_lower:
-            return 'support_generation'
-        elif 'infill' in problem_lower:
-            return 'infill'
-        else:
-            return 'general'
+        return self.PROBLEM_TYPES.first(problem)
             
     def _assess_severity(self, problem: str) -> str:
         """Assess problem severity."""
-        problem_lower = problem.lower()
-        
-        critical_keywords = ['crash', 'error', 'exception', 'fail']
-        warning_keywords = ['slow', 'inefficient', 'suboptimal']
-        
-        if any(keyword in problem_lower for keyword in critical_keywords):
-            return 'critical'
-        elif any(keyword in problem_lower for keyword in warning_keywords):
-            return 'warning'
-        else:
-            return 'info'
+        return self.SEVERITY_LEVELS.first(problem)
             
     def _generate_solutions(self, problem: str, context: str) -> List[str]:
         """Generate potential solutions."""
@@ -357,9 +441,34 @@ caused by this code. Please review carefully before merging.
         
         return base_solutions
         
+    def start_metrics_exporter(self, port: int = 9464,
+                               host: str = "127.0.0.1") -> MetricsExporter:
+        """Serve collective metrics in OpenMetrics format on a local port.
+
+        Ghost operation metrics are registered automatically; register
+        error handlers, plugin loaders, memory systems and caches on the
+        returned exporter.
+        """
+        if self.metrics_exporter is None:
+            self.metrics_exporter = MetricsExporter(host=host, port=port)
+            self.metrics_exporter.add_ghost_metrics(default_metrics)
+            self.metrics_exporter.add_cache('foss_lookup', self.foss_client)
+            self.metrics_exporter.start()
+            self.log_activity(
+                f"📈 Metrics exporter started on port {self.metrics_exporter.port}")
+        return self.metrics_exporter
+
     def shutdown(self):
         """Shutdown Ghost manager and clean up resources."""
         self.stop_monitoring()
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+        if sys.version_info >= (3, 9):
+            self.enrichment_executor.shutdown(wait=False, cancel_futures=True)
+        else:  # cancel_futures is new in Python 3.9
+            self.enrichment_executor.shutdown(wait=False)
+        self.foss_client.close()
         self.log_activity("💤 Ghost collective shutdown complete")
 
 
@@ -378,7 +487,8 @@ class BaseGhost:
         
         while self.active and self.manager.running:
             try:
-                self.monitor_cycle()
+                with default_metrics.timed(self.ghost_id, 'monitor_cycle'):
+                    self.monitor_cycle()
                 time.sleep(30)  # Monitor every 30 seconds
             except Exception as e:
                 self.manager.log_activity(f"❌ {self.ghost_id} error: {e}")
@@ -745,7 +855,20 @@ class ChatBotGhost(BaseGhost):
 
 class BackgroundTaskGhost(BaseGhost):
     """Specialized Ghost for capturing and organizing user ideas and background tasks."""
-    
+
+    IDEA_CATEGORIES = KeywordClassifier([
+        ('UI/UX', ['ui', 'interface', 'design', 'visual']),
+        ('AI/Intelligence', ['ghost', 'ai', 'algorithm', 'smart']),
+        ('Core Functionality', ['slice', 'print', 'gcode', '3d']),
+        ('Performance', ['performance', 'speed', 'optimize']),
+        ('Quality Assurance', ['test', 'debug', 'error', 'quality'])
+    ], default='General Enhancement')
+    IDEA_COMPLEXITY = KeywordClassifier([
+        ('High', ['architecture', 'framework', 'system', 'algorithm', 'integration']),
+        ('Medium', ['feature', 'enhancement', 'improvement', 'optimization']),
+        ('Low', ['button', 'color', 'text', 'display', 'label'])
+    ], default='Medium')
+
     def __init__(self, ghost_id, manager):
         super().__init__(ghost_id, manager)
         self.idea_queue = []
@@ -782,37 +905,11 @@ class BackgroundTaskGhost(BaseGhost):
     
     def _categorize_idea(self, idea_text):
         """Automatically categorize the idea based on content."""
-        idea_lower = idea_text.lower()
-        
-        if any(word in idea_lower for word in ['ui', 'interface', 'design', 'visual']):
-            return 'UI/UX'
-        elif any(word in idea_lower for word in ['ghost', 'ai', 'algorithm', 'smart']):
-            return 'AI/Intelligence'
-        elif any(word in idea_lower for word in ['slice', 'print', 'gcode', '3d']):
-            return 'Core Functionality'
-        elif any(word in idea_lower for word in ['performance', 'speed', 'optimize']):
-            return 'Performance'
-        elif any(word in idea_lower for word in ['test', 'debug', 'error', 'quality']):
-            return 'Quality Assurance'
-        else:
-            return 'General Enhancement'
+        return self.IDEA_CATEGORIES.first(idea_text)
     
     def _estimate_complexity(self, idea_text):
         """Estimate implementation complexity."""
-        idea_lower = idea_text.lower()
-        
-        complex_keywords = ['architecture', 'framework', 'system', 'algorithm', 'integration']
-        medium_keywords = ['feature', 'enhancement', 'improvement', 'optimization']
-        simple_keywords = ['button', 'color', 'text', 'display', 'label']
-        
-        if any(word in idea_lower for word in complex_keywords):
-            return 'High'
-        elif any(word in idea_lower for word in medium_keywords):
-            return 'Medium'
-        elif any(word in idea_lower for word in simple_keywords):
-            return 'Low'
-        else:
-            return 'Medium'
+        return self.IDEA_COMPLEXITY.first(idea_text)
     
     def get_pending_ideas(self):
         """Get all pending ideas organized by priority and category."""
@@ -8,6 +8,11 @@ users to extend functionality through custom plugins and extensions.
 """
 
 from .base_plugin import BasePlugin
+from .gcode_file import GcodeFile
+from .gcode_parser import ParsedGcode, parse_gcode, tokenize_line
+from .gcode_stats import compute_print_stats
+from .motion_planner import MotionLimits
 from .plugin_manager import PluginManager
 
-__all__ = ['PluginManager', 'BasePlugin']
+__all__ = ['PluginManager', 'BasePlugin', 'GcodeFile', 'ParsedGcode', 'parse_gcode',
+           'tokenize_line', 'compute_print_stats', 'MotionLimits']
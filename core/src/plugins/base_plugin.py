@@ -10,7 +10,7 @@ Modeled after the GHST Agent system architecture for consistency.
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 
 @dataclass
@@ -24,6 +24,12 @@ class PluginMetadata:
     requires_gui: bool = False
     experimental: bool = False
     safety_notes: List[str] = None
+    # G-code passes may run on layer chunks in parallel worker processes
+    # (each chunk gets a fresh instance; see ``on_gcode_chunk``)
+    chunk_safe: bool = False
+    # Time budget per notification hook call (seconds); None uses the
+    # plugin manager's default
+    hook_timeout: Optional[float] = None
 
     def __post_init__(self):
         if self.safety_notes is None:
@@ -60,6 +66,11 @@ class BasePlugin(ABC):
     def cleanup(self) -> bool:
         """Clean up plugin resources. Return True if successful."""
 
+    @classmethod
+    def overrides(cls, method_name: str) -> bool:
+        """Check whether this plugin overrides a BasePlugin method."""
+        return getattr(cls, method_name, None) is not getattr(BasePlugin, method_name, None)
+
     def is_compatible(self) -> bool:
         """Check if plugin is compatible with current system."""
         # Default implementation - can be overridden
@@ -106,9 +117,44 @@ class BasePlugin(ABC):
         return mesh_data
 
     def process_gcode(self, gcode_lines: List[str]) -> List[str]:
-        """Process G-code. Override if plugin modifies G-code."""
+        """Process G-code. Override if plugin modifies G-code.
+
+        Plugins that only implement ``process_gcode_stream`` are run over
+        the list by the default implementation.
+        """
+        if self.overrides('process_gcode_stream'):
+            return list(self.process_gcode_stream(gcode_lines))
         return gcode_lines
 
+    def process_gcode_stream(self, gcode_lines: Iterable[str]) -> Iterator[str]:
+        """Process G-code lazily, one line at a time.
+
+        Override to transform G-code without holding the whole file in
+        memory: consume lines from ``gcode_lines`` and yield output lines
+        as they are ready. The default adapts list-based plugins by
+        collecting the stream and calling ``process_gcode``; plugins that
+        override neither method pass lines straight through.
+
+        Args:
+            gcode_lines: Input G-code lines (without line endings)
+
+        Yields:
+            Output G-code lines
+        """
+        if not self.overrides('process_gcode'):
+            yield from gcode_lines
+            return
+        yield from self.process_gcode(list(gcode_lines))
+
+    def on_gcode_chunk(self, state: Dict[str, Any]):
+        """Called in a worker before a chunk-safe plugin processes a chunk.
+
+        Args:
+            state: Machine state at the start of the chunk, as from
+                ``gcode_chunks.chunk_states`` (position, positioning modes,
+                feedrate, chunk index and count)
+        """
+
     def on_slicing_started(self, mesh_data: Any, config: Dict[str, Any]):
         """Called when slicing starts."""
 
@@ -119,6 +165,9 @@ class BasePlugin(ABC):
     def on_file_loaded(self, file_path: str, mesh_data: Any):
         """Called when a file is loaded."""
 
+    def on_printer_changed(self, printer_config: Any):
+        """Called when a printer profile is loaded."""
+
     def get_status(self) -> Dict[str, Any]:
         """Get plugin status information."""
         return {
@@ -1,10 +1,16 @@
 """
 G-code Optimizer Plugin
 
-An experimental plugin that optimizes G-code for better print quality.
+An experimental plugin that removes redundant data from G-code in a
+single streaming pass: collinear segments are merged within a tolerance,
+zero-length moves are dropped, and X/Y/Z/E/F words that repeat the
+current modal value are stripped. Smaller output uploads and parses
+faster on the printer.
 """
 
-from typing import Any, Dict, List
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
 
 # Simple approach - try to import BasePlugin from different possible locations
 BasePlugin = None
@@ -31,6 +37,331 @@ for import_path in [
 if not BasePlugin or not PluginMetadata:
     raise ImportError("Could not import BasePlugin and PluginMetadata")
 
+# The shared G-code parser lives next to base_plugin
+tokenize_line = None
+for import_path in [
+    "gcode_parser",
+    "plugins.gcode_parser",
+    "src.plugins.gcode_parser"
+]:
+    try:
+        tokenize_line = getattr(__import__(import_path, fromlist=['tokenize_line']), 'tokenize_line')
+        break
+    except (ImportError, AttributeError):
+        continue
+
+if not tokenize_line:
+    raise ImportError("Could not import the G-code parser")
+
+
+MOVE_WORDS = frozenset('XYZEF')
+MOTION_COMMANDS = ('G0', 'G1', 'G2', 'G3')
+
+
+def _format_number(value: float) -> str:
+    """Shortest G-code representation of a number (no exponents)."""
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    text = repr(value)
+    if 'e' in text:
+        text = f"{value:.6f}".rstrip('0').rstrip('.')
+    return text
+
+
+class MoveOptimizer:
+    """Streaming G-code reducer used by GcodeOptimizerPlugin.
+
+    Tracks the machine state twice: as the input G-code leaves it and as
+    the emitted G-code leaves it. Moves are rebuilt from the difference,
+    so a word is written only when it changes the emitted state. Only
+    absolute-positioning G0/G1 moves are rewritten; everything else
+    (arcs, relative moves, numbered/checksummed lines, coordinates
+    without a G word) passes through and only updates the tracked state.
+
+    Comments are kept unless ``strip_comments`` is set; those on moves
+    that get rewritten are always dropped.
+    """
+
+    def __init__(self, tolerance: float = 0.01, rate_tolerance: float = 0.05,
+                 max_merge: int = 64, strip_comments: bool = False,
+                 keep_comments: Iterable[str] = ('GHST', 'LAYER')):
+        """Initialize the optimizer.
+
+        Args:
+            tolerance: Largest distance (mm) a dropped intermediate point
+                may lie from the merged segment
+            rate_tolerance: Largest relative difference in extrusion per mm
+                between segments that are merged
+            max_merge: Most segments merged into one move
+            strip_comments: Drop comments (except ``keep_comments`` lines)
+            keep_comments: Comment lines containing any of these are kept
+                even when stripping comments
+        """
+        self.tolerance = tolerance
+        self.rate_tolerance = rate_tolerance
+        self.max_merge = max(1, max_merge)
+        self.strip_comments = strip_comments
+        self.keep_comments = tuple(keep_comments)
+        # None = unknown (before the first absolute value or after homing)
+        self.position: Dict[str, Optional[float]] = dict.fromkeys(MOVE_WORDS)
+        self.emitted: Dict[str, Optional[float]] = dict.fromkeys(MOVE_WORDS)
+        self.absolute = True
+        self.absolute_e = True
+        # Last G0-G3, repeated by lines that carry only coordinates
+        self.motion: Optional[str] = None
+        self.chain: Optional[Dict[str, Any]] = None
+        self.counts: Counter = Counter()
+
+    def resume(self, state: Dict[str, Any]):
+        """Continue from the machine state at the start of a chunk.
+
+        Args:
+            state: Chunk start state (see ``BasePlugin.on_gcode_chunk``)
+        """
+        self.absolute = state['absolute']
+        self.absolute_e = state['absolute_e']
+        self.position.update(state['position'])
+        self.position['F'] = state['feedrate']
+        self.emitted.update(self.position)
+        # The previous chunk may have held back a feedrate change
+        self.emitted['F'] = None
+
+    def feed(self, line: str) -> List[str]:
+        """Consume one input line and return the lines ready to emit."""
+        out: List[str] = []
+        code, sep, comment = line.strip().partition(';')
+        code = code.strip()
+        if not code:
+            if sep and (not self.strip_comments
+                        or any(marker in comment for marker in self.keep_comments)):
+                self._flush(out)
+                out.append(line.strip())
+            else:
+                self.counts['comments' if sep else 'blank_lines'] += 1
+            return out
+
+        command, params, _ = tokenize_line(code)
+        motion = command
+        if command in MOTION_COMMANDS:
+            self.motion = command
+        elif command is None and not params.keys().isdisjoint('XYZE'):
+            # Coordinates without a G word continue the modal motion
+            motion = self.motion
+        if (command in ('G0', 'G1') and self.absolute and '*' not in code
+                and params.keys() <= MOVE_WORDS and self._move(command, params, out)):
+            if sep:
+                self.counts['inline_comments'] += 1
+            return out
+
+        self._flush(out)
+        if (motion in MOTION_COMMANDS and 'F' not in params
+                and self.position['F'] is not None
+                and self.position['F'] != self.emitted['F']):
+            # A dropped line changed the feedrate; restore it first
+            out.append(f"G1 F{_format_number(self.position['F'])}")
+            self.emitted['F'] = self.position['F']
+        if sep and self.strip_comments:
+            self.counts['inline_comments'] += 1
+            out.append(code)
+        else:
+            out.append(line.strip())
+        self._track(motion, params)
+        return out
+
+    def finish(self) -> List[str]:
+        """Emit anything still held back."""
+        out: List[str] = []
+        self._flush(out)
+        return out
+
+    def _track(self, command: Optional[str], params: Dict[str, float]):
+        """Apply a line that is emitted unchanged to both states.
+
+        ``command`` is None for lines without a command word; if such a
+        line has coordinates, no modal motion was known for it, so the
+        axes it names become unknown.
+        """
+        if command in ('G90', 'G91', 'M82', 'M83'):
+            self._set_mode(command)
+            touched = set()
+        elif command == 'G92':
+            touched = self._set_position(params)
+        elif command == 'G28':
+            touched = self._home()
+        elif command in MOTION_COMMANDS:
+            touched = self._track_motion(params)
+        elif command is None:
+            touched = self._forget_axes(params)
+        else:
+            touched = set()
+        if 'F' in params and (command in MOTION_COMMANDS or command is None):
+            self.position['F'] = params['F']
+            touched.add('F')
+        for key in touched:
+            self.emitted[key] = self.position[key]
+
+    def _set_mode(self, command: str):
+        """Positioning modes: G90/G91 set both, M82/M83 only extrusion."""
+        if command in ('G90', 'G91'):
+            self.absolute = self.absolute_e = command == 'G90'
+        else:
+            self.absolute_e = command == 'M82'
+
+    def _set_position(self, params: Dict[str, float]) -> Set[str]:
+        """G92: set the axes it names (all of them when it names none)."""
+        axes = {axis for axis in 'XYZE' if axis in params} or set('XYZE')
+        for axis in axes:
+            self.position[axis] = params.get(axis, 0.0)
+        return axes
+
+    def _home(self) -> Set[str]:
+        """G28: the homed position is not known here."""
+        for axis in 'XYZ':
+            self.position[axis] = None
+        return set('XYZ')
+
+    def _track_motion(self, params: Dict[str, float]) -> Set[str]:
+        """G0-G3 passed through: move to the end point."""
+        position = self.position
+        touched = set()
+        for axis in 'XYZ':
+            if axis in params:
+                if self.absolute:
+                    position[axis] = params[axis]
+                elif position[axis] is not None:
+                    position[axis] += params[axis]
+                touched.add(axis)
+        if 'E' in params and self.absolute_e:
+            position['E'] = params['E']
+            touched.add('E')
+        return touched
+
+    def _forget_axes(self, params: Dict[str, float]) -> Set[str]:
+        """Coordinates without a known motion: the named axes become unknown."""
+        touched = {axis for axis in 'XYZE' if axis in params}
+        for axis in touched:
+            self.position[axis] = None
+        return touched
+
+    def _move(self, command: str, params: Dict[str, float], out: List[str]) -> bool:
+        """Rewrite an absolute G0/G1; False if it must pass through."""
+        position = self.position
+        if any(position[axis] is None for axis in 'XYZ'):
+            return False
+        target = {axis: params.get(axis, position[axis]) for axis in 'XYZ'}
+        if 'E' in params:
+            if self.absolute_e:
+                if position['E'] is None:
+                    return False
+                extrusion = params['E'] - position['E']
+            else:
+                extrusion = params['E']
+        else:
+            extrusion = 0.0
+
+        dx = target['X'] - position['X']
+        dy = target['Y'] - position['Y']
+        dz = target['Z'] - position['Z']
+        position.update(target)
+        if 'F' in params:
+            position['F'] = params['F']
+        if self.absolute_e and 'E' in params:
+            position['E'] = params['E']
+
+        if not (dx or dy or dz or extrusion):
+            self.counts['zero_length_moves'] += 1
+            return True
+
+        length = (dx * dx + dy * dy) ** 0.5
+        planar = not dz and length > 0 and extrusion >= 0
+        if planar and self._extend_chain(command, target, extrusion, length):
+            return True
+
+        self._flush(out)
+        if planar:
+            self.chain = {
+                'command': command, 'feed': position['F'], 'z': target['Z'],
+                'start': (self.emitted['X'], self.emitted['Y']),
+                'points': [(target['X'], target['Y'])],
+                'extrusion': extrusion, 'length': length,
+                'e_end': position['E'] if self.absolute_e else None}
+        else:
+            out.append(self._format(command, target, extrusion, position['F'],
+                                    position['E'] if self.absolute_e else None))
+        return True
+
+    def _extend_chain(self, command: str, target: Dict[str, float],
+                      extrusion: float, length: float) -> bool:
+        """Merge a planar move into the pending chain if it is collinear."""
+        chain = self.chain
+        if (chain is None or chain['command'] != command
+                or chain['feed'] != self.position['F'] or chain['z'] != target['Z']
+                or len(chain['points']) >= self.max_merge
+                or (extrusion > 0) != (chain['extrusion'] > 0)):
+            return False
+
+        if extrusion > 0:
+            rate = chain['extrusion'] / chain['length']
+            if abs(extrusion / length - rate) > self.rate_tolerance * rate:
+                return False
+
+        # Every point the merge drops must stay within tolerance of the
+        # new straight segment, and in order along it
+        sx, sy = chain['start']
+        qx, qy = target['X'] - sx, target['Y'] - sy
+        span_sq = qx * qx + qy * qy
+        if span_sq == 0:
+            return False
+        span = span_sq ** 0.5
+        previous = 0.0
+        for px, py in chain['points']:
+            px -= sx
+            py -= sy
+            along = px * qx + py * qy
+            if along <= previous or along >= span_sq:
+                return False
+            if abs(px * qy - py * qx) / span > self.tolerance:
+                return False
+            previous = along
+
+        chain['points'].append((target['X'], target['Y']))
+        chain['extrusion'] += extrusion
+        chain['length'] += length
+        if chain['e_end'] is not None:
+            chain['e_end'] = self.position['E']
+        self.counts['merged_segments'] += 1
+        return True
+
+    def _flush(self, out: List[str]):
+        """Emit the pending chain as one move."""
+        chain = self.chain
+        if chain is None:
+            return
+        self.chain = None
+        x, y = chain['points'][-1]
+        out.append(self._format(chain['command'], {'X': x, 'Y': y, 'Z': chain['z']},
+                                chain['extrusion'], chain['feed'], chain['e_end']))
+
+    def _format(self, command: str, target: Dict[str, float], extrusion: float,
+                feed: Optional[float], e_end: Optional[float]) -> str:
+        """Build a move line holding only the words that change state."""
+        emitted = self.emitted
+        words = [command]
+        for axis in 'XYZ':
+            if emitted[axis] != target[axis]:
+                words.append(axis + _format_number(target[axis]))
+                emitted[axis] = target[axis]
+        if extrusion:
+            if e_end is not None:
+                words.append('E' + _format_number(e_end))
+                emitted['E'] = e_end
+            else:
+                words.append('E' + _format_number(round(extrusion, 5)))
+        if feed is not None and feed != emitted['F']:
+            words.append('F' + _format_number(feed))
+            emitted['F'] = feed
+        return ' '.join(words)
+
 
 class GcodeOptimizerPlugin(BasePlugin):
     """Plugin for optimizing G-code output."""
@@ -44,6 +375,7 @@ class GcodeOptimizerPlugin(BasePlugin):
             category="coding engine",
             requires_gui=False,
             experimental=True,
+            chunk_safe=True,
             safety_notes=[
                 "EXPERIMENTAL: May modify G-code in unexpected ways",
                 "Always verify G-code before printing",
@@ -55,6 +387,8 @@ class GcodeOptimizerPlugin(BasePlugin):
         self.logger.warning(
             "⚠️ G-code Optimizer plugin initialized - EXPERIMENTAL!")
         self.optimization_count = 0
+        self.last_report = None
+        self._chunk_state = None
         return True
 
     def cleanup(self) -> bool:
@@ -62,46 +396,87 @@ class GcodeOptimizerPlugin(BasePlugin):
         self.logger.info("G-code Optimizer plugin cleaned up")
         return True
 
-    def process_gcode(self, gcode_lines: List[str]) -> List[str]:
-        """Optimize G-code lines."""
-        if not self.active:
-            return gcode_lines
+    def on_gcode_chunk(self, state: Dict[str, Any]):
+        """Resume from the chunk's start state on the next pass."""
+        self._chunk_state = state
 
-        self.logger.info("Optimizing G-code...")
-        optimized_lines = []
+    def process_gcode_stream(self, gcode_lines: Iterable[str]) -> Iterator[str]:
+        """Optimize G-code lines as they stream through.
 
-        for line in gcode_lines:
-            # Example optimizations (very basic)
-            line = line.strip()
-
-            # Skip empty lines and comments (except important ones)
-            if not line or (line.startswith(';') and 'GHST' not in line):
-                continue
+        The report is only known at the end, so it is written as a
+        trailer comment and kept in ``last_report``. When run on a chunk,
+        only the first chunk gets the header and no chunk gets a trailer.
+        """
+        if not self.active:
+            yield from gcode_lines
+            return
 
-            # Simple optimization: remove redundant moves
-            if line.startswith(
-                    'G1') and 'X' not in line and 'Y' not in line and 'Z' not in line:
-                # Skip moves that only change extrusion without position
-                continue
+        self.logger.info("Optimizing G-code...")
+        self.optimization_count += 1
+        optimizer = MoveOptimizer(
+            tolerance=self._config.get('merge_tolerance', 0.01),
+            rate_tolerance=self._config.get('extrusion_rate_tolerance', 0.05),
+            max_merge=self._config.get('max_merge_segments', 64),
+            strip_comments=self._config.get('strip_comments', False),
+            keep_comments=self._config.get('keep_comments', ('GHST', 'LAYER')))
+        chunk = getattr(self, '_chunk_state', None)
+        self._chunk_state = None
+        if chunk is not None:
+            optimizer.resume(chunk)
 
-            optimized_lines.append(line)
+        lines_in = bytes_in = lines_out = bytes_out = 0
+        started = time.perf_counter()
+        if chunk is None or chunk['chunk_index'] == 0:
+            for line in ("; GHST G-code Optimizer Plugin",
+                         "; ⚠️ EXPERIMENTAL - verify before printing!"):
+                lines_out += 1
+                bytes_out += len(line) + 1
+                yield line
 
-        self.optimization_count += 1
-        reduction = len(gcode_lines) - len(optimized_lines)
+        for line in gcode_lines:
+            lines_in += 1
+            bytes_in += len(line) + 1
+            for out in optimizer.feed(line):
+                lines_out += 1
+                bytes_out += len(out) + 1
+                yield out
+        for out in optimizer.finish():
+            lines_out += 1
+            bytes_out += len(out) + 1
+            yield out
 
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        report = {
+            'lines_in': lines_in,
+            'lines_out': lines_out,
+            'bytes_in': bytes_in,
+            'bytes_out': bytes_out,
+            'line_reduction_percent': (1 - lines_out / lines_in) * 100 if lines_in else 0.0,
+            'byte_reduction_percent': (1 - bytes_out / bytes_in) * 100 if bytes_in else 0.0,
+            'seconds': elapsed,
+            'lines_per_second': lines_in / elapsed,
+            'mb_per_second': bytes_in / elapsed / 1e6,
+            **optimizer.counts
+        }
+        self.last_report = report
         self.logger.info(
-            f"G-code optimization complete: removed {reduction} lines ({reduction / len(gcode_lines) * 100:.1f}%)")
-
-        # Add optimization header
-        header = [
-            "; GHST G-code Optimizer Plugin",
-            "; Optimization #{self.optimization_count}",
-            "; Removed {reduction} lines for efficiency",
-            "; ⚠️ EXPERIMENTAL - verify before printing!",
-            ""
-        ]
+            f"G-code optimization complete: {lines_in} -> {lines_out} lines, "
+            f"{report['byte_reduction_percent']:.1f}% fewer bytes, "
+            f"{report['lines_per_second']:,.0f} lines/s")
+
+        if chunk is not None:
+            return
+        yield f"; GHST G-code Optimizer: optimization #{self.optimization_count}"
+        yield (f"; Lines {lines_in} -> {lines_out} ({report['line_reduction_percent']:.1f}% fewer), "
+               f"bytes {bytes_in} -> {bytes_out} ({report['byte_reduction_percent']:.1f}% fewer)")
+        yield (f"; Merged {optimizer.counts['merged_segments']} segments, dropped "
+               f"{optimizer.counts['zero_length_moves']} zero-length moves")
 
-        return header + optimized_lines
+    def get_status(self) -> Dict[str, Any]:
+        """Get plugin status, including the last optimization report."""
+        status = super().get_status()
+        status['last_report'] = getattr(self, 'last_report', None)
+        return status
 
     def get_menu_actions(self) -> List[Dict[str, Any]]:
         """Return menu actions for this plugin."""
@@ -116,8 +491,8 @@ class GcodeOptimizerPlugin(BasePlugin):
         """Toggle optimization on/off."""
         self.active = not self.active
         status = "ENABLED" if self.active else "DISABLED"
-        self.logger.warning("⚠️ G-code optimization {status}")
-        print("G-code optimization {status}")
+        self.logger.warning(f"⚠️ G-code optimization {status}")
+        print(f"G-code optimization {status}")
 
         if self.active:
             print("⚠️ WARNING: Experimental optimization enabled!")
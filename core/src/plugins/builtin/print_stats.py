@@ -4,7 +4,9 @@ Print Statistics Plugin
 A simple example plugin that calculates and displays print statistics.
 """
 
-from typing import Any, Dict, List
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Union
 
 # Simple approach - try to import BasePlugin from different possible locations
 BasePlugin = None
@@ -31,6 +33,42 @@ for import_path in [
 if not BasePlugin or not PluginMetadata:
     raise ImportError("Could not import BasePlugin and PluginMetadata")
 
+# The shared G-code statistics engine lives next to base_plugin
+compute_print_stats = None
+MotionLimits = None
+for import_path in [
+    "gcode_stats",
+    "plugins.gcode_stats",
+    "src.plugins.gcode_stats"
+]:
+    try:
+        module = __import__(
+            import_path, fromlist=['compute_print_stats', 'MotionLimits'])
+        compute_print_stats = getattr(module, 'compute_print_stats', None)
+        MotionLimits = getattr(module, 'MotionLimits', None)
+        if compute_print_stats and MotionLimits:
+            break
+    except ImportError:
+        continue
+
+if not compute_print_stats or not MotionLimits:
+    raise ImportError("Could not import the G-code statistics engine")
+
+GcodeFile = None
+for import_path in [
+    "gcode_file",
+    "plugins.gcode_file",
+    "src.plugins.gcode_file"
+]:
+    try:
+        GcodeFile = getattr(__import__(import_path, fromlist=['GcodeFile']), 'GcodeFile')
+        break
+    except (ImportError, AttributeError):
+        continue
+
+if not GcodeFile:
+    raise ImportError("Could not import GcodeFile")
+
 
 class PrintStatsPlugin(BasePlugin):
     """Plugin for calculating print statistics."""
@@ -53,6 +91,7 @@ class PrintStatsPlugin(BasePlugin):
         """Initialize the plugin."""
         self.logger.info("Print Statistics plugin initialized")
         self.stats = {}
+        self.motion_limits = MotionLimits()
         return True
 
     def cleanup(self) -> bool:
@@ -70,41 +109,74 @@ class PrintStatsPlugin(BasePlugin):
             }
         ]
 
+    def on_printer_changed(self, printer_config: Any):
+        """Use the printer's acceleration and feedrate limits for timing."""
+        self.motion_limits = MotionLimits.from_printer_config(printer_config)
+
     def on_slicing_completed(
-            self, gcode_lines: List[str], stats: Dict[str, Any]):
-        """Calculate statistics when slicing completes."""
+            self, gcode_lines: Sequence[str], stats: Dict[str, Any]):
+        """Calculate statistics when slicing completes.
+
+        ``gcode_lines`` may be a list or a memory-mapped ``GcodeFile``.
+        """
         try:
             self.stats = self._calculate_stats(gcode_lines, stats)
             self.logger.info("Calculated print statistics: {self.stats}")
         except Exception as e:
             self.logger.error("Failed to calculate statistics: {e}")
 
+    def analyze_gcode_file(self, file_path: Union[str, Path]) -> Dict[str, Any]:
+        """Calculate statistics for a G-code file without loading it into lists.
+
+        Args:
+            file_path: G-code file to analyze
+
+        Returns:
+            Statistics dictionary (also kept as the current statistics)
+        """
+        with GcodeFile(file_path) as gcode:
+            self.stats = self._calculate_stats(gcode, {})
+        return self.stats
+
     def _calculate_stats(self,
-                         gcode_lines: List[str],
+                         gcode_lines: Sequence[str],
                          basic_stats: Dict[str,
                                            Any]) -> Dict[str,
                                                          Any]:
-        """Calculate detailed statistics from G-code."""
+        """Calculate detailed statistics from G-code.
+
+        Filament, time and layers come from the G-code itself (E deltas in
+        either extrusion mode, G92 resets, feedrates and Z changes); the
+        slicer's ``basic_stats`` are only used when the G-code has no moves.
+        Time is simulated with the current printer's motion limits.
+        """
+        gcode_stats = compute_print_stats(
+            gcode_lines, default_feedrate=self._config.get('default_feedrate', 1500.0),
+            limits=self.motion_limits)
+
+        # Filament: 1.75 mm PLA at $0.02/gram unless configured otherwise
+        diameter = self._config.get('filament_diameter', 1.75)  # mm
+        density = self._config.get('filament_density', 1.24)  # g/cm^3
+        price_per_gram = self._config.get('price_per_gram', 0.02)
+
+        length = max(gcode_stats['filament_length_mm'], 0.0)
+        volume_cm3 = length * math.pi * (diameter / 2) ** 2 / 1000
+        weight = volume_cm3 * density
+
+        has_moves = gcode_stats['moves'] > 0
         stats = {
-            'total_lines': len(gcode_lines),
-            'estimated_time_minutes': basic_stats.get(
-                'estimated_print_time',
-                0),
-            'layer_count': basic_stats.get(
-                'layers',
-                0),
-            'estimated_filament_length': 0,
-            'estimated_filament_weight': 0,
-            'estimated_cost': 0}
-
-        # Simple filament calculation (mock implementation)
-        extrusion_moves = sum(
-            1 for line in gcode_lines if line.startswith('G1') and 'E' in line)
-        stats['estimated_filament_length'] = extrusion_moves * 0.5  # mm
-        # grams
-        stats['estimated_filament_weight'] = stats['estimated_filament_length'] * 0.00125
-        stats['estimated_cost'] = stats['estimated_filament_weight'] * \
-            0.02  # $0.02/gram
+            'total_lines': gcode_stats['lines'],
+            'estimated_time_minutes': (gcode_stats['print_time_s'] / 60 if has_moves
+                                       else basic_stats.get('estimated_print_time', 0)),
+            'layer_count': (gcode_stats['layer_count'] if has_moves
+                            else basic_stats.get('layers', 0)),
+            'estimated_filament_length': length,
+            'estimated_filament_weight': weight,
+            'estimated_cost': weight * price_per_gram,
+            'travel_distance': gcode_stats['travel_distance_mm'],
+            'extrusion_distance': gcode_stats['extrusion_distance_mm'],
+            'retractions': gcode_stats['retractions'],
+            'layers': gcode_stats.get('layers', [])}
 
         return stats
 
@@ -0,0 +1,199 @@
+"""
+G-code Chunking for GHST Plugins
+
+Splits G-code into layer-aligned chunks that chunk-safe plugins can
+process independently (see ``PluginMetadata.chunk_safe``), and resolves
+the machine state each chunk starts from, so a plugin in another process
+can pick up where the previous chunk left off.
+
+Chunks are cut at layer markers (``;LAYER:``, ``;LAYER_CHANGE``,
+``; CHANGE_LAYER``) or, when the file has none, at Z changes.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .gcode_parser import ParsedGcode, parse_gcode
+    from .gcode_stats import _last_index, motion_profile
+except ImportError:  # imported with src/plugins/ on sys.path
+    from gcode_parser import ParsedGcode, parse_gcode
+    from gcode_stats import _last_index, motion_profile
+
+LAYER_MARKERS = (';LAYER:', ';LAYER_CHANGE', '; CHANGE_LAYER')
+
+
+def _layer_markers(gcode_lines: Sequence[str]) -> np.ndarray:
+    """Line indices of layer markers."""
+    if hasattr(gcode_lines, 'find_lines'):
+        # GcodeFile: scan the raw bytes instead of decoding every line
+        return gcode_lines.find_lines(LAYER_MARKERS)
+    return np.array([index for index, line in enumerate(gcode_lines)
+                     if line.lstrip().startswith(LAYER_MARKERS)], dtype=np.int64)
+
+
+def layer_starts(gcode_lines: Sequence[str],
+                 profile: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """Line indices where a new layer begins.
+
+    Args:
+        gcode_lines: G-code lines or a ``GcodeFile``
+        profile: ``motion_profile`` of the same lines, if already computed
+
+    Returns:
+        Sorted array of line indices
+    """
+    markers = _layer_markers(gcode_lines)
+    if len(markers):
+        return markers
+    if profile is None:
+        profile = motion_profile(gcode_lines)
+    return np.flatnonzero(profile['move'] & (profile['dz'] != 0))
+
+
+def chunk_bounds(starts: np.ndarray, line_count: int,
+                 chunk_lines: int) -> List[Tuple[int, int]]:
+    """Group layers into chunks of at least ``chunk_lines`` lines.
+
+    Args:
+        starts: Candidate cut lines (``layer_starts``)
+        line_count: Total number of lines
+        chunk_lines: Minimum lines per chunk (the last one may be shorter)
+
+    Returns:
+        List of (start, end) line ranges covering all lines in order
+    """
+    bounds = []
+    start = 0
+    while start < line_count:
+        # Cut at the first layer start at least chunk_lines further on
+        cut = int(np.searchsorted(starts, start + max(chunk_lines, 1)))
+        end = int(starts[cut]) if cut < len(starts) else line_count
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _start_state(index: int, count: int, line_index: int) -> Dict[str, Any]:
+    """Chunk state before any G-code has run."""
+    return {'chunk_index': index, 'chunk_count': count, 'line_index': line_index,
+            'absolute': True, 'absolute_e': True,
+            'position': dict.fromkeys('XYZE'), 'feedrate': None}
+
+
+def chunk_states(gcode_lines: Iterable[str], bounds: List[Tuple[int, int]],
+                 profile: Optional[Dict[str, np.ndarray]] = None) -> List[Dict[str, Any]]:
+    """Machine state at the start of each chunk.
+
+    Args:
+        gcode_lines: G-code lines, a ``ParsedGcode`` or a ``GcodeFile``
+        bounds: Chunk line ranges (``chunk_bounds``)
+        profile: ``motion_profile`` of the lines, if already computed
+
+    Returns:
+        One dictionary per chunk with 'chunk_index', 'chunk_count',
+        'line_index', 'absolute' and 'absolute_e' (positioning modes),
+        'position' (X/Y/Z/E, None before the first move) and 'feedrate'
+        (mm/min, None before the first F word)
+    """
+    gcode = parse_gcode(gcode_lines)
+    if profile is None:
+        profile = motion_profile(gcode)
+    feed_rows = _last_index(gcode.has('F'))
+    moves = np.flatnonzero(profile['move'])
+    first_move = int(moves[0]) if len(moves) else len(gcode)
+
+    states = []
+    for index, (start, _) in enumerate(bounds):
+        state = _start_state(index, len(bounds), start)
+        row = start - 1
+        if row >= 0:
+            state['absolute'] = not bool(profile['relative'][row])
+            state['absolute_e'] = not bool(profile['relative_e'][row])
+            if row >= first_move:
+                state['position'] = {axis: float(profile[axis.lower()][row])
+                                     for axis in 'XYZE'}
+            if feed_rows[row] >= 0:
+                state['feedrate'] = float(gcode.f[feed_rows[row]])
+        states.append(state)
+    return states
+
+
+def split_gcode(gcode_lines: Sequence[str],
+                chunk_lines: int) -> Tuple[List[Tuple[int, int]], List[Dict[str, Any]]]:
+    """Split G-code into layer-aligned chunks with their start states.
+
+    Args:
+        gcode_lines: G-code lines
+        chunk_lines: Minimum lines per chunk
+
+    Returns:
+        Tuple of (bounds, states) as from ``chunk_bounds`` and
+        ``chunk_states``
+    """
+    gcode = parse_gcode(gcode_lines)
+    profile = motion_profile(gcode)
+    bounds = chunk_bounds(layer_starts(gcode_lines, profile), len(gcode), chunk_lines)
+    return bounds, chunk_states(gcode, bounds, profile)
+
+
+def _format_number(value: float) -> str:
+    return np.format_float_positional(value, trim='-')
+
+
+def _state_preamble(state: Dict[str, Any]) -> bytes:
+    """G-code that puts a fresh parser into a chunk's start state."""
+    lines = ['G90' if state['absolute'] else 'G91',
+             'M82' if state['absolute_e'] else 'M83']
+    feed = '' if state['feedrate'] is None else f"F{_format_number(state['feedrate'])}"
+    if state['position']['X'] is not None:
+        lines.append('G92 ' + ' '.join(f"{axis}{_format_number(value)}"
+                                       for axis, value in state['position'].items()))
+        lines.append(f"G0 {feed}")  # a move, so the position counts as known
+    elif feed:
+        lines.append(feed)
+    return ''.join(line + '\n' for line in lines).encode('utf-8')
+
+
+def _chunk_data(gcode_lines: Sequence[str], start: int, end: int) -> bytes:
+    """Raw bytes of lines [start, end)."""
+    lines = gcode_lines[start:end]
+    if hasattr(lines, 'byte_range'):
+        # GcodeFile view: copy the bytes without decoding them
+        first, last = lines.byte_range
+        return lines.data[first:last]
+    return ''.join(line.rstrip('\r\n') + '\n' for line in lines).encode('utf-8')
+
+
+def iter_chunks(gcode_lines: Sequence[str],
+                chunk_lines: int) -> Iterator[Tuple[Tuple[int, int], Dict[str, Any]]]:
+    """Split G-code into layer-aligned chunks, resolving their states lazily.
+
+    Yields the same chunks as ``split_gcode``. When the layers are found
+    from markers, each state is resolved by parsing only the chunk before
+    it, so the first chunks can be processed while later ones are still
+    being parsed. Without markers the whole G-code is parsed up front.
+
+    Args:
+        gcode_lines: G-code lines or a ``GcodeFile``
+        chunk_lines: Minimum lines per chunk
+
+    Yields:
+        Tuples of ((start, end), state)
+    """
+    markers = _layer_markers(gcode_lines)
+    if not len(markers):
+        bounds, states = split_gcode(gcode_lines, chunk_lines)
+        yield from zip(bounds, states)
+        return
+
+    bounds = chunk_bounds(markers, len(gcode_lines), chunk_lines)
+    state = _start_state(0, len(bounds), 0)
+    for index, (start, end) in enumerate(bounds):
+        yield (start, end), state
+        if index + 1 < len(bounds):
+            gcode = ParsedGcode.from_bytes(_state_preamble(state)
+                                           + _chunk_data(gcode_lines, start, end))
+            state = chunk_states(gcode, [(len(gcode), len(gcode))])[0]
+            state.update(chunk_index=index + 1, chunk_count=len(bounds), line_index=end)
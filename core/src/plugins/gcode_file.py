@@ -0,0 +1,214 @@
+"""
+Memory-mapped G-code Files for GHST Plugins
+
+``GcodeFile`` maps a G-code file read-only and indexes its line starts
+in one pass, so opening even a very large file costs one array of
+offsets rather than a Python string per line. Lines are decoded only
+when read, and slicing by line range or layer returns views that share
+the mapping.
+
+A ``GcodeFile`` is a read-only sequence of lines, so it can be passed
+wherever plugins accept ``List[str]``; ``parse_gcode`` and the
+statistics engine tokenize its bytes directly.
+"""
+
+import mmap
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from .gcode_chunks import layer_starts
+    from .gcode_parser import CHUNK_BYTES, ParsedGcode
+except ImportError:  # imported with src/plugins/ on sys.path
+    from gcode_chunks import layer_starts
+    from gcode_parser import CHUNK_BYTES, ParsedGcode
+
+
+def _index_lines(data, first: int = 0, last: Optional[int] = None,
+                 chunk_bytes: int = CHUNK_BYTES) -> np.ndarray:
+    """Line start offsets of ``data[first:last]``, plus one past the last line's end.
+
+    Uses the same layout as ``ParsedGcode.line_offsets``: a last line
+    without a newline ends at ``last + 1``. Offsets are relative to the
+    start of ``data``.
+    """
+    size = len(data)
+    last = size if last is None else last
+    buf = np.frombuffer(data, dtype=np.uint8) if size else np.empty(0, dtype=np.uint8)
+    dtype = np.uint32 if size < 2 ** 32 - 1 else np.int64
+    parts = [np.array([first], dtype=dtype)]
+    for start in range(first, last, chunk_bytes):
+        newlines = np.flatnonzero(buf[start:min(start + chunk_bytes, last)] == 10)
+        parts.append((newlines + (start + 1)).astype(dtype))
+    if last > first and data[last - 1:last] != b'\n':
+        parts.append(np.array([last + 1], dtype=dtype))
+    return np.concatenate(parts)
+
+
+class GcodeFile(Sequence):
+    """Read-only, memory-mapped G-code file that reads like a list of lines.
+
+    Attributes:
+        path: Path of the file
+        data: The mapped file contents (``mmap``, or ``b''`` when empty)
+        line_offsets: Start offset of each line in ``data`` (plus one
+            past the last line's newline)
+    """
+
+    def __init__(self, path: Union[str, Path], byte_range: Optional[Tuple[int, int]] = None):
+        """Map a G-code file and index its lines.
+
+        Args:
+            path: G-code file to open
+            byte_range: Only index the lines in this (start, end) byte
+                range, which must begin and end at line starts (e.g. the
+                ``byte_range`` of a view of the same file)
+        """
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            if os.fstat(self._file.fileno()).st_size:
+                self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.data = b''  # empty files cannot be mapped
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self.line_offsets = _index_lines(self.data, *(byte_range or ()))
+        self._parent = None
+        self._parsed: Optional[ParsedGcode] = None
+        self._layer_starts: Optional[np.ndarray] = None
+
+    @classmethod
+    def _view(cls, parent: 'GcodeFile', start: int, stop: int) -> 'GcodeFile':
+        """Lines [start, stop) of ``parent``, sharing its mapping."""
+        view = cls.__new__(cls)
+        view.path = parent.path
+        view._file = None
+        view.data = parent.data
+        view.line_offsets = parent.line_offsets[start:stop + 1]
+        view._parent = parent  # keeps the mapping open
+        view._parsed = None
+        view._layer_starts = None
+        return view
+
+    def __len__(self) -> int:
+        return len(self.line_offsets) - 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, 'GcodeFile', List[str]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._view(self, start, max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('G-code line index out of range')
+        start, end = int(self.line_offsets[index]), int(self.line_offsets[index + 1]) - 1
+        return self.data[start:end].decode('utf-8', 'replace').rstrip('\r')
+
+    def __iter__(self):
+        offsets = self.line_offsets.tolist()
+        data = self.data
+        for start, end in zip(offsets, offsets[1:]):
+            yield data[start:end - 1].decode('utf-8', 'replace').rstrip('\r')
+
+    def __enter__(self) -> 'GcodeFile':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the file. Views of it must not be used afterwards."""
+        if self._file is not None:
+            if isinstance(self.data, mmap.mmap):
+                self.data.close()
+            self._file.close()
+            self._file = None
+
+    @property
+    def byte_range(self) -> Tuple[int, int]:
+        """(start, end) of these lines in ``data``."""
+        if not len(self):
+            start = int(self.line_offsets[0])
+            return start, start
+        return int(self.line_offsets[0]), min(int(self.line_offsets[-1]), len(self.data))
+
+    def lines(self, start: int = 0, stop: Optional[int] = None) -> 'GcodeFile':
+        """View of the lines in [start, stop)."""
+        return self[start:stop]
+
+    def buffer(self) -> memoryview:
+        """Raw bytes of these lines without copying.
+
+        Release the memoryview before ``close``; an mmap cannot be
+        closed while views of it are exported.
+        """
+        start, end = self.byte_range
+        return memoryview(self.data)[start:end]
+
+    def parsed(self) -> ParsedGcode:
+        """Tokenized lines (cached). A whole file is parsed in place."""
+        if self._parsed is None:
+            start, end = self.byte_range
+            data = self.data if start == 0 and end == len(self.data) else self.data[start:end]
+            self._parsed = ParsedGcode.from_bytes(data)
+        return self._parsed
+
+    def find_lines(self, prefixes: Iterable[str]) -> np.ndarray:
+        """Indices of the lines that start with one of ``prefixes``.
+
+        Leading spaces and tabs are ignored. The file is scanned as raw
+        bytes; no lines are decoded.
+        """
+        data = self.data
+        start, end = self.byte_range
+        found = []
+        for prefix in prefixes:
+            needle = prefix.encode('utf-8')
+            position = data.find(needle, start, end)
+            while position >= 0:
+                found.append(position)
+                position = data.find(needle, position + len(needle), end)
+        if not found:
+            return np.empty(0, dtype=np.int64)
+
+        positions = np.array(found, dtype=np.int64)
+        lines = np.searchsorted(self.line_offsets, positions, side='right') - 1
+        # Keep matches with only indentation before them on their line
+        lines = np.unique([line for line, position in zip(lines.tolist(), found)
+                           if not data[int(self.line_offsets[line]):position].strip(b' \t')])
+        return lines.astype(np.int64)
+
+    def layer_starts(self) -> np.ndarray:
+        """Line indices where a new layer begins (cached).
+
+        Layers start at layer markers or, when there are none, at Z
+        changes (see ``gcode_chunks.layer_starts``).
+        """
+        if self._layer_starts is None:
+            self._layer_starts = layer_starts(self)
+        return self._layer_starts
+
+    def layer_count(self) -> int:
+        """Number of layers."""
+        return len(self.layer_starts())
+
+    def layer(self, index: int) -> 'GcodeFile':
+        """View of one layer's lines (0-based).
+
+        Lines before the first layer start belong to no layer.
+        """
+        starts = self.layer_starts()
+        if index < 0:
+            index += len(starts)
+        if not 0 <= index < len(starts):
+            raise IndexError('Layer index out of range')
+        stop = int(starts[index + 1]) if index + 1 < len(starts) else len(self)
+        return self[int(starts[index]):stop]
@@ -0,0 +1,383 @@
+"""
+G-code Parser for GHST Plugins
+
+Tokenizes G-code once into a compact columnar form that plugins share
+instead of re-scanning raw strings. Each line becomes a row: a command
+code plus X/Y/Z/E/F values in NumPy arrays (NaN where a word is absent),
+and a comment-offset table pointing into the raw text.
+
+The raw bytes are tokenized with NumPy in fixed-size chunks, so parsing
+cost is a handful of array passes per chunk rather than Python work per
+line. Chunks the vectorized tokenizer cannot read exactly (malformed
+numbers) are re-parsed line by line with ``tokenize_line``.
+
+``ParsedGcode`` is also a read-only sequence of the original lines, so
+it can be handed to plugins that still expect ``List[str]``.
+"""
+
+import re
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Parameter words stored as columns
+AXES = ('X', 'Y', 'Z', 'E', 'F')
+
+# Letters that start a command word
+COMMAND_LETTERS = ('G', 'M', 'T')
+
+# Commands whose arguments are free text rather than parameter words
+TEXT_COMMANDS = frozenset({'M23', 'M28', 'M30', 'M32', 'M117', 'M118'})
+
+NO_COMMAND = -1
+
+# Bytes tokenized per vectorized pass (bounds temporary memory)
+CHUNK_BYTES = 1 << 20
+
+_WORD = re.compile(r'([A-Za-z])\s*([-+]?(?:\d+\.?\d*|\.\d+))')
+
+
+def _command_name(letter: str, value: float) -> str:
+    """Canonical command name: ('g', 1.0) -> 'G1', ('G', 29.1) -> 'G29.1'."""
+    if float(value).is_integer():
+        return f"{letter.upper()}{int(value)}"
+    return f"{letter.upper()}{value:g}"
+
+
+def tokenize_line(line: str) -> Tuple[Optional[str], Dict[str, float], str]:
+    """Split one G-code line into command, parameters and comment.
+
+    The command is the first G/M/T word; every other word is a parameter.
+    A word is a letter followed (optionally after blanks) by a number;
+    bare numbers without a letter of their own are ignored. Checksums
+    (``*...``) are dropped and line numbers (``N...``) are returned as
+    the 'N' parameter.
+
+    Args:
+        line: Raw G-code line
+
+    Returns:
+        Tuple of (command or None, parameter letter -> value, comment)
+    """
+    code, sep, comment = line.partition(';')
+    comment = comment.strip() if sep else ''
+    code = code.partition('*')[0]
+
+    command = None
+    params = {}
+    for letter, value in _WORD.findall(code):
+        letter = letter.upper()
+        if command is None and letter in COMMAND_LETTERS:
+            command = _command_name(letter, float(value))
+            if command in TEXT_COMMANDS:
+                break
+        else:
+            params[letter] = float(value)
+    return command, params, comment
+
+
+class _Unparseable(Exception):
+    """A chunk the vectorized tokenizer cannot read exactly."""
+
+
+def _chunks(data, chunk_bytes: int) -> Iterable[Tuple[int, int]]:
+    """Split a buffer into (start, end) ranges that end on a newline."""
+    size = len(data)
+    start = 0
+    while start < size:
+        end = min(start + chunk_bytes, size)
+        if end < size:
+            newline = data.rfind(b'\n', start, end)
+            if newline < 0:
+                newline = data.find(b'\n', end)
+            end = size if newline < 0 else newline + 1
+        yield start, end
+        start = end
+
+
+# Powers of ten for exact integer mantissas (up to 15 digits fit a double)
+_POW10 = 10 ** np.arange(16, dtype=np.int64)
+MAX_DIGITS = 15
+
+
+def _word_values(buf: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions and values of the numeric runs selected by ``mask``.
+
+    Each run is read as an integer mantissa divided by a power of ten,
+    which rounds exactly like ``float()`` for up to ``MAX_DIGITS`` digits.
+    """
+    starts = mask.copy()
+    starts[1:] &= ~mask[:-1]
+    positions = np.flatnonzero(starts)
+    if not len(positions):
+        return positions, np.empty(0)
+
+    index = np.flatnonzero(mask)
+    chars = buf[index]
+    first = np.flatnonzero(starts[index])
+    run = np.cumsum(starts[index]) - 1
+
+    digit = (chars >= 48) & (chars <= 57)
+    dot = chars == 46
+    sign = (chars == 45) | (chars == 43)
+    digits = np.add.reduceat(digit, first)
+    if (np.any(sign & ~starts[index]) or np.any(np.add.reduceat(dot, first) > 1)
+            or np.any(digits == 0) or np.any(digits > MAX_DIGITS)):
+        raise _Unparseable()
+
+    # Rank of each digit from the right of its run gives its place value
+    seen = np.cumsum(digit) - digit
+    rank = digits[run] - (seen - seen[first][run]) - 1
+    mantissa = np.add.reduceat(np.where(digit, (chars - 48) * _POW10[np.maximum(rank, 0)], 0),
+                               first)
+
+    dots = np.cumsum(dot)
+    after_dot = (dots - (dots[first] - dot[first])[run]) > 0
+    decimals = np.add.reduceat(digit & after_dot, first)
+
+    values = mantissa / _POW10[decimals].astype(np.float64)
+    values[chars[first] == 45] *= -1
+    return positions, values
+
+
+def _tokenize_chunk(buf: np.ndarray) -> Dict[str, object]:
+    """Vectorized tokenization of whole lines (``buf`` ends with a newline)."""
+    size = len(buf)
+    newline = buf == 10
+    ends = np.flatnonzero(newline).astype(np.int32)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    line_of = np.cumsum(newline, dtype=np.int32) - newline
+
+    # Code is everything before the first ';' or '*' of a line
+    stop = (buf == 59) | (buf == 42)
+    stops = np.cumsum(stop, dtype=np.int32)
+    in_code = stops == (stops[starts] - stop[starts])[line_of]
+
+    upper = buf & 0xDF
+    letter = (upper >= 65) & (upper <= 90) & in_code
+    owner = np.where(letter, np.arange(size, dtype=np.int32), -1)
+    np.maximum.accumulate(owner, out=owner)
+    numeric = (((buf >= 48) & (buf <= 57)) | (buf == 46) | (buf == 45) | (buf == 43))
+    valued = numeric & in_code & (owner >= starts[line_of])
+    owner_letter = upper[np.maximum(owner, 0)]
+
+    # One pass reads every word's number; words are then split by letter
+    positions, values = _word_values(buf, valued)
+    # A number belongs to a letter only if at most blanks separate them;
+    # bare numbers ('X10 20') are ignored, as by tokenize_line
+    mark = np.where((buf == 32) | (buf == 9), -1, np.arange(size, dtype=np.int32))
+    np.maximum.accumulate(mark, out=mark)
+    worded = mark[positions - 1] == owner[positions]
+    positions, values = positions[worded], values[worded]
+    letters = owner_letter[positions]
+    rows = line_of[positions]
+
+    lines = len(ends)
+    columns = {}
+    for axis in AXES:
+        column = np.full(lines, np.nan)
+        selected = letters == ord(axis)
+        column[rows[selected]] = values[selected]
+        columns[axis] = column
+
+    # Command: first G/M/T word of each line, keyed letter * 1e7 + value
+    selected = np.isin(letters, [ord(name) for name in COMMAND_LETTERS])
+    command_rows = rows[selected]
+    keys = letters[selected] * 1e7 + values[selected]
+    command_lines, first = np.unique(command_rows, return_index=True)
+    line_keys = np.full(lines, np.nan)
+    line_keys[command_lines] = keys[first]
+
+    unique_keys, local = np.unique(line_keys[command_lines], return_inverse=True)
+    names = [_command_name(chr(int(key // 1e7)), key - int(key // 1e7) * 1e7)
+             for key in unique_keys]
+    cmd = np.full(lines, NO_COMMAND, dtype=np.int16)
+    cmd[command_lines] = local
+
+    text_codes = [code for code, name in enumerate(names) if name in TEXT_COMMANDS]
+    if text_codes:
+        text_lines = np.isin(cmd, text_codes)
+        for column in columns.values():
+            column[text_lines] = np.nan
+
+    semis = np.flatnonzero(buf == 59)
+    comment_lines, first = np.unique(line_of[semis], return_index=True)
+    comment_starts = ends.copy()
+    comment_starts[comment_lines] = semis[first] + 1
+
+    return {'line_ends': ends, 'cmd': cmd, 'names': names, 'columns': columns,
+            'comment_starts': comment_starts, 'comment_ends': ends}
+
+
+def _tokenize_chunk_lines(chunk: bytes) -> Dict[str, object]:
+    """Line-by-line tokenization, used when the vectorized pass cannot be."""
+    ends, cmd, comment_starts = [], [], []
+    columns = {axis: [] for axis in AXES}
+    names: Dict[str, int] = {}
+    position = 0
+    for raw in chunk.split(b'\n')[:-1]:
+        end = position + len(raw)
+        command, params, comment = tokenize_line(raw.decode('utf-8', 'replace'))
+        if command is None:
+            cmd.append(NO_COMMAND)
+        else:
+            cmd.append(names.setdefault(command, len(names)))
+        for axis in AXES:
+            columns[axis].append(params.get(axis, np.nan))
+        semi = raw.find(b';')
+        comment_starts.append(end if semi < 0 else position + semi + 1)
+        ends.append(end)
+        position = end + 1
+    ends = np.array(ends, dtype=np.int64)
+    return {'line_ends': ends, 'cmd': np.array(cmd, dtype=np.int16),
+            'names': sorted(names, key=names.get),
+            'columns': {axis: np.array(values, dtype=np.float64)
+                        for axis, values in columns.items()},
+            'comment_starts': np.array(comment_starts, dtype=np.int64),
+            'comment_ends': ends}
+
+
+class ParsedGcode(Sequence):
+    """Columnar, parsed G-code that still reads like a list of lines.
+
+    Attributes:
+        data: Raw G-code bytes (any buffer supporting slicing)
+        line_offsets: Start offset of each line in ``data`` (plus one
+            past the last line's newline)
+        cmd: int16 command code per line (``NO_COMMAND`` for blank or
+            comment-only lines); names are in ``commands``
+        x, y, z, e, f: float64 parameter values per line (NaN if absent)
+        comment_offsets: (lines, 2) start/end of each line's comment in
+            ``data`` (equal when the line has none)
+        commands: Command names, indexed by code
+    """
+
+    def __init__(self, data, line_offsets: np.ndarray, cmd: np.ndarray,
+                 columns: Dict[str, np.ndarray], commands: List[str],
+                 comment_offsets: np.ndarray):
+        self.data = data
+        self.line_offsets = line_offsets
+        self.cmd = cmd
+        self.columns = columns
+        self.x = columns['X']
+        self.y = columns['Y']
+        self.z = columns['Z']
+        self.e = columns['E']
+        self.f = columns['F']
+        self.commands = commands
+        self._codes = {name: code for code, name in enumerate(commands)}
+        self.comment_offsets = comment_offsets
+
+    @classmethod
+    def parse(cls, gcode_lines: Iterable[str]) -> 'ParsedGcode':
+        """Tokenize G-code lines.
+
+        Args:
+            gcode_lines: G-code lines (without line endings)
+
+        Returns:
+            Parsed G-code
+        """
+        text = ''.join(line.rstrip('\r\n') + '\n' for line in gcode_lines)
+        return cls.from_bytes(text.encode('utf-8'))
+
+    @classmethod
+    def from_bytes(cls, data, chunk_bytes: int = CHUNK_BYTES) -> 'ParsedGcode':
+        """Tokenize raw G-code bytes (``bytes`` or an ``mmap``).
+
+        Args:
+            data: G-code text as UTF-8/ASCII bytes
+            chunk_bytes: Bytes tokenized per vectorized pass
+
+        Returns:
+            Parsed G-code
+        """
+        vocabulary: Dict[str, int] = {}
+        parts = []
+        for start, end in _chunks(data, chunk_bytes):
+            chunk = data[start:end]
+            if not chunk.endswith(b'\n'):
+                chunk += b'\n'
+            try:
+                part = _tokenize_chunk(np.frombuffer(chunk, dtype=np.uint8))
+            except _Unparseable:
+                part = _tokenize_chunk_lines(chunk)
+
+            codes = np.array([vocabulary.setdefault(name, len(vocabulary))
+                              for name in part['names']] + [NO_COMMAND], dtype=np.int16)
+            part['cmd'] = codes[part['cmd']]
+            for key in ('line_ends', 'comment_starts', 'comment_ends'):
+                part[key] = part[key].astype(np.int64) + start
+            parts.append(part)
+
+        def joined(key, dtype):
+            if not parts:
+                return np.empty(0, dtype=dtype)
+            return np.concatenate([part[key] for part in parts])
+
+        line_ends = joined('line_ends', np.int64)
+        return cls(
+            data=data,
+            line_offsets=np.concatenate([[0], line_ends + 1]).astype(np.int64),
+            cmd=joined('cmd', np.int16),
+            columns={axis: (np.concatenate([part['columns'][axis] for part in parts])
+                            if parts else np.empty(0)) for axis in AXES},
+            commands=sorted(vocabulary, key=vocabulary.get),
+            comment_offsets=np.stack([joined('comment_starts', np.int64),
+                                      joined('comment_ends', np.int64)], axis=1))
+
+    def __len__(self) -> int:
+        return len(self.cmd)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('G-code line index out of range')
+        start, end = self.line_offsets[index], self.line_offsets[index + 1] - 1
+        return bytes(self.data[start:end]).decode('utf-8', 'replace').rstrip('\r')
+
+    def __iter__(self):
+        offsets = self.line_offsets.tolist()
+        data = self.data
+        for start, end in zip(offsets, offsets[1:]):
+            yield bytes(data[start:end - 1]).decode('utf-8', 'replace').rstrip('\r')
+
+    def code(self, command: str) -> int:
+        """Command code for a name such as 'G1' (-2 if it never occurs)."""
+        return self._codes.get(command, -2)
+
+    def mask(self, *commands: str) -> np.ndarray:
+        """Boolean mask of the lines whose command is one of ``commands``."""
+        return np.isin(self.cmd, [self.code(command) for command in commands])
+
+    def has(self, axis: str) -> np.ndarray:
+        """Boolean mask of the lines that carry a parameter word."""
+        return ~np.isnan(self.columns[axis])
+
+    def comment(self, index: int) -> str:
+        """Comment text of a line ('' if none)."""
+        start, end = self.comment_offsets[index]
+        return bytes(self.data[start:end]).decode('utf-8', 'replace').strip()
+
+
+def parse_gcode(gcode_lines: Iterable[str]) -> ParsedGcode:
+    """Parse G-code, reusing it if it is already parsed.
+
+    Args:
+        gcode_lines: G-code lines, a ``ParsedGcode`` or a ``GcodeFile``
+
+    Returns:
+        Parsed G-code
+    """
+    # Plugins may import this module under another name, so check by type name
+    if type(gcode_lines).__name__ == 'ParsedGcode':
+        return gcode_lines
+    if type(gcode_lines).__name__ == 'GcodeFile':
+        return gcode_lines.parsed()
+    return ParsedGcode.parse(gcode_lines)
@@ -0,0 +1,206 @@
+"""
+G-code Statistics for GHST Plugins
+
+Vectorized print statistics over ``ParsedGcode``: machine position after
+every line, per-move distances and extrusion, feedrate-based time and a
+per-layer breakdown, all computed with whole-array NumPy passes.
+
+Modal state is resolved without a per-line loop. Each axis position is
+the last absolute value set (absolute move, G92 or G28) plus the sum of
+relative moves since then; positioning (G90/G91), extrusion mode
+(M82/M83) and feedrate (F) are forward-filled from the line that last
+set them. Arcs (G2/G3) are measured as their chord.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+try:
+    from .gcode_parser import parse_gcode
+    from .motion_planner import MotionLimits, plan_move_times
+except ImportError:  # imported with src/plugins/ on sys.path
+    from gcode_parser import parse_gcode
+    from motion_planner import MotionLimits, plan_move_times
+
+MOVE_COMMANDS = ('G0', 'G1', 'G2', 'G3')
+
+# Feedrate used before the G-code sets one (mm/min)
+DEFAULT_FEEDRATE = 1500.0
+
+
+def _last_index(mask: np.ndarray) -> np.ndarray:
+    """Index of the last True at or before each row (-1 if none yet)."""
+    return np.maximum.accumulate(np.where(mask, np.arange(len(mask)), -1))
+
+
+def _homed_axes(line: str) -> str:
+    """Axes homed by a G28 line.
+
+    Those it names, with or without a value; X, Y and Z if it names none.
+    """
+    code = line.partition(';')[0].partition('*')[0].upper()
+    arguments = code.split('G28', 1)[-1]
+    return ''.join(axis for axis in 'XYZ' if axis in arguments) or 'XYZ'
+
+
+def _axis_positions(values: np.ndarray, moves: np.ndarray, relative: np.ndarray,
+                    resets: np.ndarray, reset_values: np.ndarray) -> np.ndarray:
+    """Position of one axis after every line.
+
+    Args:
+        values: The axis column (NaN where the word is absent)
+        moves: Rows that are moves
+        relative: Rows where moves of this axis are relative
+        resets: Rows that set the position outright (G92, G28)
+        reset_values: Position set on reset rows
+    """
+    present = moves & ~np.isnan(values)
+    relative_moves = present & relative
+    absolute = (present & ~relative) | resets
+    targets = np.where(resets, reset_values, values)
+
+    last = _last_index(absolute)
+    anchor = np.maximum(last, 0)
+    if not relative_moves.any():
+        # Absolute-only axis: the position is the last value set
+        return np.where(last >= 0, targets[anchor], 0.0)
+    offsets = np.cumsum(np.where(relative_moves, values, 0.0))
+    base = np.where(last >= 0, targets[anchor] - offsets[anchor], 0.0)
+    return base + offsets
+
+
+def motion_profile(gcode_lines: Iterable[str],
+                   default_feedrate: float = DEFAULT_FEEDRATE) -> Dict[str, np.ndarray]:
+    """Resolve positions, deltas and feedrates for every line.
+
+    Args:
+        gcode_lines: G-code lines, a ``ParsedGcode`` or a ``GcodeFile``
+        default_feedrate: Feedrate before the first F word (mm/min)
+
+    Returns:
+        Dictionary of per-line arrays: 'move' (bool), 'x', 'y', 'z', 'e'
+        (positions after the line), 'dx', 'dy', 'dz', 'de' (zero on
+        non-moves), 'length' (XYZ distance), 'feedrate' (mm/s),
+        'extruding' (bool: moves that lay down filament) and 'relative',
+        'relative_e' (bool: positioning modes in effect after the line)
+    """
+    gcode = parse_gcode(gcode_lines)
+    count = len(gcode)
+    moves = gcode.mask(*MOVE_COMMANDS)
+
+    # Positioning mode: last G90/G91; extrusion follows it unless M82/M83
+    # came later
+    g91 = gcode.mask('G91')
+    mode = _last_index(gcode.mask('G90') | g91)
+    relative_xyz = (mode >= 0) & g91[np.maximum(mode, 0)]
+    relative_e_set = g91 | gcode.mask('M83')
+    e_mode = _last_index(gcode.mask('G90', 'M82') | relative_e_set)
+    relative_e = (e_mode >= 0) & relative_e_set[np.maximum(e_mode, 0)]
+
+    # G92 sets the axes it names (all of them when it names none); G28
+    # homes the axes it names to zero (X/Y/Z when it names none). Bare
+    # axis letters ('G28 X') carry no value, so G28 lines are read as text.
+    g92 = gcode.mask('G92')
+    g92_bare = g92 & ~(gcode.has('X') | gcode.has('Y') | gcode.has('Z') | gcode.has('E'))
+    homed = {axis: np.zeros(count, dtype=bool) for axis in 'XYZE'}
+    for row in np.flatnonzero(gcode.mask('G28')).tolist():
+        for axis in _homed_axes(gcode[row]):
+            homed[axis][row] = True
+
+    positions = {}
+    for axis in ('X', 'Y', 'Z', 'E'):
+        values = gcode.columns[axis]
+        resets = (g92 & (~np.isnan(values) | g92_bare)) | homed[axis]
+        reset_values = np.where(np.isnan(values) | homed[axis], 0.0, values)
+        positions[axis] = _axis_positions(
+            values, moves, relative_e if axis == 'E' else relative_xyz,
+            resets, reset_values)
+
+    profile = {'move': moves, 'relative': relative_xyz, 'relative_e': relative_e}
+    for axis, position in positions.items():
+        key = axis.lower()
+        profile[key] = position
+        delta = np.diff(position, prepend=0.0) if count else position
+        profile['d' + key] = np.where(moves, delta, 0.0)
+
+    profile['length'] = np.sqrt(profile['dx'] ** 2 + profile['dy'] ** 2 + profile['dz'] ** 2)
+
+    feed_rows = _last_index(gcode.has('F'))
+    feedrate = np.where(feed_rows >= 0, gcode.f[np.maximum(feed_rows, 0)], default_feedrate)
+    profile['feedrate'] = np.where(feedrate > 0, feedrate, default_feedrate) / 60.0
+
+    profile['extruding'] = moves & (profile['de'] > 0) & (
+        (profile['dx'] != 0) | (profile['dy'] != 0))
+    return profile
+
+
+def compute_print_stats(gcode_lines: Iterable[str],
+                        default_feedrate: float = DEFAULT_FEEDRATE,
+                        include_layers: bool = True,
+                        limits: Optional[MotionLimits] = None) -> Dict[str, Any]:
+    """Compute filament, distance, time and per-layer statistics.
+
+    Without ``limits``, time is distance over the programmed feedrate
+    (no acceleration); extrusion-only moves take their E distance at that
+    feedrate. With ``limits``, time comes from the kinematic planner in
+    ``motion_planner`` and the feedrate-only figure is reported as
+    'nominal_time_s'. Layers start at each new Z height where extrusion
+    happens, so Z-hops during travel do not count as layers.
+
+    Args:
+        gcode_lines: G-code lines, a ``ParsedGcode`` or a ``GcodeFile``
+        default_feedrate: Feedrate before the first F word (mm/min)
+        include_layers: Include the per-layer breakdown
+        limits: Printer motion limits for the kinematic time estimate
+
+    Returns:
+        Statistics dictionary
+    """
+    profile = motion_profile(gcode_lines, default_feedrate)
+    moves = profile['move']
+    de = profile['de']
+    length = profile['length']
+    extruding = profile['extruding']
+
+    travel = np.where(length > 0, length, np.abs(de))
+    nominal_time = np.where(moves, travel / profile['feedrate'], 0.0)
+    move_time = nominal_time if limits is None else plan_move_times(profile, limits)
+    retracting = moves & (de < 0)
+
+    # Layer number of every line: bumps at the first extrusion of a new Z
+    extrusion_rows = np.flatnonzero(extruding)
+    layer_z = profile['z'][extrusion_rows]
+    new_layer = np.ones(len(extrusion_rows), dtype=bool)
+    new_layer[1:] = layer_z[1:] != layer_z[:-1]
+    starts = np.zeros(len(moves), dtype=np.int64)
+    starts[extrusion_rows[new_layer]] = 1
+    layer = np.maximum(np.cumsum(starts), 1) - 1
+    layer_count = int(new_layer.sum())
+
+    stats = {
+        'lines': len(moves),
+        'moves': int(moves.sum()),
+        'extrusion_moves': int(extruding.sum()),
+        'filament_length_mm': float(de.sum()),
+        'retractions': int(retracting.sum()),
+        'retracted_mm': float(-de[retracting].sum()),
+        'extrusion_distance_mm': float(length[extruding].sum()),
+        'travel_distance_mm': float(length[moves & ~extruding].sum()),
+        'print_time_s': float(move_time.sum()),
+        'nominal_time_s': float(nominal_time.sum()),
+        'layer_count': layer_count
+    }
+
+    if include_layers and layer_count:
+        bins = max(layer_count, 1)
+        filament = np.bincount(layer, weights=de, minlength=bins)
+        seconds = np.bincount(layer, weights=move_time, minlength=bins)
+        distance = np.bincount(layer, weights=np.where(moves, length, 0.0), minlength=bins)
+        stats['layers'] = [
+            {'layer': index + 1, 'z': z, 'filament_mm': mm, 'time_s': sec,
+             'distance_mm': dist}
+            for index, (z, mm, sec, dist) in enumerate(zip(
+                layer_z[new_layer].tolist(), filament.tolist(),
+                seconds.tolist(), distance.tolist()))]
+    return stats
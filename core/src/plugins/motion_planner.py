@@ -0,0 +1,167 @@
+"""
+Motion Planner for GHST Plugins
+
+Kinematic print-time estimate: moves follow trapezoidal velocity
+profiles under a constant acceleration limit, and the speed through each
+corner is capped with the junction-deviation model used by Marlin and
+grbl. Per-axis feedrate limits cap each move's cruise speed.
+
+The planner's backward and forward passes are recurrences
+(``v_i^2 = min(limit_i, v_(i+1)^2 + 2 a d_i)``). With prefix sums of
+``2 a d`` they unroll into running minimums, so both passes run as
+``np.minimum.accumulate`` over all moves at once instead of a Python
+loop per move.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+
+@dataclass
+class MotionLimits:
+    """Printer motion limits used by the planner."""
+    max_acceleration: float = 1500.0  # mm/s^2
+    junction_deviation: float = 0.05  # mm
+    max_feedrate_x: float = 0.0  # mm/s, 0 = unlimited
+    max_feedrate_y: float = 0.0
+    max_feedrate_z: float = 0.0
+
+    @classmethod
+    def from_printer_config(cls, printer_config: Any) -> 'MotionLimits':
+        """Build limits from a ``PrinterConfig`` (missing fields use defaults)."""
+        defaults = cls()
+        return cls(**{name: getattr(printer_config, name, None) or getattr(defaults, name)
+                      for name in defaults.__dataclass_fields__})
+
+
+def _junction_speeds_sq(ux: np.ndarray, uy: np.ndarray, uz: np.ndarray,
+                        acceleration: np.ndarray, deviation: float) -> np.ndarray:
+    """Squared corner speed limit between consecutive moves.
+
+    Args:
+        ux, uy, uz: Unit direction of each move
+        acceleration: Acceleration of each move (the later move's is used)
+        deviation: Junction deviation (mm)
+
+    Returns:
+        Array with one entry per junction (len(moves) - 1)
+    """
+    cos_theta = -(ux[:-1] * ux[1:] + uy[:-1] * uy[1:] + uz[:-1] * uz[1:])
+    sin_half = np.sqrt(np.clip(0.5 * (1.0 - cos_theta), 0.0, 1.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        limit = acceleration[1:] * deviation * sin_half / (1.0 - sin_half)
+    # Straight continuation: no corner limit; full reversal: stop
+    limit = np.where(sin_half >= 1.0 - 1e-9, np.inf, limit)
+    return np.where(cos_theta >= 1.0 - 1e-9, 0.0, limit)
+
+
+def plan_segments(length: np.ndarray, cruise: np.ndarray, acceleration: np.ndarray,
+                  junction_sq: np.ndarray) -> np.ndarray:
+    """Time of each move after the backward and forward planner passes.
+
+    Moves start and end at rest; ``junction_sq`` caps the squared speed
+    between move i and i+1 (use 0 to force a stop).
+
+    Args:
+        length: Move distances (mm, > 0)
+        cruise: Cruise (nominal) speeds (mm/s, > 0)
+        acceleration: Accelerations (mm/s^2, > 0)
+        junction_sq: Squared speed limits at the len(length) - 1 junctions
+
+    Returns:
+        Move times (s)
+    """
+    count = len(length)
+    if not count:
+        return np.empty(0)
+
+    # Entry speed limits (squared): rest at both ends, corners and cruise
+    # speeds in between
+    cruise_sq = cruise ** 2
+    limit = np.zeros(count + 1)
+    limit[1:-1] = np.minimum(junction_sq, np.minimum(cruise_sq[:-1], cruise_sq[1:]))
+
+    reach = 2.0 * acceleration * length
+    prefix = np.concatenate([[0.0], np.cumsum(reach)])
+
+    # Backward pass: w_i = min_k>=i (limit_k + prefix_k) - prefix_i
+    entry = np.minimum.accumulate((limit + prefix)[::-1])[::-1] - prefix
+    # Forward pass: w_i = prefix_i + min_k<=i (w_k - prefix_k)
+    entry = prefix + np.minimum.accumulate(entry - prefix)
+    entry = np.maximum(entry, 0.0)
+
+    start = np.sqrt(entry[:-1])
+    end = np.sqrt(entry[1:])
+    accel_distance = (cruise_sq - entry[:-1]) / (2.0 * acceleration)
+    decel_distance = (cruise_sq - entry[1:]) / (2.0 * acceleration)
+    cruise_distance = length - accel_distance - decel_distance
+
+    trapezoid = ((cruise - start) / acceleration + (cruise - end) / acceleration
+                 + np.maximum(cruise_distance, 0.0) / cruise)
+    peak = np.sqrt(np.maximum((reach + entry[:-1] + entry[1:]) / 2.0, 0.0))
+    triangle = (peak - start) / acceleration + (peak - end) / acceleration
+    return np.where(cruise_distance >= 0.0, trapezoid, triangle)
+
+
+def move_segments(profile: Dict[str, np.ndarray],
+                  limits: MotionLimits) -> Tuple[np.ndarray, ...]:
+    """Planner inputs for the moves of a motion profile.
+
+    Extrusion-only moves (retract/prime) are planned on their E distance
+    and force a stop on either side, as the XYZ motion halts for them.
+
+    Args:
+        profile: Output of ``gcode_stats.motion_profile``
+        limits: Printer motion limits
+
+    Returns:
+        Tuple of (rows, length, cruise, acceleration, junction_sq): the
+        profile rows that move and the ``plan_segments`` arguments
+    """
+    length = profile['length']
+    de = np.abs(profile['de'])
+    rows = np.flatnonzero(profile['move'] & ((length > 0) | (de > 0)))
+
+    xyz = length[rows] > 0
+    distance = np.where(xyz, length[rows], de[rows])
+    cruise = profile['feedrate'][rows].copy()
+
+    # Per-axis caps: the move's speed along each axis stays within limits
+    for axis, axis_limit in (('dx', limits.max_feedrate_x), ('dy', limits.max_feedrate_y),
+                             ('dz', limits.max_feedrate_z)):
+        if axis_limit and axis_limit > 0:
+            travel = np.abs(profile[axis][rows])
+            with np.errstate(divide='ignore'):
+                cap = np.where(travel > 0, axis_limit * distance / travel, np.inf)
+            cruise = np.minimum(cruise, cap)
+
+    acceleration = np.full(len(rows), float(limits.max_acceleration))
+    if not len(rows):
+        return rows, distance, cruise, acceleration, np.empty(0)
+
+    safe = np.where(xyz, distance, 1.0)
+    junction_sq = _junction_speeds_sq(
+        np.where(xyz, profile['dx'][rows] / safe, 0.0),
+        np.where(xyz, profile['dy'][rows] / safe, 0.0),
+        np.where(xyz, profile['dz'][rows] / safe, 0.0),
+        acceleration, limits.junction_deviation)
+    junction_sq[~(xyz[:-1] & xyz[1:])] = 0.0
+    return rows, distance, cruise, acceleration, junction_sq
+
+
+def plan_move_times(profile: Dict[str, np.ndarray], limits: MotionLimits) -> np.ndarray:
+    """Kinematic time of every line of a motion profile.
+
+    Args:
+        profile: Output of ``gcode_stats.motion_profile``
+        limits: Printer motion limits
+
+    Returns:
+        Per-line move time in seconds (0 for non-moves)
+    """
+    rows, length, cruise, acceleration, junction_sq = move_segments(profile, limits)
+    times = np.zeros(len(profile['length']))
+    times[rows] = plan_segments(length, cruise, acceleration, junction_sq)
+    return times
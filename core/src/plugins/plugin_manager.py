@@ -7,30 +7,153 @@ Modeled after the GHST Agent Manager architecture.
 ⚠️ DISCLAIMER: Plugin loading involves code execution - use at your own risk!
 """
 
+import heapq
 import importlib
 import importlib.util
 import inspect
+import itertools
 import logging
+import multiprocessing
 import os
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from .base_plugin import BasePlugin, PluginMetadata
+from .gcode_chunks import iter_chunks
+from .gcode_file import GcodeFile
+from .plugin_profiler import DEFAULT_REPORT_PATH, PluginProfiler
+
+# Minimum lines per chunk for parallel G-code processing
+DEFAULT_CHUNK_LINES = 50_000
+
+# Notification hooks defined by BasePlugin; their dispatch tables are
+# built eagerly, other hook names on first use
+NOTIFICATION_HOOKS = tuple(name for name in vars(BasePlugin) if name.startswith('on_'))
+
+# Default time budget for one notification hook call (seconds)
+DEFAULT_HOOK_TIMEOUT = 5.0
+
+# Methods through which plugins transform G-code
+GCODE_METHODS = ('process_gcode', 'process_gcode_stream')
+
+# Plugin instances created in worker processes, by (source, class name)
+_worker_plugins: Dict[Tuple[str, str], BasePlugin] = {}
+
+
+def _worker_plugin(source: str, class_name: str) -> BasePlugin:
+    """Load a plugin in a worker process (once per worker)."""
+    key = (source, class_name)
+    if key not in _worker_plugins:
+        plugin_dir = str(Path(source).parent)
+        for path in (plugin_dir, str(Path(plugin_dir).parent)):
+            if path not in sys.path:
+                sys.path.insert(0, path)
+
+        spec = importlib.util.spec_from_file_location(Path(source).stem, source)
+        module = importlib.util.module_from_spec(spec)
+        module.__dict__['BasePlugin'] = BasePlugin
+        module.__dict__['PluginMetadata'] = PluginMetadata
+        spec.loader.exec_module(module)
+
+        plugin = getattr(module, class_name)()
+        if not plugin.initialize():
+            raise RuntimeError(f"Failed to initialize plugin {class_name} in worker")
+        _worker_plugins[key] = plugin
+    return _worker_plugins[key]
+
+
+def _process_gcode_chunk(task: Tuple[List[Tuple[str, str, Dict[str, Any], bool]],
+                                     Dict[str, Any], Union[List[str], Tuple[str, int, int]], bool]
+                         ) -> Tuple[List[str], Dict[str, Any]]:
+    """Run one G-code chunk through chunk-safe plugins in a worker process.
+
+    Args:
+        task: Tuple of (plugins, state, lines, profile); plugins lists
+            (source, class name, config, active) in chain order; lines
+            are a list or a (path, start, end) byte range of a G-code
+            file; profile enables ``PluginProfiler`` timing
+
+    Returns:
+        Tuple of (processed lines, ``PluginProfiler.stats`` of the chunk,
+        empty without profiling)
+    """
+    plugin_specs, state, stream, profile = task
+    if isinstance(stream, tuple):
+        path, start, end = stream
+        with GcodeFile(path, byte_range=(start, end)) as lines:
+            return _process_gcode_chunk((plugin_specs, state, lines, profile))
+    profiler = PluginProfiler(memory_sample_every=0)
+    for source, class_name, config, active in plugin_specs:
+        plugin = _worker_plugin(source, class_name)
+        plugin.set_config(config)
+        plugin.active = active
+        plugin.on_gcode_chunk(dict(state))
+        if profile:
+            stream = profiler.profile_stream(plugin.metadata.name, 'process_gcode_stream',
+                                             plugin.process_gcode_stream, stream)
+        else:
+            stream = plugin.process_gcode_stream(stream)
+    return list(stream), profiler.stats
 
 
 class PluginManager:
     """Manages GHST plugins and their lifecycle."""
 
-    def __init__(self, plugin_dirs: List[str] = None):
+    def __init__(self, plugin_dirs: List[str] = None, async_hooks: bool = False,
+                 hook_timeout: float = DEFAULT_HOOK_TIMEOUT, hook_workers: int = 4,
+                 profile_plugins: bool = False):
         """Initialize plugin manager.
 
         Args:
             plugin_dirs: List of directories to search for plugins
+            async_hooks: Run notification hooks (``on_*``) on a thread pool
+                instead of blocking the caller
+            hook_timeout: Default time budget per notification hook call
+                (seconds); plugins may set ``PluginMetadata.hook_timeout``
+            hook_workers: Threads for asynchronous hooks
+            profile_plugins: Record the cost of every plugin call (see
+                ``PluginProfiler``); off by default, as it slows streamed
+                G-code down
         """
         self.loaded_plugins: Dict[str, BasePlugin] = {}
         self.plugin_configs: Dict[str, Dict[str, Any]] = {}
         self.plugin_enabled: Dict[str, bool] = {}
+        self.plugin_sources: Dict[str, str] = {}
+
+        # Notification hooks: optional thread pool and overrun records
+        self.async_hooks = async_hooks
+        self.hook_timeout = hook_timeout
+        self.hook_workers = hook_workers
+        self.hook_overruns: Dict[str, List[Dict[str, Any]]] = {}
+        self._hook_pool: Optional[ThreadPoolExecutor] = None
+        self._hook_lock = threading.Lock()
+
+        # Watchdog for asynchronous hook calls: one thread sleeps until
+        # the earliest deadline in the heap (see _watch_hook)
+        self._watch_heap: List[Tuple[float, int]] = []
+        self._watched_calls: Dict[int, Tuple[float, BasePlugin, str, float]] = {}
+        self._watch_ids = itertools.count()
+        self._watch_cond = threading.Condition()
+        self._watchdog: Optional[threading.Thread] = None
+
+        # Per-plugin cost accounting
+        self.profile_plugins = profile_plugins
+        self.profiler = PluginProfiler()
+
+        # Dispatch tables, rebuilt when plugins are loaded, enabled,
+        # disabled or unloaded (see _rebuild_dispatch_tables)
+        self._enabled_plugins: List[BasePlugin] = []
+        self._category_plugins: Dict[str, List[BasePlugin]] = {}
+        self._hook_table: Dict[str, List[Tuple[BasePlugin, Callable]]] = {}
+        self._transform_table: Dict[Tuple[str, Tuple[str, ...]], List[BasePlugin]] = {}
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_workers = 0
 
         # Setup logging
         self.logger = logging.getLogger('PluginManager')
@@ -181,6 +304,8 @@ class PluginManager:
                 if plugin_instance.initialize():
                     self.loaded_plugins[plugin_instance.metadata.name] = plugin_instance
                     self.plugin_enabled[plugin_instance.metadata.name] = True
+                    self.plugin_sources[plugin_instance.metadata.name] = spec.origin
+                    self._rebuild_dispatch_tables()
 
                     self.logger.info(
                         f"✅ Loaded plugin: {plugin_instance.metadata.name} v{plugin_instance.metadata.version}")
@@ -244,6 +369,8 @@ class PluginManager:
 
             del self.loaded_plugins[plugin_name]
             del self.plugin_enabled[plugin_name]
+            self.plugin_sources.pop(plugin_name, None)
+            self._rebuild_dispatch_tables()
 
             self.logger.info("Unloaded plugin: {plugin_name}")
             return True
@@ -259,6 +386,7 @@ class PluginManager:
 
         self.plugin_enabled[plugin_name] = True
         self.loaded_plugins[plugin_name].active = True
+        self._rebuild_dispatch_tables()
         self.logger.info("Enabled plugin: {plugin_name}")
         return True
 
@@ -269,6 +397,7 @@ class PluginManager:
 
         self.plugin_enabled[plugin_name] = False
         self.loaded_plugins[plugin_name].active = False
+        self._rebuild_dispatch_tables()
         self.logger.info("Disabled plugin: {plugin_name}")
         return True
 
@@ -278,17 +407,60 @@ class PluginManager:
 
     def get_enabled_plugins(self) -> List[BasePlugin]:
         """Get all enabled plugins."""
-        return [
-            plugin for name, plugin in self.loaded_plugins.items()
-            if self.plugin_enabled.get(name, False)
-        ]
+        return list(self._enabled_plugins)
 
     def get_plugins_by_category(self, category: str) -> List[BasePlugin]:
         """Get all enabled plugins in a specific category."""
-        return [
-            plugin for plugin in self.get_enabled_plugins()
-            if plugin.metadata.category == category
+        return list(self._category_plugins.get(category, ()))
+
+    def refresh_dispatch_tables(self):
+        """Rebuild the dispatch tables after changing plugin state directly.
+
+        Loading, unloading, enabling and disabling through the manager
+        already keeps the tables current.
+        """
+        self._rebuild_dispatch_tables()
+
+    def _rebuild_dispatch_tables(self):
+        """Recompute the enabled, per-category and per-hook plugin tables."""
+        self._enabled_plugins = [
+            plugin for name, plugin in self.loaded_plugins.items()
+            if self.plugin_enabled.get(name, False)
         ]
+        self._category_plugins = {}
+        for plugin in self._enabled_plugins:
+            self._category_plugins.setdefault(plugin.metadata.category, []).append(plugin)
+        self._transform_table = {}
+        self._hook_table = {}
+        for hook_name in NOTIFICATION_HOOKS:
+            self._hook_subscribers(hook_name)
+
+    @staticmethod
+    def _subscribes(plugin: BasePlugin, method_name: str) -> bool:
+        """Whether a plugin implements a hook rather than inheriting the no-op."""
+        if hasattr(BasePlugin, method_name):
+            return plugin.overrides(method_name)
+        return callable(getattr(plugin, method_name, None))
+
+    def _hook_subscribers(self, hook_name: str) -> List[Tuple[BasePlugin, Callable]]:
+        """Enabled plugins implementing a hook, with the bound method."""
+        subscribers = self._hook_table.get(hook_name)
+        if subscribers is None:
+            subscribers = [(plugin, getattr(plugin, hook_name))
+                           for plugin in self._enabled_plugins
+                           if self._subscribes(plugin, hook_name)]
+            self._hook_table[hook_name] = subscribers
+        return subscribers
+
+    def _transformers(self, category: str, *method_names: str) -> List[BasePlugin]:
+        """Enabled plugins of a category implementing any of the methods."""
+        key = (category, method_names)
+        plugins = self._transform_table.get(key)
+        if plugins is None:
+            plugins = [plugin for plugin in self._category_plugins.get(category, ())
+                       if any(self._subscribes(plugin, name) for name in method_names)]
+            self._transform_table[key] = plugins
+        return plugins
 
     def get_plugin_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all loaded plugins."""
@@ -296,31 +468,206 @@ class PluginManager:
         for name, plugin in self.loaded_plugins.items():
             status[name] = {
                 **plugin.get_status(),
-                'enabled': self.plugin_enabled.get(name, False)
+                'enabled': self.plugin_enabled.get(name, False),
+                'hook_overruns': list(self.hook_overruns.get(name, [])),
+                'profile': self.profiler.plugin_summary(name)
             }
         return status
 
-    def call_plugin_hook(self, hook_name: str, *args, **kwargs):
+    def _measure(self, plugin: BasePlugin, operation: str, lines_in: int = 0):
+        """Context manager recording one plugin call in the profiler."""
+        if not self.profile_plugins:
+            return nullcontext({'lines_out': 0})
+        return self.profiler.measure(plugin.metadata.name, operation, lines_in)
+
+    def write_profile_report(self, path: Path = DEFAULT_REPORT_PATH) -> Path:
+        """Write the per-plugin cost report and log the most expensive plugin.
+
+        Args:
+            path: Destination JSON file
+
+        Returns:
+            The path written
+        """
+        report = self.profiler.report()
+        path = self.profiler.write_report(path)
+        if report:
+            top = report[0]
+            self.logger.info(
+                f"Plugin profile written to {path}; most expensive: {top['plugin']} "
+                f"({top['wall_s']:.3f}s wall, {top['cpu_s']:.3f}s CPU in {top['calls']} calls)")
+        return path
+
+    def call_plugin_hook(self, hook_name: str, *args, **kwargs) -> Optional[List[Future]]:
         """Call a specific hook on all enabled plugins.
 
+        Plugins that inherit the hook from ``BasePlugin`` unchanged are
+        skipped, so the cost depends only on the plugins implementing it.
+
+        With ``async_hooks``, notification hooks (``on_*``) are submitted
+        to a thread pool and run in parallel across plugins; the call
+        returns at once. A notification hook call that runs past the
+        plugin's budget is recorded in ``hook_overruns`` and logged; on
+        the pool, the plugin is also disabled, as a hung call would keep
+        a pool thread. Transform hooks (``process_*``) always run in
+        order in the calling thread and have no budget.
+
         Args:
             hook_name: Name of the method to call
             *args, **kwargs: Arguments to pass to the hook
+
+        Returns:
+            Futures of the submitted calls when run asynchronously
         """
-        for plugin in self.get_enabled_plugins():
-            try:
-                if hasattr(plugin, hook_name):
-                    method = getattr(plugin, hook_name)
-                    method(*args, **kwargs)
-            except Exception as e:
-                self.logger.error(
-                    f"Error calling {hook_name} on plugin {plugin.metadata.name}: {e}")
+        subscribers = self._hook_subscribers(hook_name)
+        if self.async_hooks and hook_name.startswith('on_'):
+            pool = self._get_hook_pool()
+            return [pool.submit(self._run_hook, plugin, method, hook_name, args, kwargs, True)
+                    for plugin, method in subscribers]
+
+        for plugin, method in subscribers:
+            self._run_hook(plugin, method, hook_name, args, kwargs)
+        return None
+
+    def _hook_budget(self, plugin: BasePlugin) -> float:
+        """Time budget of one hook call for a plugin (seconds)."""
+        return getattr(plugin.metadata, 'hook_timeout', None) or self.hook_timeout
+
+    def _run_hook(self, plugin: BasePlugin, method: Callable, hook_name: str,
+                  args: tuple, kwargs: Dict[str, Any], watch: bool = False):
+        """Call one hook, logging errors and checking the time budget.
+
+        Only notification hooks (``on_*``) have a budget.
+
+        Args:
+            watch: Report the overrun as soon as the budget runs out
+                instead of when the call returns, and disable the plugin
+                (used on pool threads)
+        """
+        budget = self._hook_budget(plugin) if hook_name.startswith('on_') else None
+        call_id = self._watch_hook(plugin, hook_name, budget) if watch and budget else None
+
+        start = time.perf_counter()
+        try:
+            with self._measure(plugin, hook_name):
+                method(*args, **kwargs)
+        except Exception as e:
+            self.logger.error(
+                f"Error calling {hook_name} on plugin {plugin.metadata.name}: {e}")
+        finally:
+            elapsed = time.perf_counter() - start
+            reported = call_id is not None and self._unwatch_hook(call_id)
+            if budget is not None and elapsed > budget and not reported:
+                self._record_hook_overrun(plugin, hook_name, budget, elapsed, disable=watch)
+
+    def _watch_hook(self, plugin: BasePlugin, hook_name: str, budget: float) -> int:
+        """Register a running hook call with the watchdog.
+
+        Returns:
+            Id to pass to ``_unwatch_hook`` when the call returns
+        """
+        deadline = time.monotonic() + budget
+        with self._watch_cond:
+            call_id = next(self._watch_ids)
+            self._watched_calls[call_id] = (deadline, plugin, hook_name, budget)
+            heapq.heappush(self._watch_heap, (deadline, call_id))
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(
+                    target=self._run_watchdog, name='PluginHookWatchdog', daemon=True)
+                self._watchdog.start()
+            elif self._watch_heap[0][1] == call_id:
+                self._watch_cond.notify()  # new earliest deadline
+        return call_id
+
+    def _unwatch_hook(self, call_id: int) -> bool:
+        """Remove a finished hook call from the watchdog.
+
+        Returns:
+            True if the watchdog already reported the call as overrunning
+        """
+        with self._watch_cond:
+            if self._watched_calls.pop(call_id, None) is None:
+                return True
+            heap = self._watch_heap
+            if len(heap) > 64 and len(heap) > 4 * len(self._watched_calls):
+                # Drop entries of finished calls rather than wait for their deadlines
+                heap[:] = [entry for entry in heap if entry[1] in self._watched_calls]
+                heapq.heapify(heap)
+            return False
+
+    def _run_watchdog(self):
+        """Report hook calls still running past their deadline (watchdog thread)."""
+        thread = threading.current_thread()
+        while True:
+            expired = []
+            with self._watch_cond:
+                while not expired:
+                    if self._watchdog is not thread:
+                        return
+                    now = time.monotonic()
+                    heap = self._watch_heap
+                    while heap and heap[0][0] <= now:
+                        call = self._watched_calls.pop(heapq.heappop(heap)[1], None)
+                        if call is not None:
+                            expired.append(call)
+                    if not expired:
+                        self._watch_cond.wait(heap[0][0] - now if heap else None)
+            for _, plugin, hook_name, budget in expired:
+                self._record_hook_overrun(plugin, hook_name, budget, None, disable=True)
+
+    def _stop_watchdog(self):
+        """Stop the watchdog thread; calls still watched are forgotten."""
+        with self._watch_cond:
+            self._watchdog = None
+            self._watch_heap.clear()
+            self._watched_calls.clear()
+            self._watch_cond.notify()
+
+    def _record_hook_overrun(self, plugin: BasePlugin, hook_name: str,
+                             budget: float, elapsed: Optional[float], disable: bool = False):
+        """Record a hook call over budget, optionally disabling the plugin.
+
+        Args:
+            elapsed: Duration of the finished call, or None if it is
+                still running
+            disable: Disable the plugin as well
+        """
+        name = plugin.metadata.name
+        with self._hook_lock:
+            self.hook_overruns.setdefault(name, []).append({
+                'hook': hook_name,
+                'budget_s': budget,
+                'elapsed_s': elapsed,
+                'time': time.time()
+            })
+            if not disable:
+                self.logger.warning(
+                    f"Plugin {name} took {elapsed:.1f}s in {hook_name} (budget {budget:.1f}s)")
+                return
+            if not self.plugin_enabled.get(name, False):
+                return
+            if elapsed is None:
+                self.logger.warning(
+                    f"Plugin {name} has been in {hook_name} for over {budget:.1f}s - disabling it")
+            else:
+                self.logger.warning(
+                    f"Plugin {name} took {elapsed:.1f}s in {hook_name} "
+                    f"(budget {budget:.1f}s) - disabling it")
+            self.disable_plugin(name)
+
+    def _get_hook_pool(self) -> ThreadPoolExecutor:
+        """Thread pool for asynchronous notification hooks."""
+        if self._hook_pool is None:
+            self._hook_pool = ThreadPoolExecutor(
+                max_workers=self.hook_workers, thread_name_prefix='PluginHook')
+        return self._hook_pool
 
     def process_mesh_through_plugins(self, mesh_data: Any) -> Any:
         """Process mesh data through all enabled coding engine plugins."""
-        for plugin in self.get_plugins_by_category("coding engine"):
+        for plugin in self._transformers("coding engine", 'process_mesh'):
             try:
-                mesh_data = plugin.process_mesh(mesh_data) or mesh_data
+                with self._measure(plugin, 'process_mesh'):
+                    mesh_data = plugin.process_mesh(mesh_data) or mesh_data
             except Exception as e:
                 self.logger.error(
                     f"Error processing mesh with plugin {plugin.metadata.name}: {e}")
@@ -329,18 +676,276 @@ class PluginManager:
     def process_gcode_through_plugins(
             self, gcode_lines: List[str]) -> List[str]:
         """Process G-code through all enabled coding engine plugins."""
-        for plugin in self.get_plugins_by_category("coding engine"):
+        for plugin in self._transformers("coding engine", *GCODE_METHODS):
             try:
-                gcode_lines = plugin.process_gcode(gcode_lines)
+                with self._measure(plugin, 'process_gcode', len(gcode_lines)) as call:
+                    gcode_lines = plugin.process_gcode(gcode_lines)
+                    call['lines_out'] = len(gcode_lines)
             except Exception as e:
                 self.logger.error(
                     "Error processing G-code with plugin {plugin.metadata.name}: {e}")
         return gcode_lines
 
+    def stream_gcode_through_plugins(
+            self, gcode_lines: Iterable[str]) -> Iterator[str]:
+        """Lazily chain G-code through all enabled coding engine plugins.
+
+        Each plugin's ``process_gcode_stream`` consumes the previous
+        plugin's output, so lines flow through the whole chain one at a
+        time and memory use does not grow with the file size. List-based
+        plugins still see the full list (see ``BasePlugin``).
+
+        Args:
+            gcode_lines: Input G-code lines (without line endings)
+
+        Returns:
+            Iterator over the processed lines
+        """
+        stream = iter(gcode_lines)
+        for plugin in self._transformers("coding engine", *GCODE_METHODS):
+            stream = self._guarded_gcode_stream(plugin, stream)
+        return stream
+
+    def _guarded_gcode_stream(self, plugin: BasePlugin,
+                              upstream: Iterator[str]) -> Iterator[str]:
+        """Run one plugin's stream stage, bypassing it if it fails.
+
+        A failing list-based plugin passes its input through unchanged,
+        as in ``process_gcode_through_plugins``. A failing streaming
+        plugin loses only the lines it had consumed but not yet yielded
+        (with profiling, also the batch being timed); the rest of the
+        stream skips it.
+        """
+        if plugin.overrides('process_gcode') and not plugin.overrides('process_gcode_stream'):
+            gcode_lines = list(upstream)
+            try:
+                with self._measure(plugin, 'process_gcode', len(gcode_lines)) as call:
+                    gcode_lines = plugin.process_gcode(gcode_lines)
+                    call['lines_out'] = len(gcode_lines)
+            except Exception as e:
+                self.logger.error(
+                    f"Error processing G-code with plugin {plugin.metadata.name}: {e}")
+            yield from gcode_lines
+            return
+
+        try:
+            if self.profile_plugins:
+                yield from self.profiler.profile_stream(
+                    plugin.metadata.name, 'process_gcode_stream',
+                    plugin.process_gcode_stream, upstream)
+            else:
+                yield from plugin.process_gcode_stream(upstream)
+        except Exception as e:
+            self.logger.error(
+                f"Error streaming G-code through plugin {plugin.metadata.name}: {e}")
+            yield from upstream
+
+    def process_gcode_parallel(self, gcode_lines: Sequence[str],
+                               max_workers: Optional[int] = None,
+                               chunk_lines: int = DEFAULT_CHUNK_LINES) -> List[str]:
+        """Process G-code through the plugins, chunk-safe ones in parallel.
+
+        Consecutive chunk-safe plugins (``PluginMetadata.chunk_safe``) form
+        one parallel stage: the G-code is split at layer boundaries and
+        each chunk runs through the stage in a worker process, starting
+        from the machine state at its first line (``on_gcode_chunk``).
+        Chunk results are joined in order. Other plugins run in the main
+        process between stages, as in ``stream_gcode_through_plugins``.
+
+        Args:
+            gcode_lines: Input G-code lines (without line endings) or a
+                ``GcodeFile``
+            max_workers: Worker processes (default: CPU count)
+            chunk_lines: Minimum lines per chunk
+
+        Returns:
+            Processed G-code lines
+        """
+        return list(self._stream_gcode_parallel(gcode_lines, max_workers, chunk_lines))
+
+    def _stream_gcode_parallel(self, gcode_lines: Sequence[str], max_workers: Optional[int],
+                               chunk_lines: int) -> Iterator[str]:
+        """Lazy form of ``process_gcode_parallel``.
+
+        Lines are yielded as their chunks complete. Only a parallel stage
+        that follows a main-process plugin collects its input into a
+        list, as it needs the whole G-code to split it.
+        """
+        workers = max_workers or os.cpu_count() or 1
+        stream = self._as_sequence(gcode_lines)
+        stage = []
+        for plugin in self._transformers("coding engine", *GCODE_METHODS):
+            if plugin.metadata.chunk_safe and self._plugin_source(plugin):
+                stage.append(plugin)
+                continue
+            if stage:
+                stream = self._process_gcode_stage(stage, self._as_sequence(stream),
+                                                   workers, chunk_lines)
+            stream = self._guarded_gcode_stream(plugin, iter(stream))
+            stage = []
+        if stage:
+            stream = self._process_gcode_stage(stage, self._as_sequence(stream),
+                                               workers, chunk_lines)
+        return iter(stream)
+
+    @staticmethod
+    def _as_sequence(gcode_lines: Iterable[str]) -> Sequence[str]:
+        """The lines as a list, unless they already are a list or ``GcodeFile``."""
+        if isinstance(gcode_lines, (list, GcodeFile)):
+            return gcode_lines
+        return list(gcode_lines)
+
+    def _process_gcode_stage(self, plugins: List[BasePlugin], gcode_lines: Sequence[str],
+                             workers: int, chunk_lines: int) -> Iterator[str]:
+        """Run chunk-safe plugins over layer chunks in the process pool.
+
+        Chunks are submitted as their start states are resolved
+        (``iter_chunks``), at most two per worker at a time, and their
+        output is yielded in order as it arrives. Chunks of a
+        ``GcodeFile`` are sent as byte ranges that the workers read
+        themselves.
+
+        Falls back to processing in the main process when the G-code is
+        too small to split or the pool fails (it cannot be created, or a
+        worker raises); the plugins then resume from the first chunk not
+        yet yielded (``on_gcode_chunk``). Errors while splitting the
+        G-code are raised.
+        """
+        if not plugins:
+            yield from gcode_lines
+            return
+
+        start, state = 0, None
+        chunks = iter(())
+        if workers > 1:
+            # A few chunks per worker evens out uneven layers
+            chunk_lines = max(chunk_lines, -(-len(gcode_lines) // (workers * 4)))
+            chunks = iter_chunks(gcode_lines, chunk_lines)
+        first = next(chunks, None)
+
+        if first is not None and first[1]['chunk_count'] > 1:
+            specs = [(self._plugin_source(plugin), type(plugin).__name__,
+                      plugin.get_config(), plugin.active) for plugin in plugins]
+            chunks = itertools.chain([first], chunks)
+            pending = deque()  # [start, state, future] of chunks not yet yielded
+            splitting = False  # errors while resolving chunks are not pool failures
+            try:
+                pool = self._get_process_pool(workers)
+                while True:
+                    splitting = True
+                    chunk = next(chunks, None)
+                    splitting = False
+                    if chunk is None:
+                        break
+                    (chunk_start, chunk_end), chunk_state = chunk
+                    pending.append([chunk_start, chunk_state, None])
+                    pending[-1][2] = pool.submit(_process_gcode_chunk, (
+                        specs, chunk_state, self._chunk_source(gcode_lines, chunk_start, chunk_end),
+                        self.profile_plugins))
+                    if len(pending) >= workers * 2:
+                        yield from self._collect_chunk(pending)
+                while pending:
+                    yield from self._collect_chunk(pending)
+                return
+            except Exception as e:
+                if splitting:
+                    raise
+                self.logger.error(
+                    f"Parallel G-code processing failed, processing serially: {e}")
+                if pending:
+                    start, state = pending[0][:2]
+            finally:
+                for _, _, future in pending:
+                    if future is not None:
+                        future.cancel()
+
+        stream = iter(gcode_lines[start:]) if start else iter(gcode_lines)
+        for plugin in plugins:
+            if state is not None:
+                self._run_hook(plugin, plugin.on_gcode_chunk, 'on_gcode_chunk', (dict(state),), {})
+            stream = self._guarded_gcode_stream(plugin, stream)
+        yield from stream
+
+    def _chunk_source(self, gcode_lines: Sequence[str], start: int,
+                      end: int) -> Union[List[str], Tuple[str, int, int]]:
+        """Lines [start, end) as sent to a worker: a file byte range or a list."""
+        lines = gcode_lines[start:end]
+        if isinstance(lines, GcodeFile):
+            return (str(lines.path), *lines.byte_range)
+        return list(lines)
+
+    def _collect_chunk(self, pending: deque) -> List[str]:
+        """Wait for the oldest pending chunk and return its output."""
+        chunk, stats = pending[0][2].result()
+        pending.popleft()
+        if self.profile_plugins:
+            self.profiler.merge(stats)
+        return chunk
+
+    def _plugin_source(self, plugin: BasePlugin) -> Optional[str]:
+        """Source file a worker process can load the plugin from."""
+        source = self.plugin_sources.get(plugin.metadata.name)
+        if source is None:
+            try:
+                source = inspect.getfile(type(plugin))
+            except (TypeError, OSError):
+                return None
+        return source if os.path.isfile(source) else None
+
+    def _get_process_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Shared worker pool, recreated when the worker count changes."""
+        if self._process_pool is None or self._process_pool_workers != workers:
+            self._shutdown_process_pool()
+            # Spawned workers: forking would copy the GUI and logging threads
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            self._process_pool_workers = workers
+        return self._process_pool
+
+    def _shutdown_process_pool(self):
+        """Stop the worker pool, if running."""
+        if self._process_pool is not None:
+            if sys.version_info >= (3, 9):
+                self._process_pool.shutdown(cancel_futures=True)
+            else:  # cancel_futures is new in Python 3.9
+                self._process_pool.shutdown()
+            self._process_pool = None
+            self._process_pool_workers = 0
+
+    def process_gcode_file(self, input_path: Path, output_path: Path,
+                           max_workers: int = 1) -> int:
+        """Stream a G-code file through the plugins into another file.
+
+        The input is memory-mapped (``GcodeFile``), so lines are decoded
+        only as the plugins read them.
+
+        Args:
+            input_path: Source G-code file
+            output_path: Destination file (must differ from the source)
+            max_workers: Worker processes for chunk-safe plugins; with more
+                than one, the file is processed as by ``process_gcode_parallel``
+                and each chunk is written as soon as it completes
+
+        Returns:
+            Number of lines written
+        """
+        written = 0
+        with GcodeFile(input_path) as lines, \
+                open(output_path, 'w', encoding='utf-8') as dst:
+            if max_workers > 1:
+                output = self._stream_gcode_parallel(lines, max_workers, DEFAULT_CHUNK_LINES)
+            else:
+                output = self.stream_gcode_through_plugins(lines)
+            for line in output:
+                dst.write(line)
+                dst.write('\n')
+                written += 1
+        return written
+
     def get_all_menu_actions(self) -> List[Dict[str, Any]]:
         """Get menu actions from all enabled plugins."""
         actions = []
-        for plugin in self.get_enabled_plugins():
+        for plugin in self._enabled_plugins:
             try:
                 plugin_actions = plugin.get_menu_actions()
                 for action in plugin_actions:
@@ -355,5 +960,14 @@ class PluginManager:
         """Cleanup all loaded plugins."""
         for plugin_name in list(self.loaded_plugins.keys()):
             self.unload_plugin(plugin_name)
+        self._shutdown_process_pool()
+        if self._hook_pool is not None:
+            # Hung hooks cannot be interrupted; do not wait for them
+            if sys.version_info >= (3, 9):
+                self._hook_pool.shutdown(wait=False, cancel_futures=True)
+            else:  # cancel_futures is new in Python 3.9
+                self._hook_pool.shutdown(wait=False)
+            self._hook_pool = None
+        self._stop_watchdog()
 
         self.logger.info("All plugins cleaned up")
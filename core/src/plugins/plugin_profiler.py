@@ -0,0 +1,290 @@
+"""
+Plugin Profiler for GHST
+
+Attributes the cost of plugin calls to the plugin that made them:
+wall time, CPU time of the calling thread, G-code lines in and out, and
+peak memory. Figures are aggregated per plugin and per operation (hook
+or transform name) and can be written to a JSON report.
+
+Peak memory comes from ``tracemalloc``, which slows the traced code
+down, so only every Nth call of an operation is traced, and only one
+call at a time. Streamed G-code passes report time and line counts but
+no peak, as their generators interleave with the rest of the chain; they
+are timed per batch of lines rather than per line.
+"""
+
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Trace memory on every Nth call of an operation (the first one included)
+DEFAULT_MEMORY_SAMPLE_EVERY = 10
+
+DEFAULT_REPORT_PATH = Path('logs/plugin_profile.json')
+
+# Lines pulled from a stream per timed step
+STREAM_BATCH_LINES = 256
+
+
+def _take(iterator: Iterator[str], count: int) -> List[str]:
+    """Up to ``count`` items from an iterator."""
+    return list(islice(iterator, count))
+
+
+def _new_entry() -> Dict[str, Any]:
+    return {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'max_wall_s': 0.0,
+            'lines_in': 0, 'lines_out': 0, 'peak_memory_bytes': None,
+            'memory_samples': 0}
+
+
+class _StepTimer:
+    """Accumulates the time of many short steps (batches pulled from a generator).
+
+    Wall time is read on every step. Reading the thread CPU clock costs
+    several times more, so it is read on every ``CPU_SAMPLE_EVERY``-th
+    step and CPU time is extrapolated from the sampled steps.
+    """
+
+    CPU_SAMPLE_EVERY = 16
+
+    def __init__(self):
+        self.steps = 0
+        self.wall = 0.0
+        self.sampled_wall = 0.0
+        self.sampled_cpu = 0.0
+
+    def step(self, function: Callable, *args):
+        """Call ``function(*args)`` as one timed step."""
+        self.steps += 1
+        if self.steps % self.CPU_SAMPLE_EVERY:
+            started = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                self.wall += time.perf_counter() - started
+        started, started_cpu = time.perf_counter(), time.thread_time()
+        try:
+            return function(*args)
+        finally:
+            wall = time.perf_counter() - started
+            self.wall += wall
+            self.sampled_wall += wall
+            self.sampled_cpu += time.thread_time() - started_cpu
+
+    @property
+    def cpu(self) -> float:
+        """Estimated CPU time of all steps."""
+        if self.sampled_wall <= 0:
+            return 0.0
+        return self.sampled_cpu * self.wall / self.sampled_wall
+
+
+class _CountingIterator:
+    """Upstream of a profiled stream: counts lines and time spent in it.
+
+    Lines are read ahead in batches of ``STREAM_BATCH_LINES``, so the
+    clock is read once per batch.
+    """
+
+    def __init__(self, upstream: Iterable[str]):
+        self.upstream = iter(upstream)
+        self.lines = 0
+        self.timer = _StepTimer()
+        self._batch = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self._batch:
+            self._batch.extend(self.timer.step(_take, self.upstream, STREAM_BATCH_LINES))
+            if not self._batch:
+                raise StopIteration
+        self.lines += 1
+        return self._batch.popleft()
+
+
+class PluginProfiler:
+    """Per-plugin cost accounting used by ``PluginManager``."""
+
+    def __init__(self, memory_sample_every: int = DEFAULT_MEMORY_SAMPLE_EVERY):
+        """Initialize the profiler.
+
+        Args:
+            memory_sample_every: Trace memory on every Nth call of each
+                operation (0 disables memory tracing)
+        """
+        self.memory_sample_every = memory_sample_every
+        self.stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._memory_lock = threading.Lock()
+
+    def _entry(self, plugin_name: str, operation: str) -> Dict[str, Any]:
+        return self.stats.setdefault(plugin_name, {}).setdefault(operation, _new_entry())
+
+    def record(self, plugin_name: str, operation: str, wall: float, cpu: float,
+               lines_in: int = 0, lines_out: int = 0, peak: Optional[int] = None):
+        """Add one call to the totals.
+
+        Args:
+            plugin_name: Plugin that made the call
+            operation: Hook or transform name
+            wall: Wall time (seconds)
+            cpu: CPU time of the calling thread (seconds)
+            lines_in: G-code lines consumed
+            lines_out: G-code lines produced
+            peak: Peak traced memory during the call (bytes), if sampled
+        """
+        with self._lock:
+            entry = self._entry(plugin_name, operation)
+            entry['calls'] += 1
+            entry['wall_s'] += wall
+            entry['cpu_s'] += cpu
+            entry['max_wall_s'] = max(entry['max_wall_s'], wall)
+            entry['lines_in'] += lines_in
+            entry['lines_out'] += lines_out
+            if peak is not None:
+                entry['memory_samples'] += 1
+                entry['peak_memory_bytes'] = max(entry['peak_memory_bytes'] or 0, peak)
+
+    def _should_sample(self, plugin_name: str, operation: str) -> bool:
+        if self.memory_sample_every <= 0:
+            return False
+        calls = self.stats.get(plugin_name, {}).get(operation, {}).get('calls', 0)
+        return calls % self.memory_sample_every == 0
+
+    @contextmanager
+    def measure(self, plugin_name: str, operation: str, lines_in: int = 0):
+        """Time a call made inside the ``with`` block.
+
+        Yields a dictionary; set its 'lines_out' key to record output
+        lines.
+        """
+        call = {'lines_out': 0}
+        traced = (self._should_sample(plugin_name, operation)
+                  and self._memory_lock.acquire(blocking=False))
+        if traced and tracemalloc.is_tracing() and sys.version_info < (3, 9):
+            # Without reset_peak (new in Python 3.9), the peak of a trace
+            # started elsewhere would include earlier allocations
+            self._memory_lock.release()
+            traced = False
+        started_tracing = False
+        if traced:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield call
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            peak = None
+            if traced:
+                peak = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+                if started_tracing:
+                    tracemalloc.stop()
+                self._memory_lock.release()
+            self.record(plugin_name, operation, wall, cpu,
+                        lines_in, call['lines_out'], peak)
+
+    def profile_stream(self, plugin_name: str, operation: str,
+                       stream_factory: Callable[[Iterator[str]], Iterable[str]],
+                       upstream: Iterable[str]) -> Iterator[str]:
+        """Run a streaming pass, timing only the plugin's own work.
+
+        Time spent producing the plugin's input (earlier stages of the
+        chain) is subtracted, so each stage is charged for itself. Input
+        and output are both moved in batches of ``STREAM_BATCH_LINES``
+        lines, each timed as one step; CPU time is estimated from
+        sampled steps (see ``_StepTimer``).
+
+        Args:
+            plugin_name: Plugin that runs the pass
+            operation: Transform name
+            stream_factory: Builds the plugin's output stream from its input
+            upstream: Input lines
+        """
+        source = _CountingIterator(upstream)
+        timer = _StepTimer()
+        lines_out = 0
+        try:
+            stream = timer.step(lambda: iter(stream_factory(source)))
+            while True:
+                batch = timer.step(_take, stream, STREAM_BATCH_LINES)
+                lines_out += len(batch)
+                yield from batch
+                if len(batch) < STREAM_BATCH_LINES:
+                    break
+        finally:
+            self.record(plugin_name, operation, max(timer.wall - source.timer.wall, 0.0),
+                        max(timer.cpu - source.timer.cpu, 0.0), source.lines, lines_out)
+
+    def merge(self, stats: Dict[str, Dict[str, Dict[str, Any]]]):
+        """Add totals collected elsewhere (e.g. in a worker process)."""
+        with self._lock:
+            for plugin_name, operations in stats.items():
+                for operation, other in operations.items():
+                    entry = self._entry(plugin_name, operation)
+                    for key in ('calls', 'wall_s', 'cpu_s', 'lines_in', 'lines_out',
+                                'memory_samples'):
+                        entry[key] += other[key]
+                    entry['max_wall_s'] = max(entry['max_wall_s'], other['max_wall_s'])
+                    if other['peak_memory_bytes'] is not None:
+                        entry['peak_memory_bytes'] = max(entry['peak_memory_bytes'] or 0,
+                                                         other['peak_memory_bytes'])
+
+    def plugin_summary(self, plugin_name: str) -> Dict[str, Any]:
+        """Totals over all operations of one plugin, plus the breakdown."""
+        with self._lock:
+            operations = {name: dict(entry)
+                          for name, entry in self.stats.get(plugin_name, {}).items()}
+        peaks = [entry['peak_memory_bytes'] for entry in operations.values()
+                 if entry['peak_memory_bytes'] is not None]
+        return {
+            'calls': sum(entry['calls'] for entry in operations.values()),
+            'wall_s': sum(entry['wall_s'] for entry in operations.values()),
+            'cpu_s': sum(entry['cpu_s'] for entry in operations.values()),
+            'lines_in': sum(entry['lines_in'] for entry in operations.values()),
+            'lines_out': sum(entry['lines_out'] for entry in operations.values()),
+            'peak_memory_bytes': max(peaks) if peaks else None,
+            'operations': operations
+        }
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Per-plugin summaries, most expensive (wall time) first."""
+        with self._lock:
+            names = list(self.stats)
+        summaries = [{'plugin': name, **self.plugin_summary(name)} for name in names]
+        return sorted(summaries, key=lambda summary: summary['wall_s'], reverse=True)
+
+    def write_report(self, path: Path = DEFAULT_REPORT_PATH) -> Path:
+        """Write the report as JSON.
+
+        Args:
+            path: Destination file (parent directories are created)
+
+        Returns:
+            The path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'generated': time.time(), 'plugins': self.report()}, f, indent=2)
+        return path
+
+    def reset(self):
+        """Discard all collected figures."""
+        with self._lock:
+            self.stats = {}
@@ -0,0 +1,203 @@
+"""
+Async Logging for GHST
+
+Non-blocking file logging: the logging call only formats the record and
+puts it on a bounded queue. A background writer drains the queue in
+batches (one write and flush per batch), rotates the file by size and/or
+age, and can gzip rotated files. When the queue is full, records are
+dropped and counted instead of stalling the caller, and the writer notes
+the drop count in the log.
+"""
+
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Shared log directory (core/logs), independent of the working directory
+LOG_DIR = Path(__file__).resolve().parent.parent.parent / 'logs'
+
+
+class AsyncFileHandler(QueueHandler):
+    """Logging handler that hands records to a background file writer."""
+
+    def __init__(self, path: Path, max_bytes: int = 10 * 1024 * 1024,
+                 rotate_interval: Optional[float] = None, backup_count: int = 5,
+                 compress: bool = True, queue_size: int = 10000,
+                 batch_size: int = 256, flush_interval: float = 0.5):
+        """Initialize the handler and start its writer thread.
+
+        Args:
+            path: Log file path
+            max_bytes: Rotate when the file reaches this size (0 = never)
+            rotate_interval: Rotate when the file is this many seconds old
+                (None = never)
+            backup_count: Rotated files to keep
+            compress: Gzip rotated files
+            queue_size: Records buffered before new ones are dropped
+            batch_size: Maximum records written per batch
+            flush_interval: Longest a record waits before being written
+        """
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.path = Path(path)
+        self.dropped = 0
+        self.writer = _BatchWriter(self, max_bytes, rotate_interval,
+                                   backup_count, compress, batch_size,
+                                   flush_interval)
+        self.writer.start()
+
+    def enqueue(self, record: logging.LogRecord):
+        """Queue a record without blocking; count it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Write out queued records and stop the writer."""
+        self.writer.stop()
+        super().close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue, drop and write statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        return {
+            'queued': self.queue.qsize(),
+            'dropped': self.dropped,
+            'written': self.writer.written,
+            'batches': self.writer.batches,
+            'rotations': self.writer.rotations
+        }
+
+
+class _BatchWriter:
+    """Background thread draining an AsyncFileHandler's queue to disk."""
+
+    _STOP = object()
+
+    def __init__(self, handler: AsyncFileHandler, max_bytes: int,
+                 rotate_interval: Optional[float], backup_count: int,
+                 compress: bool, batch_size: int, flush_interval: float):
+        self.handler = handler
+        self.path = handler.path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = max(0, backup_count)
+        self.compress = compress
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.batches = 0
+        self.rotations = 0
+        self._reported_drops = 0
+        self._file = None
+        self._opened_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the writer thread."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f"log-writer-{self.path.name}")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Drain the queue and stop the writer thread."""
+        if not self._thread:
+            return
+        self.handler.queue.put(self._STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _open(self):
+        """Open the log file for appending."""
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._opened_at = time.time()
+
+    def _run(self):
+        """Collect records into batches and write them."""
+        log_queue = self.handler.queue
+        running = True
+        while running:
+            try:
+                batch = [log_queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self._STOP in batch:
+                running = False
+                batch = [record for record in batch if record is not self._STOP]
+                # Records queued after the stop request are still written
+                while True:
+                    try:
+                        batch.append(log_queue.get_nowait())
+                    except queue.Empty:
+                        break
+            self._write(batch)
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _write(self, batch: List[logging.LogRecord]):
+        """Write one batch, then rotate if needed."""
+        lines = [record.getMessage() + '\n' for record in batch]
+        dropped = self.handler.dropped - self._reported_drops
+        if dropped:
+            self._reported_drops += dropped
+            lines.append(f"{datetime.now().isoformat()} - AsyncFileHandler - WARNING - "
+                         f"{dropped} log records dropped (queue full)\n")
+        if not lines:
+            return
+        try:
+            self._file.write(''.join(lines))
+            self._file.flush()
+            self.written += len(lines)
+            self.batches += 1
+            if self._should_rotate():
+                self._rotate()
+        except OSError as e:
+            print(f"Async log write failed for {self.path}: {e}")
+            if self._file.closed:
+                self._open()
+
+    def _should_rotate(self) -> bool:
+        """Whether the file hit its size or age limit."""
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            return True
+        return bool(self.rotate_interval
+                    and time.time() - self._opened_at >= self.rotate_interval)
+
+    def _rotate(self):
+        """Move the file aside (optionally gzipped) and prune old ones."""
+        self._file.close()
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        rotated = self.path.with_name(f"{self.path.name}.{stamp}")
+        os.replace(self.path, rotated)
+        if self.compress:
+            with open(rotated, 'rb') as src, gzip.open(f"{rotated}.gz", 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            rotated.unlink()
+        self.rotations += 1
+
+        backups = sorted(self.path.parent.glob(f"{self.path.name}.*"))
+        for old in backups[:max(0, len(backups) - self.backup_count)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+        self._open()
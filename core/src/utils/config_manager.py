@@ -14,7 +14,7 @@ import logging
 import os
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import yaml
 
@@ -38,12 +38,14 @@ class PrinterConfig:
     nozzle_diameter: float
     max_temp_hotend: int
     max_temp_bed: int
-    max_feedrate_x: int
-    max_feedrate_y: int
-    max_feedrate_z: int
+    max_feedrate_x: int  # mm/s
+    max_feedrate_y: int  # mm/s
+    max_feedrate_z: int  # mm/s
     firmware_type: str = "marlin"
     supports_nonplanar: bool = False
     experimental_features: List[str] = None
+    max_acceleration: float = 1500.0  # mm/s^2
+    junction_deviation: float = 0.05  # mm
 
     def __post_init__(self):
         if self.experimental_features is None:
@@ -159,12 +161,14 @@ class ConfigManager:
             nozzle_diameter=0.4,
             max_temp_hotend=300,
             max_temp_bed=120,
-            max_feedrate_x=20000,
-            max_feedrate_y=20000,
-            max_feedrate_z=1000,
+            max_feedrate_x=333,  # mm/s (20000 mm/min)
+            max_feedrate_y=333,  # mm/s (20000 mm/min)
+            max_feedrate_z=17,  # mm/s (1000 mm/min)
             firmware_type="bambu",
             supports_nonplanar=True,  # Experimental!
-            experimental_features=["nonplanar_slicing", "ai_optimization"]
+            experimental_features=["nonplanar_slicing", "ai_optimization"],
+            max_acceleration=10000.0,
+            junction_deviation=0.05
         )
 
         # Add safety disclaimer to config
@@ -308,6 +312,7 @@ class ConfigManager:
                 config_data[key] = value
 
         self.current_printer = PrinterConfig(**config_data)
+        self.call_plugin_hook('on_printer_changed', self.current_printer)
         return self.current_printer
 
     def load_material_config(self, config_name: str) -> MaterialConfig:
@@ -395,7 +400,9 @@ class ConfigManager:
             'max_feedrate_z': 10,
             'firmware_type': 'marlin',
             'supports_nonplanar': False,
-            'experimental_features': []
+            'experimental_features': [],
+            'max_acceleration': 1500.0,
+            'junction_deviation': 0.05
         }
 
     def _get_default_material_config(self) -> Dict[str, Any]:
@@ -515,6 +522,14 @@ class ConfigManager:
                 gcode_lines)
         return gcode_lines
 
+    def stream_gcode_with_plugins(
+            self, gcode_lines: Iterable[str]) -> Iterator[str]:
+        """Lazily stream G-code through enabled plugins."""
+        if self.plugin_manager:
+            return self.plugin_manager.stream_gcode_through_plugins(
+                gcode_lines)
+        return iter(gcode_lines)
+
     def validate_config_safety(self) -> List[str]:
         """Validate current configuration for safety issues."""
         warnings = []
@@ -0,0 +1,221 @@
+"""
+Ghost Metrics for GHST
+
+Per-ghost resource accounting: latency histograms, call and error counts,
+CPU time and allocated bytes for operations such as ``process_query`` and
+``monitor_cycle``. Histograms use HDR-style log-linear buckets (about 1.5%
+relative precision from 1 microsecond to hours), so recording is a couple
+of integer operations and percentiles never need the raw samples.
+"""
+
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram with microsecond resolution."""
+
+    SUB_BUCKET_BITS = 6
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    BUCKET_COUNT = 2048
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _index(cls, micros: int) -> int:
+        """Map a value in microseconds to its bucket index."""
+        shift = max(0, micros.bit_length() - cls.SUB_BUCKET_BITS - 1)
+        index = shift * cls.SUB_BUCKETS + (micros >> shift)
+        return min(index, cls.BUCKET_COUNT - 1)
+
+    @classmethod
+    def _bucket_value(cls, index: int) -> float:
+        """Return the midpoint of a bucket in seconds."""
+        shift = 0 if index < 2 * cls.SUB_BUCKETS else index // cls.SUB_BUCKETS - 1
+        low = (index - shift * cls.SUB_BUCKETS) << shift
+        return (low + ((1 << shift) - 1) / 2) / 1e6
+
+    def record(self, seconds: float):
+        """Record one latency sample.
+
+        Args:
+            seconds: Duration in seconds
+        """
+        index = self._index(max(0, int(seconds * 1e6)))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Return the approximate latency at a percentile.
+
+        Args:
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds (0.0 if empty)
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = max(1, int(round(self.count * pct / 100.0)))
+            seen = 0
+            for index, bucket in enumerate(self.counts):
+                if bucket:
+                    seen += bucket
+                    if seen >= target:
+                        return min(self._bucket_value(index), self.max)
+            return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Get count, sum, mean, max and p50/p95/p99 in seconds.
+
+        Returns:
+            Summary dictionary
+        """
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99)
+        }
+
+
+class OperationStats:
+    """Accumulated statistics for one (ghost, operation) pair."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.cpu_time = 0.0
+        self.allocated_bytes = 0
+        self.lock = threading.Lock()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-friendly snapshot of these statistics."""
+        return {
+            **self.latency.summary(),
+            'errors': self.errors,
+            'cpu_time': self.cpu_time,
+            'allocated_bytes': self.allocated_bytes
+        }
+
+
+class GhostMetrics:
+    """Registry of per-ghost operation statistics."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._stats: Dict[Tuple[str, str], OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, ghost_id: str, operation: str) -> OperationStats:
+        """Return the statistics for a pair, creating them on first use."""
+        key = (ghost_id, operation)
+        stats = self._stats.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(key, OperationStats())
+        return stats
+
+    def record(self, ghost_id: str, operation: str, wall_time: float,
+               cpu_time: float = 0.0, allocated_bytes: int = 0,
+               error: bool = False):
+        """Record one completed operation.
+
+        Args:
+            ghost_id: Ghost that ran the operation
+            operation: Operation name (e.g. 'process_query')
+            wall_time: Elapsed wall-clock seconds
+            cpu_time: CPU seconds used by the calling thread
+            allocated_bytes: Net bytes allocated (only when tracemalloc
+                is tracing)
+            error: Whether the operation raised
+        """
+        stats = self._get(ghost_id, operation)
+        stats.latency.record(wall_time)
+        with stats.lock:
+            stats.cpu_time += cpu_time
+            stats.allocated_bytes += max(0, allocated_bytes)
+            if error:
+                stats.errors += 1
+
+    @contextmanager
+    def timed(self, ghost_id: str, operation: str) -> Iterator[None]:
+        """Time a block and record it for a ghost operation.
+
+        Allocation accounting is only done while tracemalloc is tracing,
+        so the default overhead is a few clock reads per call.
+
+        Args:
+            ghost_id: Ghost that runs the block
+            operation: Operation name
+        """
+        tracing = tracemalloc.is_tracing()
+        mem_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        cpu_start = time.thread_time()
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - cpu_start
+            allocated = (tracemalloc.get_traced_memory()[0] - mem_before
+                         if tracing else 0)
+            self.record(ghost_id, operation, wall, cpu, allocated, error)
+
+    def get_stats(self, ghost_id: str,
+                  operation: str) -> Optional[Dict[str, Any]]:
+        """Get statistics for one ghost operation.
+
+        Args:
+            ghost_id: Ghost ID
+            operation: Operation name
+
+        Returns:
+            Statistics dictionary or None if never recorded
+        """
+        stats = self._stats.get((ghost_id, operation))
+        return stats.to_dict() if stats else None
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get statistics for every recorded ghost operation.
+
+        Returns:
+            Nested mapping ghost_id -> operation -> statistics
+        """
+        with self._lock:
+            items = list(self._stats.items())
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (ghost_id, operation), stats in items:
+            result.setdefault(ghost_id, {})[operation] = stats.to_dict()
+        return result
+
+    def reset(self):
+        """Drop all recorded statistics."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Process-wide registry used by ghosts unless given their own
+default_metrics = GhostMetrics()
@@ -0,0 +1,164 @@
+"""
+Keyword Automaton for GHST
+
+Aho-Corasick multi-pattern matcher. All keywords are compiled into a single
+automaton so a text is scanned once, regardless of how many keywords or
+owners are registered. Matching is case-insensitive substring matching,
+the same semantics as ``keyword in text.lower()``.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Case-insensitive Aho-Corasick automaton mapping keywords to values."""
+
+    def __init__(self, patterns: Optional[Iterable[Tuple[str, Any]]] = None):
+        """Initialize the automaton.
+
+        Args:
+            patterns: Optional (keyword, value) pairs to add immediately
+        """
+        self._patterns: Dict[str, List[Any]] = {}
+        self._tables: Tuple[List[Dict[str, int]], List[int], List[bool],
+                            List[Tuple[Any, ...]]] = ([{}], [0], [True], [()])
+        self._compiled = False
+
+        for keyword, value in patterns or ():
+            self.add(keyword, value)
+
+    def add(self, keyword: str, value: Any):
+        """Register a keyword; the automaton recompiles on next search.
+
+        Args:
+            keyword: Keyword to match (case-insensitive)
+            value: Value reported when the keyword matches
+        """
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        self._patterns.setdefault(keyword, []).append(value)
+        self._compiled = False
+
+    def remove_value(self, value: Any):
+        """Remove every registration of a value.
+
+        Args:
+            value: Value previously passed to ``add``
+        """
+        for keyword in list(self._patterns):
+            values = [v for v in self._patterns[keyword] if v != value]
+            if values:
+                self._patterns[keyword] = values
+            else:
+                del self._patterns[keyword]
+        self._compiled = False
+
+    # States up to this depth get a full transition table (failure links
+    # folded in); deeper states keep only their trie edges and follow
+    # failure links while scanning. Scans spend most of their time near
+    # the root, and folding every state multiplies memory.
+    FOLD_DEPTH = 2
+
+    def compile(self):
+        """Build the trie, failure links, shallow transition tables and outputs."""
+        goto: List[Dict[str, int]] = [{}]
+        output: List[List[Any]] = [[]]
+
+        for keyword, values in self._patterns.items():
+            state = 0
+            for char in keyword:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][char] = nxt
+                    goto.append({})
+                    output.append([])
+                state = nxt
+            output[state].extend(values)
+
+        # Breadth-first, so every failure target is processed first
+        fail = [0] * len(goto)
+        folded = [False] * len(goto)
+        folded[0] = True
+        pending = deque((state, 1) for state in goto[0].values())
+        while pending:
+            state, depth = pending.popleft()
+            children = goto[state]
+            if depth <= self.FOLD_DEPTH:
+                # The failure target is shallower, hence already folded
+                goto[state] = {**goto[fail[state]], **children}
+                folded[state] = True
+            for char, nxt in children.items():
+                pending.append((nxt, depth + 1))
+                link = fail[state]
+                while not folded[link] and char not in goto[link]:
+                    link = fail[link]
+                fail[nxt] = goto[link].get(char, 0)
+                if output[fail[nxt]]:
+                    output[nxt] = output[nxt] + output[fail[nxt]]
+
+        # Swap all tables at once so concurrent readers never mix versions
+        self._tables = (goto, fail, folded, [tuple(values) for values in output])
+        self._compiled = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """Yield (end_index, value) for every keyword occurrence in text.
+
+        Args:
+            text: Text to scan
+
+        Yields:
+            End index of the match and the registered value
+        """
+        if not self._compiled:
+            self.compile()
+
+        goto, fail, folded, output = self._tables
+        state = 0
+        for index, char in enumerate(text.lower()):
+            while True:
+                nxt = goto[state].get(char)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if folded[state]:
+                    state = 0
+                    break
+                state = fail[state]
+            for value in output[state]:
+                yield index, value
+
+    def find_values(self, text: str) -> Set[Any]:
+        """Return the set of values whose keywords occur in text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of matched values
+        """
+        if not self._compiled:
+            self.compile()
+
+        goto, fail, folded, output = self._tables
+        found: Set[Any] = set()
+        state = 0
+        for char in text.lower():
+            while True:
+                nxt = goto[state].get(char)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if folded[state]:
+                    state = 0
+                    break
+                state = fail[state]
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def __len__(self) -> int:
+        """Number of distinct keywords registered."""
+        return len(self._patterns)
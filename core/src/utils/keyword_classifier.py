@@ -0,0 +1,81 @@
+"""
+Keyword Classifier for GHST
+
+Priority-ordered keyword categories compiled into one KeywordAutomaton.
+Replaces the "lowercase the text, then ``any(k in text for k in ...)`` per
+category" chains used for error, problem, idea and chat classification:
+the text is scanned once and every matching category is reported.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .keyword_automaton import KeywordAutomaton
+
+CategorySpec = Union[Dict[str, Iterable[str]], Iterable[Tuple[str, Iterable[str]]]]
+
+
+class KeywordClassifier:
+    """Single-pass multi-category keyword classifier.
+
+    Categories keep the order they were added in, which is the priority
+    used by ``first`` (the same order an if/elif chain would test them).
+    """
+
+    def __init__(self, categories: Optional[CategorySpec] = None,
+                 default: Optional[str] = None):
+        """Initialize the classifier.
+
+        Args:
+            categories: Mapping or (category, keywords) pairs in priority order
+            default: Category returned by ``first`` when nothing matches
+        """
+        self.default = default
+        self.categories: List[str] = []
+        self.automaton = KeywordAutomaton()
+
+        items = categories.items() if isinstance(categories, dict) else categories
+        for category, keywords in items or ():
+            self.add_category(category, keywords)
+        self.automaton.compile()
+
+    def add_category(self, category: str, keywords: Iterable[str]):
+        """Add a category with lower priority than those already added.
+
+        Args:
+            category: Category name
+            keywords: Keywords that select the category (case-insensitive
+                substring match)
+        """
+        if category in self.categories:
+            priority = self.categories.index(category)
+        else:
+            priority = len(self.categories)
+            self.categories.append(category)
+        for keyword in keywords:
+            self.automaton.add(keyword, priority)
+
+    def classify(self, text: str) -> List[str]:
+        """Return every matching category in priority order.
+
+        Args:
+            text: Text to classify
+
+        Returns:
+            Matching categories (empty if none)
+        """
+        return [self.categories[p] for p in sorted(self.automaton.find_values(text))]
+
+    def first(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the highest-priority matching category.
+
+        Args:
+            text: Text to classify
+            default: Overrides the classifier default when nothing matches
+
+        Returns:
+            Category name or the default
+        """
+        matched = self.automaton.find_values(text)
+        if not matched:
+            return self.default if default is None else default
+        return self.categories[min(matched)]
@@ -0,0 +1,277 @@
+"""
+OpenMetrics Exporter for GHST
+
+Optional local HTTP endpoint exposing the ghost collective's metrics in
+the OpenMetrics text format, so a long-running collective can be scraped
+by Prometheus (or checked with ``curl http://127.0.0.1:9464/metrics``).
+
+Sources are registered explicitly: ghost metrics, error handlers, plugin
+loaders, memory systems and any cache with a ``get_stats()`` method.
+"""
+
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value for the exposition format."""
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _labels(**labels: Any) -> str:
+    """Render a label set."""
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + body + "}"
+
+
+class MetricFamily:
+    """One metric family: TYPE/HELP header plus samples."""
+
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        """Initialize a metric family.
+
+        Args:
+            name: Family name (without _total/_sum/_count suffixes)
+            metric_type: 'gauge', 'counter' or 'summary'
+            help_text: Description shown in HELP
+        """
+        self.name = name
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.samples: List[str] = []
+
+    def add(self, value: float, suffix: str = "", **labels: Any):
+        """Add a sample to the family.
+
+        Args:
+            value: Sample value
+            suffix: Sample name suffix such as '_total' or '_count'
+            **labels: Label values
+        """
+        self.samples.append(f"{self.name}{suffix}{_labels(**labels)} {float(value)!r}")
+
+    def render(self) -> List[str]:
+        """Render the family, or nothing if it has no samples."""
+        if not self.samples:
+            return []
+        return [f"# TYPE {self.name} {self.metric_type}",
+                f"# HELP {self.name} {self.help_text}"] + self.samples
+
+
+class MetricsExporter:
+    """Collects GHST metrics and serves them over HTTP."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9464):
+        """Initialize the exporter.
+
+        Args:
+            host: Interface to bind (local only by default)
+            port: TCP port to listen on (0 picks a free port)
+        """
+        self.host = host
+        self.port = port
+        self.logger = logging.getLogger('MetricsExporter')
+        self.collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.server_thread: Optional[threading.Thread] = None
+
+    def add_collector(self, collector: Callable[[], Iterable[MetricFamily]]):
+        """Register a callable returning metric families on every scrape.
+
+        Args:
+            collector: Callable producing MetricFamily objects
+        """
+        self.collectors.append(collector)
+
+    def add_ghost_metrics(self, metrics: Any):
+        """Export ghost operation latencies, counts, errors and CPU time.
+
+        Args:
+            metrics: GhostMetrics registry
+        """
+        def collect():
+            latency = MetricFamily("ghst_ghost_operation_seconds", "summary",
+                                   "Ghost operation latency (process_query, monitor_cycle)")
+            errors = MetricFamily("ghst_ghost_operation_errors", "counter",
+                                  "Ghost operations that raised")
+            cpu = MetricFamily("ghst_ghost_cpu_seconds", "counter",
+                               "CPU time spent in ghost operations")
+            allocated = MetricFamily("ghst_ghost_allocated_bytes", "counter",
+                                     "Net bytes allocated by ghost operations (tracemalloc only)")
+            for ghost_id, operations in metrics.snapshot().items():
+                for operation, stats in operations.items():
+                    labels = {'ghost': ghost_id, 'operation': operation}
+                    for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'),
+                                          ('0.99', 'p99')):
+                        latency.add(stats[key], quantile=quantile, **labels)
+                    latency.add(stats['sum'], "_sum", **labels)
+                    latency.add(stats['count'], "_count", **labels)
+                    errors.add(stats['errors'], "_total", **labels)
+                    cpu.add(stats['cpu_time'], "_total", **labels)
+                    allocated.add(stats['allocated_bytes'], "_total", **labels)
+            return [latency, errors, cpu, allocated]
+
+        self.add_collector(collect)
+
+    def add_error_handler(self, error_handler: Any, name: str = "default"):
+        """Export an ErrorHandler's queue depth and coalescing counters.
+
+        Args:
+            error_handler: ErrorHandler instance
+            name: Label distinguishing several handlers
+        """
+        def collect():
+            depth = MetricFamily("ghst_error_queue_depth", "gauge",
+                                 "Errors waiting for ghost analysis")
+            depth.add(error_handler.error_queue.qsize(), handler=name)
+            history = MetricFamily("ghst_error_history_size", "gauge",
+                                   "Analysed errors kept in memory")
+            history.add(len(error_handler.error_history), handler=name)
+            families = [depth, history]
+            if hasattr(error_handler.error_queue, 'get_stats'):
+                stats = error_handler.error_queue.get_stats()
+                coalesced = MetricFamily("ghst_error_queue_coalesced", "counter",
+                                         "Duplicate errors folded into a queued error")
+                coalesced.add(stats['coalesced'], "_total", handler=name)
+                dropped = MetricFamily("ghst_error_queue_dropped", "counter",
+                                       "Errors dropped because the queue was full")
+                dropped.add(stats['dropped'], "_total", handler=name)
+                families.extend([coalesced, dropped])
+            return families
+
+        self.add_collector(collect)
+
+    def add_plugin_loader(self, plugin_loader: Any):
+        """Export expertise plugin load times.
+
+        Args:
+            plugin_loader: PluginLoader instance
+        """
+        def collect():
+            loaded = MetricFamily("ghst_plugins_loaded", "gauge",
+                                  "Expertise plugins currently loaded")
+            loaded.add(len(plugin_loader.loaded_plugins))
+            load_time = MetricFamily("ghst_plugin_load_seconds", "gauge",
+                                     "Time taken to load each expertise plugin")
+            for plugin_name, seconds in list(plugin_loader.load_times.items()):
+                load_time.add(seconds, plugin=plugin_name)
+            return [loaded, load_time]
+
+        self.add_collector(collect)
+
+    def add_memory_system(self, memory_system: Any):
+        """Export per-plugin memory store sizes.
+
+        Args:
+            memory_system: MemorySystem instance
+        """
+        def collect():
+            fragments = MetricFamily("ghst_memory_fragments", "gauge",
+                                     "Knowledge fragments stored per plugin")
+            size = MetricFamily("ghst_memory_store_bytes", "gauge",
+                                "On-disk size of each plugin's memory store")
+            for plugin_name in list(memory_system.memory_index):
+                stats = memory_system.get_plugin_stats(plugin_name)
+                fragments.add(stats['fragment_count'], plugin=plugin_name)
+                size.add(stats['total_size_bytes'], plugin=plugin_name)
+            return [fragments, size]
+
+        self.add_collector(collect)
+
+    def add_cache(self, name: str, cache: Any):
+        """Export hit/miss counts and hit rate of a cache.
+
+        Args:
+            name: Cache label (e.g. 'routing')
+            cache: Object whose ``get_stats()`` returns hits/misses/size
+        """
+        def collect():
+            stats = cache.get_stats()
+            hits = MetricFamily("ghst_cache_hits", "counter", "Cache hits")
+            misses = MetricFamily("ghst_cache_misses", "counter", "Cache misses")
+            ratio = MetricFamily("ghst_cache_hit_ratio", "gauge",
+                                 "Cache hits / lookups")
+            size = MetricFamily("ghst_cache_entries", "gauge",
+                                "Entries currently cached")
+            hits.add(stats.get('hits', 0), "_total", cache=name)
+            misses.add(stats.get('misses', 0), "_total", cache=name)
+            ratio.add(stats.get('hit_rate', 0.0), cache=name)
+            size.add(stats.get('size', 0), cache=name)
+            return [hits, misses, ratio, size]
+
+        self.add_collector(collect)
+
+    def render(self) -> str:
+        """Render all registered metrics in OpenMetrics text format.
+
+        Families with the same name from several collectors are merged.
+
+        Returns:
+            Exposition text ending with '# EOF'
+        """
+        families: Dict[str, MetricFamily] = {}
+        for collector in self.collectors:
+            try:
+                for family in collector():
+                    merged = families.setdefault(family.name, family)
+                    if merged is not family:
+                        merged.samples.extend(family.samples)
+            except Exception as e:
+                self.logger.error(f"Metrics collector failed: {e}")
+
+        lines: List[str] = []
+        for family in families.values():
+            lines.extend(family.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def start(self) -> int:
+        """Start serving /metrics in a background thread.
+
+        Returns:
+            Port the server is listening on
+        """
+        if self.server:
+            return self.port
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                exporter.logger.debug(format % args)
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.logger.info(
+            f"📈 Metrics exporter listening on http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self):
+        """Stop the HTTP server."""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            self.logger.info("Metrics exporter stopped")
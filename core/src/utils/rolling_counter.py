@@ -0,0 +1,62 @@
+"""
+Rolling Counter for GHST
+
+Sliding-window event counts kept in a fixed ring of time buckets. Adding
+an event touches one bucket and reading a window sums a fixed number of
+buckets, so cost does not grow with the number of events recorded.
+"""
+
+import threading
+import time
+from typing import List, Optional
+
+
+class RollingCounter:
+    """Event count over a sliding time window.
+
+    The window is split into ``buckets`` slots; counts are accurate to
+    one slot width (``window / buckets`` seconds).
+    """
+
+    def __init__(self, window: float, buckets: int = 60):
+        """Initialize the counter.
+
+        Args:
+            window: Window length in seconds
+            buckets: Number of slots the window is split into
+        """
+        self.window = float(window)
+        self.buckets = max(1, int(buckets))
+        self.width = self.window / self.buckets
+        self.counts: List[int] = [0] * self.buckets
+        self.epochs: List[int] = [-1] * self.buckets
+        self._lock = threading.Lock()
+
+    def add(self, count: int = 1, now: Optional[float] = None):
+        """Record events.
+
+        Args:
+            count: Number of events
+            now: Event time (defaults to the current time)
+        """
+        epoch = int((time.time() if now is None else now) // self.width)
+        slot = epoch % self.buckets
+        with self._lock:
+            if self.epochs[slot] != epoch:
+                self.epochs[slot] = epoch
+                self.counts[slot] = 0
+            self.counts[slot] += count
+
+    def total(self, now: Optional[float] = None) -> int:
+        """Return the number of events inside the window.
+
+        Args:
+            now: End of the window (defaults to the current time)
+
+        Returns:
+            Event count
+        """
+        oldest = int((time.time() if now is None else now) // self.width) - self.buckets
+        with self._lock:
+            return sum(count for count, epoch in zip(self.counts, self.epochs)
+                       if epoch > oldest)
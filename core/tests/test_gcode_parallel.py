@@ -0,0 +1,202 @@
+"""
+Tests for parallel G-code processing through chunk-safe plugins.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.plugins.base_plugin import BasePlugin, PluginMetadata  # noqa: E402
+from src.plugins.gcode_chunks import iter_chunks  # noqa: E402
+from src.plugins.gcode_file import GcodeFile  # noqa: E402
+from src.plugins import plugin_manager  # noqa: E402
+from src.plugins.plugin_manager import PluginManager  # noqa: E402
+
+# A chunk-safe plugin that rewrites every move with its absolute X/Y/Z/E,
+# so its output depends on the machine state each chunk starts from.
+# Set 'fail_chunk' in its config to make workers fail on that chunk.
+PLUGIN_SOURCE = '''
+import multiprocessing
+
+
+class AbsoluteMovesPlugin(BasePlugin):
+
+    def __init__(self):
+        self._start_state = None
+        super().__init__()
+
+    def get_metadata(self):
+        return PluginMetadata(name='Absolute Moves', version='1.0', author='tests',
+                              description='Rewrites moves with absolute positions',
+                              category='coding engine', chunk_safe=True)
+
+    def initialize(self):
+        return True
+
+    def cleanup(self):
+        return True
+
+    def on_gcode_chunk(self, state):
+        if (self.get_config().get('fail_chunk') == state['chunk_index']
+                and multiprocessing.parent_process() is not None):
+            raise RuntimeError('worker failed')
+        self._start_state = state
+
+    def process_gcode_stream(self, gcode_lines):
+        state, self._start_state = self._start_state, None
+        absolute = state['absolute'] if state else True
+        absolute_e = state['absolute_e'] if state else True
+        position = {axis: (state['position'][axis] if state else None) or 0.0
+                    for axis in 'XYZE'}
+        for line in gcode_lines:
+            words = line.split(';')[0].split()
+            command = words[0] if words else None
+            params = {word[0]: float(word[1:]) for word in words[1:]}
+            if command == 'G90':
+                absolute = absolute_e = True
+            elif command == 'G91':
+                absolute = absolute_e = False
+            elif command == 'M82':
+                absolute_e = True
+            elif command == 'M83':
+                absolute_e = False
+            elif command == 'G92':
+                position.update(params)
+            elif command in ('G0', 'G1'):
+                for axis, value in params.items():
+                    relative = not absolute_e if axis == 'E' else not absolute
+                    if axis in position:
+                        position[axis] = position[axis] + value if relative else value
+                yield command + ' ' + ' '.join(f"{axis}{position[axis]:.3f}" for axis in 'XYZE')
+                continue
+            yield line
+'''
+
+
+def make_gcode(layers=12, moves=30):
+    """Multi-layer G-code switching between absolute and relative modes."""
+    lines = ['G90', 'M82', 'G92 E0']
+    for layer in range(layers):
+        lines.append(f";LAYER:{layer}")
+        lines.append(f"G1 Z{0.2 * (layer + 1):.1f} F600")
+        if layer % 3 == 1:
+            lines.append('M83')
+        if layer % 4 == 1:
+            lines.append('G91')
+        for index in range(moves):
+            lines.append(f"G1 X{index % 7 * 1.5:.1f} Y{index % 5 * 2.5:.1f} E{0.5 + index % 3:.1f}")
+        if layer % 4 == 2:
+            lines.append('G90')
+        if layer % 3 == 2:
+            lines.append('M82')
+            lines.append('G92 E0')
+    return lines
+
+
+@pytest.fixture
+def plugin_source(tmp_path):
+    path = tmp_path / 'absolute_moves.py'
+    path.write_text(PLUGIN_SOURCE)
+    return path
+
+
+@pytest.fixture
+def manager(tmp_path, plugin_source):
+    spec = importlib.util.spec_from_file_location(plugin_source.stem, plugin_source)
+    module = importlib.util.module_from_spec(spec)
+    module.__dict__['BasePlugin'] = BasePlugin
+    module.__dict__['PluginMetadata'] = PluginMetadata
+    spec.loader.exec_module(module)
+    plugin = module.AbsoluteMovesPlugin()
+    plugin.initialize()
+
+    manager = PluginManager(plugin_dirs=[str(tmp_path / 'plugins')])
+    name = plugin.metadata.name
+    manager.loaded_plugins[name] = plugin
+    manager.plugin_enabled[name] = True
+    manager.plugin_sources[name] = str(plugin_source)
+    manager.refresh_dispatch_tables()
+    yield manager
+    manager.cleanup_all_plugins()
+
+
+def serial_output(manager, gcode_lines):
+    return list(manager.stream_gcode_through_plugins(gcode_lines))
+
+
+def test_parallel_output_matches_serial_for_a_list(manager, caplog):
+    gcode = make_gcode()
+    expected = serial_output(manager, gcode)
+
+    assert manager.process_gcode_parallel(gcode, max_workers=2, chunk_lines=1) == expected
+    assert 'processing serially' not in caplog.text
+
+
+def test_parallel_output_matches_serial_for_a_gcode_file(manager, tmp_path, caplog):
+    path = tmp_path / 'print.gcode'
+    path.write_text('\n'.join(make_gcode()) + '\n')
+
+    with GcodeFile(path) as gcode:
+        expected = serial_output(manager, gcode)
+        assert manager.process_gcode_parallel(gcode, max_workers=2, chunk_lines=1) == expected
+    assert 'processing serially' not in caplog.text
+
+
+def test_chunks_start_in_the_modes_left_by_the_previous_chunk():
+    gcode = make_gcode()
+    states = [state for _, state in iter_chunks(gcode, 50)]
+
+    assert len(states) >= 4
+    assert {state['absolute'] for state in states} == {True, False}
+    assert {state['absolute_e'] for state in states} == {True, False}
+
+
+def test_process_gcode_file_writes_the_serial_output(manager, tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(plugin_manager, 'DEFAULT_CHUNK_LINES', 1)
+    source = tmp_path / 'print.gcode'
+    source.write_text('\n'.join(make_gcode()) + '\n')
+    serial, parallel = tmp_path / 'serial.gcode', tmp_path / 'parallel.gcode'
+
+    written = manager.process_gcode_file(source, serial)
+    assert manager.process_gcode_file(source, parallel, max_workers=2) == written
+    assert parallel.read_text() == serial.read_text()
+    assert 'processing serially' not in caplog.text
+
+
+def test_pool_creation_failure_falls_back_to_serial(manager, monkeypatch, caplog):
+    gcode = make_gcode()
+    expected = serial_output(manager, gcode)
+
+    def no_pool(workers):
+        raise OSError('cannot create semaphores')
+
+    monkeypatch.setattr(manager, '_get_process_pool', no_pool)
+    assert manager.process_gcode_parallel(gcode, max_workers=2, chunk_lines=1) == expected
+    assert 'processing serially' in caplog.text
+
+
+def test_worker_failure_resumes_serially_from_the_failed_chunk(manager, caplog):
+    gcode = make_gcode()
+    expected = serial_output(manager, gcode)
+    plugin = manager.get_plugin('Absolute Moves')
+    plugin.set_config({'fail_chunk': 2})
+
+    assert manager.process_gcode_parallel(gcode, max_workers=2, chunk_lines=1) == expected
+    assert 'worker failed' in caplog.text
+
+
+def test_workers_profile_only_when_profiling_is_enabled(manager):
+    gcode = make_gcode()
+
+    manager.process_gcode_parallel(gcode, max_workers=2, chunk_lines=1)
+    assert manager.profiler.stats == {}
+
+    manager.profile_plugins = True
+    manager.process_gcode_parallel(gcode, max_workers=2, chunk_lines=1)
+    entry = manager.profiler.stats['Absolute Moves']['process_gcode_stream']
+    assert entry['calls'] > 1
+    assert entry['lines_in'] == len(gcode)
@@ -0,0 +1,207 @@
+"""
+Tests for the FOSS lookup client against a local HTTP server.
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ai_collaboration.ghost_internet import (  # noqa: E402
+    DEFAULT_CACHE_PATH,
+    FOSSLookupClient,
+)
+
+
+class FakeGitHub(ThreadingHTTPServer):
+    """Local stand-in for the GitHub search API."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.requests = []
+        self.delay = 0.0
+        self.status = 200
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+        if server.delay:
+            time.sleep(server.delay)
+        query = parse_qs(urlparse(self.path).query)
+        if server.status == 200:
+            body = json.dumps({'items': [{'name': query.get('q', [''])[0]}]}).encode()
+        else:
+            body = b'{"message": "error"}'
+        self.send_response(server.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = FakeGitHub()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def make_client(server, tmp_path):
+    clients = []
+
+    def make(**kwargs):
+        kwargs.setdefault('cache_path', tmp_path / 'cache.json')
+        kwargs.setdefault('timeout', 5.0)
+        client = FOSSLookupClient(base_url=server.url, **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_repeated_search_is_served_from_cache(server, make_client):
+    client = make_client()
+
+    first = client.search_code('bed leveling')
+    second = client.search_code('bed leveling')
+
+    assert first == second
+    assert first[0]['name'].startswith('bed leveling')
+    assert len(server.requests) == 1
+    stats = client.get_stats()
+    assert stats['requests_made'] == 1
+    assert stats['hits'] == 1
+
+
+def test_cache_is_saved_once_per_interval_and_reloaded(server, make_client, tmp_path):
+    cache_path = tmp_path / 'cache.json'
+    client = make_client(cache_path=cache_path, cache_save_interval=60.0)
+
+    for index in range(5):
+        client.search_code(f"query {index}")
+    assert client.cache.saves == 0
+    assert not cache_path.exists()
+
+    client.close()
+    assert client.cache.saves == 1
+
+    reloaded = make_client(cache_path=cache_path)
+    assert len(reloaded.cache) == 5
+    reloaded.search_code('query 3')
+    assert len(server.requests) == 5
+
+
+def test_scheduled_save_writes_pending_entries(server, make_client, tmp_path):
+    cache_path = tmp_path / 'cache.json'
+    client = make_client(cache_path=cache_path, cache_save_interval=0.05)
+
+    client.search_code('stringing')
+    client.search_code('warping')
+
+    deadline = time.monotonic() + 5.0
+    while not cache_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.cache.saves == 1
+    assert len(json.loads(cache_path.read_text())['entries']) == 2
+
+
+def test_concurrent_identical_queries_share_one_request(server, make_client):
+    server.delay = 0.2
+    client = make_client(burst=10)
+    barrier = threading.Barrier(5)
+    results = []
+
+    def search():
+        barrier.wait()
+        results.append(client.search_code('layer shift'))
+
+    threads = [threading.Thread(target=search) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(server.requests) == 1
+    assert len(results) == 5
+    assert all(result == results[0] for result in results)
+    assert client.get_stats()['coalesced'] == 4
+
+
+def test_requests_beyond_the_burst_are_throttled(server, make_client):
+    client = make_client(rate_limit=0.01, burst=2)
+
+    for index in range(2):
+        assert client.get_json('/search/code', {'q': index}, wait=0) is not None
+    assert client.get_json('/search/code', {'q': 'over'}, wait=0) is None
+
+    assert len(server.requests) == 2
+    assert client.get_stats()['rate_limited'] == 1
+
+
+def test_error_responses_are_not_cached(server, make_client):
+    server.status = 500
+    client = make_client()
+
+    assert client.search_code('nozzle clog') == []
+    server.status = 200
+    assert client.search_code('nozzle clog') != []
+    assert len(server.requests) == 2
+
+
+def test_connection_errors_propagate_and_release_waiters(server, make_client):
+    client = make_client(timeout=1.0)
+    client.base_url = 'http://127.0.0.1:9'  # discard port, nothing listens
+
+    with pytest.raises(requests.RequestException):
+        client.search_code('unreachable')
+    assert client.single_flight._calls == {}
+
+
+def test_caller_session_is_left_untouched(server, make_client):
+    session = requests.Session()
+    headers = dict(session.headers)
+    adapters = dict(session.adapters)
+    client = make_client(session=session, token='secret')
+
+    client.search_code('retraction')
+    client.close()
+
+    assert dict(session.headers) == headers
+    assert dict(session.adapters) == adapters
+    sent = server.requests[0][1]
+    assert sent['Authorization'] == 'Bearer secret'
+    assert sent['Accept'] == 'application/vnd.github+json'
+    session.close()
+
+
+def test_default_cache_path_does_not_depend_on_working_directory():
+    assert DEFAULT_CACHE_PATH.is_absolute()
+    assert DEFAULT_CACHE_PATH.parent.name == 'logs'
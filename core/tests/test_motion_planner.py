@@ -0,0 +1,124 @@
+"""
+Tests for the vectorized kinematic planner against a per-move reference.
+"""
+
+import logging
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.plugins.gcode_parser import ParsedGcode  # noqa: E402
+from src.plugins.gcode_stats import motion_profile  # noqa: E402
+from src.plugins.motion_planner import MotionLimits, move_segments, plan_segments  # noqa: E402
+from src.utils.config_manager import ConfigManager, PrinterConfig  # noqa: E402
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / 'config'
+
+LIMITS = MotionLimits(max_acceleration=1000.0, junction_deviation=0.05)
+
+
+def reference_plan(length, cruise, acceleration, junction_sq):
+    """Per-move backward/forward passes, as firmware planners do them."""
+    count = len(length)
+    limit = [0.0] + [min(junction_sq[i], cruise[i] ** 2, cruise[i + 1] ** 2)
+                     for i in range(count - 1)] + [0.0]
+    entry = list(limit)
+    for i in range(count - 1, -1, -1):
+        entry[i] = min(limit[i], entry[i + 1] + 2 * acceleration[i] * length[i])
+    for i in range(count):
+        entry[i + 1] = min(entry[i + 1], entry[i] + 2 * acceleration[i] * length[i])
+    times = []
+    for i in range(count):
+        v0, v1 = math.sqrt(entry[i]), math.sqrt(entry[i + 1])
+        vc, a, d = cruise[i], acceleration[i], length[i]
+        accel = (vc * vc - v0 * v0) / (2 * a)
+        decel = (vc * vc - v1 * v1) / (2 * a)
+        if accel + decel <= d:
+            times.append((vc - v0) / a + (vc - v1) / a + (d - accel - decel) / vc)
+        else:
+            peak = math.sqrt((2 * a * d + v0 * v0 + v1 * v1) / 2)
+            times.append((peak - v0) / a + (peak - v1) / a)
+    return times
+
+
+def segments(lines, limits=LIMITS):
+    """Planner inputs (length, cruise, acceleration, junction_sq) of G-code lines."""
+    _, *planner_args = move_segments(motion_profile(ParsedGcode.parse(lines)), limits)
+    return planner_args
+
+
+def arc(radius=10.0, step_degrees=10):
+    lines = []
+    for angle in range(0, 181, step_degrees):
+        x = radius * math.cos(math.radians(angle))
+        y = radius * math.sin(math.radians(angle))
+        lines.append(f"G1 X{x:.4f} Y{y:.4f} E{0.01 * angle:.3f} F3000")
+    return lines
+
+
+CASES = {
+    'straight line': ['G90', 'M82', 'G1 X0 Y0 F6000'] + [f"G1 X{x}" for x in range(10, 101, 10)],
+    '90 degree corner': ['G90', 'M82', 'G1 X0 Y0 F6000', 'G1 X50 E2', 'G1 Y50 E4'],
+    'short arc segments': ['G90', 'M82', 'G1 X10 Y0 F3000'] + arc(),
+    'retraction only': ['G90', 'M82', 'G1 X0 Y0 F6000', 'G1 X50 E2',
+                        'G1 E1.2 F2400', 'G1 X100 E4 F6000'],
+}
+
+
+@pytest.mark.parametrize('name', list(CASES))
+def test_vectorized_planner_matches_reference(name):
+    length, cruise, acceleration, junction_sq = segments(CASES[name])
+
+    times = plan_segments(length, cruise, acceleration, junction_sq)
+    expected = reference_plan(length.tolist(), cruise.tolist(), acceleration.tolist(),
+                              junction_sq.tolist())
+
+    assert len(times) == len(expected) > 0
+    np.testing.assert_allclose(times, expected, rtol=1e-9)
+
+
+def test_collinear_moves_plan_like_one_move():
+    # 100 mm at 100 mm/s and 1000 mm/s^2: 0.1 s up, 0.9 s cruise, 0.1 s down
+    times = plan_segments(*segments(CASES['straight line']))
+
+    assert times.sum() == pytest.approx(1.1)
+
+
+def test_corner_speed_follows_junction_deviation():
+    _, _, _, junction_sq = segments(CASES['90 degree corner'])
+
+    sin_half = math.sqrt(0.5)
+    assert junction_sq.tolist() == pytest.approx(
+        [LIMITS.max_acceleration * LIMITS.junction_deviation * sin_half / (1 - sin_half)])
+
+
+def test_retraction_is_planned_on_e_and_stops_motion():
+    length, cruise, _, junction_sq = segments(CASES['retraction only'])
+
+    assert length.tolist() == pytest.approx([50.0, 0.8, 50.0])
+    assert cruise[1] == pytest.approx(40.0)
+    assert junction_sq.tolist() == [0.0, 0.0]
+
+
+def test_bambu_p1s_feedrate_limits_are_in_mm_per_second(tmp_path):
+    manager = ConfigManager.__new__(ConfigManager)
+    manager.config_dir = tmp_path
+    manager.logger = logging.getLogger('ConfigManager')
+    manager.create_bambu_p1s_config()
+
+    for path in (CONFIG_DIR / 'bambu_p1s.yaml', tmp_path / 'bambu_p1s.yaml'):
+        data = yaml.safe_load(path.read_text())
+        data.pop('_disclaimer', None)
+        limits = MotionLimits.from_printer_config(PrinterConfig(**data))
+        assert (limits.max_feedrate_x, limits.max_feedrate_y,
+                limits.max_feedrate_z) == (333, 333, 17)
+
+        # F20000 (mm/min) along X is capped at 333 mm/s, not 20000 mm/s
+        _, cruise, _, _ = segments(['G90', 'G1 X0 Y0 F20000', 'G1 X100'], limits)
+        assert cruise.tolist() == pytest.approx([333.0])